@@ -0,0 +1,82 @@
+"""관리 명령
+
+사용법:
+    python -m app.cli backup [--output PATH] [--pages N] [--pause-ms MS]
+    python -m app.cli maintenance [--analyze] [--enable-incremental-vacuum]
+    python -m app.cli rebuild-stats
+"""
+
+import argparse
+import json
+import sys
+
+from app.crud.stats import rebuild_stats
+from app.database import SessionLocal, engine
+from app.utils import backup, maintenance
+
+
+class ConsoleProgress(backup.BackupProgress):
+    """진행률을 stderr 에 출력하는 BackupProgress"""
+
+    def update(self, remaining: int, total: int) -> None:
+        super().update(remaining, total)
+        done = total - remaining
+        print(f"\rcopied {done}/{total} pages ({done / total * 100:5.1f}%)", end="", file=sys.stderr)
+
+
+def backup_command(args) -> int:
+    """app.db 를 온라인 백업 API 로 복사 (쓰기를 막지 않음)"""
+    path = args.output or backup.default_backup_path()
+    progress = ConsoleProgress(path)
+    backup.backup_to_file(engine, path, args.pages, args.pause_ms / 1000, progress)
+    print(file=sys.stderr)
+    print(path)
+    return 0
+
+
+def maintenance_command(args) -> int:
+    """유지보수 한 틱 실행 후 크기 통계 출력"""
+    if args.enable_incremental_vacuum:
+        mode = maintenance.enable_incremental_vacuum(engine)
+        print(f"auto_vacuum = {mode}", file=sys.stderr)
+    status = maintenance.maintenance_scheduler.run_once(analyze=args.analyze, force_stats=True)
+    print(json.dumps(status, indent=2))
+    return 0
+
+
+def rebuild_stats_command(args) -> int:
+    """examples / users 를 다시 세어 집계 카운터를 맞춘다"""
+    with SessionLocal() as db:
+        totals = rebuild_stats(db)
+    print(json.dumps(totals, indent=2))
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    backup_parser = commands.add_parser("backup", help="online SQLite backup of app.db")
+    backup_parser.add_argument("--output", help="backup file path (default: BACKUP_DIR/app-<timestamp>.db)")
+    backup_parser.add_argument("--pages", type=int, default=backup.BACKUP_PAGES_PER_STEP, help="pages copied per step")
+    backup_parser.add_argument("--pause-ms", type=float, default=backup.BACKUP_STEP_PAUSE_MS, help="pause between steps")
+    backup_parser.set_defaults(handler=backup_command)
+
+    maintenance_parser = commands.add_parser("maintenance", help="run ANALYZE / incremental vacuum and print sizes")
+    maintenance_parser.add_argument("--analyze", action="store_true", help="full ANALYZE instead of PRAGMA optimize")
+    maintenance_parser.add_argument(
+        "--enable-incremental-vacuum",
+        action="store_true",
+        help="switch an existing database to auto_vacuum=INCREMENTAL (one-time VACUUM, blocks writers)",
+    )
+    maintenance_parser.set_defaults(handler=maintenance_command)
+
+    stats_parser = commands.add_parser("rebuild-stats", help="recount examples and users into the stats counters")
+    stats_parser.set_defaults(handler=rebuild_stats_command)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,12 +2,27 @@ from app.crud.user import (
     get_user_by_id,
     get_user_by_email,
     get_user_by_username,
+    get_user_credentials_by_email,
+    get_user_profile_by_username,
+    get_user_snapshot_by_username,
     create_user,
 )
+from app.crud.example import get_example_by_id, list_examples, search_examples
+from app.crud.audit import list_auth_events
+from app.crud.stats import get_stats, rebuild_stats
 
 __all__ = [
     "get_user_by_id",
     "get_user_by_email",
     "get_user_by_username",
+    "get_user_credentials_by_email",
+    "get_user_profile_by_username",
+    "get_user_snapshot_by_username",
     "create_user",
+    "get_example_by_id",
+    "list_examples",
+    "search_examples",
+    "list_auth_events",
+    "get_stats",
+    "rebuild_stats",
 ]
@@ -0,0 +1,78 @@
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import Session
+
+from app.models import AuthEvent
+
+
+def _naive_utc(value: datetime) -> datetime:
+    # occurred_at 은 naive UTC 로 저장된다
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def encode_cursor(event: AuthEvent) -> str:
+    """페이지 커서 생성 (마지막 항목의 occurred_at 과 id)"""
+    return f"{event.occurred_at.isoformat()}~{event.id}"
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """페이지 커서 해석
+
+    Raises:
+        ValueError: 올바르지 않은 커서인 경우
+    """
+    occurred_at, _, event_id = cursor.rpartition("~")
+    return datetime.fromisoformat(occurred_at), int(event_id)
+
+
+def list_auth_events(
+    db: Session,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    event_type: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+) -> tuple[list[AuthEvent], Optional[str]]:
+    """시간 범위 안의 인증 이벤트를 최신순으로 조회 (keyset 페이지네이션)
+
+    Args:
+        db: 데이터베이스 세션
+        since: 이 시각 이후 (포함)
+        until: 이 시각 이전 (미포함)
+        event_type: 이벤트 종류 필터
+        cursor: 이전 페이지의 next_cursor
+        limit: 페이지 크기
+
+    Returns:
+        (이벤트 목록, 다음 페이지 커서 또는 None)
+
+    Raises:
+        ValueError: 커서가 올바르지 않은 경우
+    """
+    statement = select(AuthEvent)
+    if since is not None:
+        statement = statement.where(AuthEvent.occurred_at >= _naive_utc(since))
+    if until is not None:
+        statement = statement.where(AuthEvent.occurred_at < _naive_utc(until))
+    if event_type is not None:
+        statement = statement.where(AuthEvent.event_type == event_type)
+    if cursor is not None:
+        occurred_at, event_id = decode_cursor(cursor)
+        statement = statement.where(
+            or_(
+                AuthEvent.occurred_at < occurred_at,
+                and_(AuthEvent.occurred_at == occurred_at, AuthEvent.id < event_id),
+            )
+        )
+    # 한 행 더 읽어 다음 페이지 존재 여부 확인
+    statement = statement.order_by(AuthEvent.occurred_at.desc(), AuthEvent.id.desc()).limit(limit + 1)
+
+    events = list(db.scalars(statement))
+    if len(events) > limit:
+        events = events[:limit]
+        return events, encode_cursor(events[-1])
+    return events, None
@@ -0,0 +1,92 @@
+import re
+
+from sqlalchemy import bindparam, func, select, text
+from sqlalchemy.orm import Session
+
+from app.models import Example
+from app.models.example import EXAMPLE_SEARCH_VECTOR
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# 모듈 로드 시 한 번만 만들어 두고 bindparam 으로 값만 바꾼다 (crud/user.py 와 같은 방식)
+_EXAMPLE_BY_ID = select(Example).where(Example.id == bindparam("example_id")).limit(1)
+_ALL_EXAMPLES = select(Example)
+
+
+def list_examples(db: Session) -> list[Example]:
+    """전체 Example 조회"""
+    return list(db.scalars(_ALL_EXAMPLES))
+
+
+def get_example_by_id(db: Session, example_id: int) -> Example | None:
+    """ID로 Example 조회"""
+    return db.scalars(_EXAMPLE_BY_ID, {"example_id": example_id}).first()
+
+
+def _fts5_query(q: str) -> str | None:
+    """사용자 입력을 FTS5 MATCH 식으로 변환
+
+    FTS5 문법 문자(따옴표, 연산자 등)를 그대로 넘기지 않도록 단어만 뽑아
+    각각 접두어 검색("단어"*)으로 만들고 AND 로 묶는다.
+    """
+    tokens = _TOKEN_PATTERN.findall(q)
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def search_examples(db: Session, q: str, limit: int = 20, offset: int = 0) -> list[Example]:
+    """이름/설명 전문 검색 (관련도 순)
+
+    Args:
+        db: 데이터베이스 세션
+        q: 검색어
+        limit: 최대 결과 수
+        offset: 건너뛸 결과 수
+
+    Returns:
+        관련도 순으로 정렬된 Example 목록
+    """
+    dialect = db.get_bind().dialect.name
+
+    if dialect == "sqlite":
+        match = _fts5_query(q)
+        if match is None:
+            return []
+        statement = text(
+            "SELECT examples.* FROM examples_fts "
+            "JOIN examples ON examples.id = examples_fts.rowid "
+            "WHERE examples_fts MATCH :match "
+            "ORDER BY bm25(examples_fts), examples.id "
+            "LIMIT :limit OFFSET :offset"
+        )
+        return list(
+            db.scalars(
+                select(Example).from_statement(statement),
+                {"match": match, "limit": limit, "offset": offset},
+            )
+        )
+
+    if dialect == "postgresql":
+        query = func.websearch_to_tsquery("simple", q)
+        statement = (
+            select(Example)
+            .where(EXAMPLE_SEARCH_VECTOR.op("@@")(query))
+            .order_by(func.ts_rank(EXAMPLE_SEARCH_VECTOR, query).desc(), Example.id)
+            .limit(limit)
+            .offset(offset)
+        )
+        return list(db.scalars(statement))
+
+    # 그 밖의 DB 는 LIKE 스캔으로 대체.
+    # 검색어의 %, _ (와 이스케이프 문자 자체) 는 와일드카드가 아니라 글자로 찾는다
+    escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    pattern = f"%{escaped}%"
+    statement = (
+        select(Example)
+        .where(Example.name.like(pattern, escape="\\") | Example.description.like(pattern, escape="\\"))
+        .order_by(Example.id)
+        .limit(limit)
+        .offset(offset)
+    )
+    return list(db.scalars(statement))
@@ -0,0 +1,148 @@
+"""증분 집계 카운터 (examples / users 총 수와 일별 생성 수)
+
+GET /api/stats 가 COUNT(*) 없이 읽을 수 있도록, 행을 만들거나 지울 때 같은
+트랜잭션 안에서 카운터를 더하고 뺀다. 커밋되지 않은 쓰기는 카운터에도
+반영되지 않는다.
+
+- stat_totals: name 별 현재 행 수
+- stat_daily: name 별, created_at 의 UTC 날짜별 현재 행 수. 삭제하면 그 행이
+  만들어진 날의 값이 줄어든다. 그래서 언제든 테이블에서 다시 계산할 수 있다
+  (rebuild_stats).
+
+카운터 갱신은 INSERT ... ON CONFLICT DO UPDATE (SQLite / PostgreSQL) 한
+문장이므로 동시 요청끼리 값을 덮어쓰지 않는다. 사용자 샤딩이 켜져 있으면
+사용자 행과 카운터가 다른 DB 에 있어 한 트랜잭션이 아니다. 어긋나면
+`python -m app.cli rebuild-stats` 로 맞춘다.
+"""
+
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterable, Optional
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.crud.user_shards import user_shards
+from app.models import Example, StatDaily, StatTotal, User
+
+EXAMPLES = "examples"
+USERS = "users"
+
+# 카운터 이름별 원본 테이블
+COUNTED_MODELS = {EXAMPLES: Example, USERS: User}
+
+
+def utc_day(value: Optional[datetime]) -> date:
+    """created_at 의 UTC 날짜 (naive 값은 UTC 로 본다)"""
+    if value is None:
+        return datetime.now(timezone.utc).date()
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.date()
+
+
+def _upsert(db: Session, model, key: dict, delta: int) -> None:
+    insert = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+    statement = insert(model).values(**key, value=delta)
+    statement = statement.on_conflict_do_update(
+        index_elements=list(key),
+        set_={"value": model.value + statement.excluded.value},
+    )
+    db.execute(statement)
+
+
+def add_counts(db: Session, name: str, created_at: Iterable[Optional[datetime]], sign: int = 1) -> None:
+    """행들의 생성/삭제를 카운터에 반영 (커밋은 호출자가 한다)
+
+    Args:
+        db: 쓰기와 같은 트랜잭션의 세션
+        name: 카운터 이름 (EXAMPLES, USERS)
+        created_at: 만들어지거나 지워진 행들의 created_at
+        sign: 생성이면 1, 삭제면 -1
+    """
+    days = Counter(utc_day(value) for value in created_at)
+    if not days:
+        return
+    _upsert(db, StatTotal, {"name": name}, sign * sum(days.values()))
+    for day, count in sorted(days.items()):
+        _upsert(db, StatDaily, {"name": name, "day": day}, sign * count)
+
+
+def record_created(db: Session, name: str, created_at: Optional[datetime]) -> None:
+    add_counts(db, name, [created_at])
+
+
+def record_deleted(db: Session, name: str, created_at: Optional[datetime]) -> None:
+    add_counts(db, name, [created_at], sign=-1)
+
+
+def get_stats(db: Session, days: int = 7, today: Optional[date] = None) -> dict:
+    """카운터 이름별 총 수, 오늘 생성 수, 최근 days 일의 일별 생성 수
+
+    PK 조회와 days 행 범위 조회만 하므로 테이블 크기와 관계없다.
+    """
+    today = today or datetime.now(timezone.utc).date()
+    first_day = today - timedelta(days=days - 1)
+    totals = dict(db.execute(select(StatTotal.name, StatTotal.value)).all())
+    daily = {
+        (name, day): value
+        for name, day, value in db.execute(
+            select(StatDaily.name, StatDaily.day, StatDaily.value).where(
+                StatDaily.day >= first_day, StatDaily.day <= today
+            )
+        )
+    }
+    window = [first_day + timedelta(days=offset) for offset in range(days)]
+    stats = {}
+    for name in COUNTED_MODELS:
+        buckets = [{"day": day, "count": daily.get((name, day), 0)} for day in window]
+        stats[name] = {
+            "total": totals.get(name, 0),
+            "today": buckets[-1]["count"],
+            "daily": buckets,
+        }
+    return stats
+
+
+def _count_by_day(connection, model) -> dict[date, int]:
+    rows = connection.execute(
+        select(func.date(model.created_at), func.count()).group_by(func.date(model.created_at))
+    )
+    counts: dict[date, int] = Counter()
+    for day, count in rows:
+        # SQLite 의 date() 는 문자열, created_at 이 NULL 이면 기록 시점처럼 오늘로 센다
+        counts[date.fromisoformat(day) if isinstance(day, str) else day or utc_day(None)] += count
+    return counts
+
+
+def rebuild_stats(db: Session) -> dict:
+    """원본 테이블을 다시 세어 카운터를 덮어쓴다 (커밋까지 한다)
+
+    SQLite 에서는 첫 DELETE 부터 쓰기 락을 쥐므로, 다시 세는 동안 들어온
+    쓰기는 재계산이 끝난 뒤 카운터에 반영된다.
+
+    Returns:
+        카운터 이름별 총 수
+    """
+    db.execute(delete(StatDaily))
+    db.execute(delete(StatTotal))
+    totals = {}
+    for name, model in COUNTED_MODELS.items():
+        if model is User and user_shards is not None:
+            by_day: dict[date, int] = Counter()
+            for engine in user_shards.engines:
+                with engine.connect() as connection:
+                    by_day.update(_count_by_day(connection, model))
+        else:
+            by_day = _count_by_day(db, model)
+        totals[name] = sum(by_day.values())
+        db.add(StatTotal(name=name, value=totals[name]))
+        db.add_all(StatDaily(name=name, day=day, value=count) for day, count in by_day.items())
+    db.commit()
+    return totals
+
+
+def stats_initialized(db: Session) -> bool:
+    """카운터가 한 번이라도 채워졌는지 (rebuild_stats 는 모든 이름의 행을 만든다)"""
+    return db.scalar(select(func.count()).select_from(StatTotal)) >= len(COUNTED_MODELS)
@@ -1,20 +1,127 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import bindparam, func, select
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session, load_only
 from app.models import User
+from app.crud import stats
+from app.crud.user_shards import user_shards
+from app.utils.user_cache import UserSnapshot, user_cache
+
+# 자주 쓰는 조회문은 모듈 로드 시 한 번만 만들어 두고 bindparam 으로 값만 바꾼다.
+# 매 호출마다 Query 객체를 새로 만들지 않고, SQLAlchemy 컴파일 캐시도 항상 적중한다.
+_USER_BY_ID = select(User).where(User.id == bindparam("user_id")).limit(1)
+
+# email / username 은 대소문자를 구분하지 않는다. lower(컬럼) 식 인덱스
+# (ux_users_email_lower, ux_users_username_lower) 를 타도록 같은 식으로 비교한다.
+_EMAIL_MATCHES = func.lower(User.email) == func.lower(bindparam("email"))
+_USERNAME_MATCHES = func.lower(User.username) == func.lower(bindparam("username"))
+
+_USER_BY_EMAIL = select(User).where(_EMAIL_MATCHES).limit(1)
+_USER_BY_USERNAME = select(User).where(_USERNAME_MATCHES).limit(1)
+
+# 로그인에 필요한 컬럼만 읽는 조회문 (ORM 엔티티를 만들지 않음)
+_CREDENTIALS_BY_EMAIL = (
+    select(User.id, User.username, User.hashed_password, User.is_active)
+    .where(_EMAIL_MATCHES)
+    .limit(1)
+)
+
+# /me 응답(UserResponse)에 필요한 컬럼만 읽는 조회문
+_PROFILE_BY_USERNAME = (
+    select(User)
+    .options(load_only(User.id, User.username, User.email, User.is_active, User.created_at))
+    .where(_USERNAME_MATCHES)
+    .limit(1)
+)
+
+# 공유 메모리 사용자 캐시(USER_CACHE=1)에 담는 컬럼
+_SNAPSHOT_BY_USERNAME = (
+    select(User.id, User.username, User.email, User.is_active, User.created_at, User.updated_at)
+    .where(_USERNAME_MATCHES)
+    .limit(1)
+)
+
+
+# 샤딩이 켜져 있으면(USER_SHARDS > 0) 아래 함수들은 db 대신 해당 샤드의 세션을
+# 쓴다. 반환된 객체는 샤드 세션이 닫힌 뒤의 detached 상태다.
 
 
 def get_user_by_id(db: Session, user_id: int) -> User | None:
     """ID로 사용자 조회"""
-    return db.query(User).filter(User.id == user_id).first()
+    if user_shards is not None:
+        with user_shards.session(user_shards.shard_for_id(user_id)) as shard_db:
+            return shard_db.scalars(_USER_BY_ID, {"user_id": user_id}).first()
+    return db.scalars(_USER_BY_ID, {"user_id": user_id}).first()
 
 
 def get_user_by_email(db: Session, email: str) -> User | None:
-    """이메일로 사용자 조회"""
-    return db.query(User).filter(User.email == email).first()
+    """이메일로 사용자 조회 (대소문자 구분 없음)"""
+    if user_shards is not None:
+        shard = user_shards.shard_for_email(email)
+        if shard is None:
+            return None
+        with user_shards.session(shard) as shard_db:
+            return shard_db.scalars(_USER_BY_EMAIL, {"email": email}).first()
+    return db.scalars(_USER_BY_EMAIL, {"email": email}).first()
 
 
 def get_user_by_username(db: Session, username: str) -> User | None:
-    """사용자명으로 사용자 조회"""
-    return db.query(User).filter(User.username == username).first()
+    """사용자명으로 사용자 조회 (대소문자 구분 없음)"""
+    if user_shards is not None:
+        with user_shards.session(user_shards.shard_for_username(username)) as shard_db:
+            return shard_db.scalars(_USER_BY_USERNAME, {"username": username}).first()
+    return db.scalars(_USER_BY_USERNAME, {"username": username}).first()
+
+
+def get_user_credentials_by_email(db: Session, email: str) -> Row | None:
+    """로그인 검증용 컬럼(id, username, hashed_password, is_active)만 조회"""
+    if user_shards is not None:
+        shard = user_shards.shard_for_email(email)
+        if shard is None:
+            return None
+        with user_shards.session(shard) as shard_db:
+            return shard_db.execute(_CREDENTIALS_BY_EMAIL, {"email": email}).first()
+    return db.execute(_CREDENTIALS_BY_EMAIL, {"email": email}).first()
+
+
+def get_user_profile_by_username(db: Session, username: str) -> User | None:
+    """UserResponse 컬럼만 로드한 사용자 조회
+
+    hashed_password 등 나머지 컬럼은 접근할 때 지연 로드된다.
+    샤딩이 켜져 있으면 detached 객체이므로 전체 컬럼을 읽어 둔다.
+    """
+    if user_shards is not None:
+        return get_user_by_username(db, username)
+    return db.scalars(_PROFILE_BY_USERNAME, {"username": username}).first()
+
+
+def get_user_snapshot_by_username(db: Session, username: str) -> UserSnapshot | User | None:
+    """get_current_user 용 사용자 조회 (USER_CACHE=1 이면 워커 간 공유 캐시 경유)
+
+    캐시가 꺼져 있으면 get_user_profile_by_username 과 같다. 켜져 있으면
+    UserSnapshot 을 반환하고, 캐시에 없을 때만 DB 를 읽어 채운다.
+    """
+    if user_cache is None:
+        return get_user_profile_by_username(db, username)
+    snapshot = user_cache.get(username)
+    if snapshot is not None:
+        return snapshot
+    # DB 를 읽는 동안 다른 워커가 이 사용자를 바꾸면 fill 이 버려진다
+    token = user_cache.reserve(username)
+    if user_shards is not None:
+        with user_shards.session(user_shards.shard_for_username(username)) as shard_db:
+            row = shard_db.execute(_SNAPSHOT_BY_USERNAME, {"username": username}).first()
+    else:
+        row = db.execute(_SNAPSHOT_BY_USERNAME, {"username": username}).first()
+    if row is None:
+        return None
+    return user_cache.fill(token, UserSnapshot(**row._mapping))
+
+
+def _invalidate_cached_user(username: str) -> None:
+    # 사용자 행을 바꾸는 쓰기는 커밋한 뒤 호출한다. 새로 만든 사용자도 같은
+    # username 의 이전 스냅샷(지워진 사용자 등)이 남지 않도록 비운다
+    if user_cache is not None:
+        user_cache.invalidate(username)
 
 
 def create_user(db: Session, user_create_data: dict, hashed_password: str) -> User:
@@ -27,6 +134,9 @@ def create_user(db: Session, user_create_data: dict, hashed_password: str) -> Us
 
     Returns:
         생성된 User 객체
+
+    Raises:
+        IntegrityError: username 또는 email 이 이미 있는 경우
     """
     # Pydantic 모델인 경우 dict로 변환
     if hasattr(user_create_data, 'model_dump'):
@@ -37,12 +147,28 @@ def create_user(db: Session, user_create_data: dict, hashed_password: str) -> Us
         data = dict(user_create_data)
         data.pop('password', None)
 
+    if user_shards is not None:
+        user = user_shards.insert_user({
+            "username": data['username'],
+            "email": data['email'],
+            "hashed_password": hashed_password,
+        })
+        # 샤드와 다른 DB 라 같은 트랜잭션이 아니다 (어긋나면 rebuild_stats)
+        stats.record_created(db, stats.USERS, user.created_at)
+        db.commit()
+        _invalidate_cached_user(user.username)
+        return user
+
     db_user = User(
         username=data['username'],
         email=data['email'],
         hashed_password=hashed_password
     )
     db.add(db_user)
+    # created_at 은 INSERT ... RETURNING 으로 채워진다
+    db.flush()
+    stats.record_created(db, stats.USERS, db_user.created_at)
     db.commit()
+    _invalidate_cached_user(db_user.username)
     db.refresh(db_user)
     return db_user
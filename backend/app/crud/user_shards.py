@@ -0,0 +1,255 @@
+"""사용자 테이블 해시 샤딩 (선택 기능, USER_SHARDS > 0 일 때만 사용)
+
+사용자를 username 해시로 N 개의 SQLite 파일에 나눠 저장한다. 샤드마다 쓰기
+락이 따로 있으므로 동시 회원가입이 하나의 쓰기 락에 줄 서지 않는다.
+
+- username 조회: 해시로 샤드를 바로 계산한다 (샤드 1 개만 조회).
+- email 조회: 디렉터리 인덱스(소문자 email → 샤드)를 보고 샤드 1 개만
+  조회한다. 디렉터리 키가 소문자이므로 대소문자만 다른 email 은 샤드가
+  달라도 중복으로 거절된다.
+- id 조회: id 는 샤드마다 (shard + 1) 부터 N 씩 증가하도록 발급되므로
+  (id - 1) % N 이 곧 샤드다. 전역적으로 유일하다. 샤드마다 마지막으로 발급한
+  id 를 user_id_sequence 에 두고 늘리기만 하므로, 지워진 사용자의 id 가 다시
+  발급되지 않는다 (오래된 JWT, 폐기 목록, 감사 로그, 사용자 캐시와 섞이지 않음).
+
+디렉터리도 email 해시로 N 개 파일에 나눈다 (USER_DIRECTORY_URL 에 {index} 가
+있을 때). 회원가입은 username 샤드 하나와 email 디렉터리 파티션 하나에만
+쓰므로 전역 쓰기 락이 없다. 디렉터리는 샤드에서 다시 만들 수 있으므로
+(rebuild_directory) WAL + synchronous=NORMAL 로 둬서 커밋마다 fsync 하지
+않는다. 회원가입은 샤드에 먼저 쓰고 디렉터리에 등록하며, 디렉터리 등록이
+실패하면(이메일 중복) 샤드의 행을 지운다.
+
+샤드 수는 데이터가 생긴 뒤에는 바꿀 수 없다 (디렉터리에 기록해 두고 다르면
+시작 시 거부한다). 샤드의 조회/쓰기는 요청 세션과 별개의 트랜잭션이므로
+배치 요청의 롤백 대상이 아니다.
+"""
+
+import hashlib
+import os
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from sqlalchemy import (
+    Column,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    create_engine,
+    delete,
+    event,
+    func,
+    insert,
+    select,
+    update,
+)
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.models import User
+from app.models.user import ensure_user_lookup_indexes
+from app.utils import deadline, tracing
+
+# 사용자 샤딩 설정
+USER_SHARDS = int(os.getenv("USER_SHARDS", "0"))
+USER_SHARD_URL = os.getenv("USER_SHARD_URL", "sqlite:///./users_shard_{index}.db")
+# {index} 가 없으면 디렉터리를 파일 하나에 둔다 (모든 회원가입이 그 쓰기 락을 거친다)
+USER_DIRECTORY_URL = os.getenv("USER_DIRECTORY_URL", "sqlite:///./users_directory_{index}.db")
+
+directory_metadata = MetaData()
+shard_metadata = MetaData()
+
+# 샤드별 마지막 발급 id (행 하나)
+user_id_sequence = Table(
+    "user_id_sequence",
+    shard_metadata,
+    Column("id", Integer, primary_key=True),
+    Column("last_id", Integer, nullable=False),
+)
+
+user_directory = Table(
+    "user_directory",
+    directory_metadata,
+    Column("email", String(100), primary_key=True),
+    Column("shard", Integer, nullable=False),
+)
+
+user_shard_meta = Table(
+    "user_shard_meta",
+    directory_metadata,
+    Column("id", Integer, primary_key=True),
+    Column("shard_count", Integer, nullable=False),
+)
+
+
+def _create_engine(url: str, fast_commit: bool = False):
+    engine = create_engine(url, connect_args={"check_same_thread": False})
+    tracing.instrument_engine(engine)
+    deadline.install_statement_timeouts(engine)
+    if fast_commit:
+        @event.listens_for(engine, "connect")
+        def _set_pragmas(dbapi_connection, connection_record):
+            dbapi_connection.execute("PRAGMA journal_mode=WAL")
+            dbapi_connection.execute("PRAGMA synchronous=NORMAL")
+    return engine
+
+
+def shard_key(username: str) -> bytes:
+    """배치 키 (대소문자 구분 없이 같은 샤드)"""
+    return username.lower().encode()
+
+
+def directory_key(email: str) -> str:
+    """디렉터리 키 (대소문자 구분 없음)"""
+    return email.lower()
+
+
+class UserShards:
+    """샤드 엔진들과 email 디렉터리"""
+
+    def __init__(self, shard_count: int, shard_url: str = USER_SHARD_URL, directory_url: str = USER_DIRECTORY_URL):
+        """
+        Args:
+            shard_count: 샤드 수
+            shard_url: 샤드 DB URL 형식 ({index} 가 샤드 번호로 바뀜)
+            directory_url: 디렉터리 DB URL ({index} 가 있으면 샤드 수만큼 파티션)
+        """
+        if shard_count < 1:
+            raise ValueError("shard_count must be at least 1")
+        self.shard_count = shard_count
+        self.engines = [_create_engine(shard_url.format(index=index)) for index in range(shard_count)]
+        self._sessions = [
+            sessionmaker(bind=engine, autoflush=False, expire_on_commit=False) for engine in self.engines
+        ]
+        partitions = shard_count if "{index}" in directory_url else 1
+        self.directory_engines = [
+            _create_engine(directory_url.format(index=index), fast_commit=True) for index in range(partitions)
+        ]
+
+    @property
+    def directory_engine(self):
+        """샤드 수 등 메타 정보를 두는 첫 디렉터리 파티션"""
+        return self.directory_engines[0]
+
+    def create_all(self) -> None:
+        """샤드와 디렉터리 테이블 생성, 샤드 수 확인
+
+        Raises:
+            RuntimeError: 기존 데이터의 샤드 수와 설정이 다른 경우
+        """
+        for shard, engine in enumerate(self.engines):
+            User.__table__.create(bind=engine, checkfirst=True)
+            shard_metadata.create_all(bind=engine)
+            with engine.begin() as connection:
+                ensure_user_lookup_indexes(connection)
+                # 시퀀스 도입 이전 샤드는 기존 최대 id 에서 이어간다
+                if connection.scalar(select(user_id_sequence.c.last_id)) is None:
+                    last_id = select(func.coalesce(func.max(User.id), shard + 1 - self.shard_count))
+                    connection.execute(insert(user_id_sequence).values(id=1, last_id=last_id.scalar_subquery()))
+        for engine in self.directory_engines:
+            directory_metadata.create_all(bind=engine)
+        rebuild = False
+        with self.directory_engine.begin() as connection:
+            stored = connection.scalar(select(user_shard_meta.c.shard_count))
+            if stored is None:
+                connection.execute(insert(user_shard_meta).values(id=1, shard_count=self.shard_count))
+                # 디렉터리 배치가 바뀐 경우(파티션 도입 등) 기존 샤드 내용으로 채운다
+                rebuild = self._has_users()
+            elif stored != self.shard_count:
+                raise RuntimeError(
+                    f"user data is sharded {stored} ways, USER_SHARDS={self.shard_count}"
+                )
+        for engine in self.directory_engines:
+            # 대소문자 구분 없는 조회 이전에 만든 디렉터리는 소문자 키로 다시 만든다
+            with engine.connect() as connection:
+                rebuild = rebuild or connection.scalar(
+                    select(user_directory.c.email)
+                    .where(user_directory.c.email != func.lower(user_directory.c.email))
+                    .limit(1)
+                ) is not None
+        if rebuild:
+            self.rebuild_directory()
+
+    def _has_users(self) -> bool:
+        for engine in self.engines:
+            with engine.connect() as connection:
+                if connection.scalar(select(User.id).limit(1)) is not None:
+                    return True
+        return False
+
+    def shard_for_username(self, username: str) -> int:
+        digest = hashlib.blake2b(shard_key(username), digest_size=8).digest()
+        return int.from_bytes(digest, "big") % self.shard_count
+
+    def shard_for_id(self, user_id: int) -> int:
+        return (user_id - 1) % self.shard_count
+
+    def directory_partition(self, email: str) -> int:
+        """email 이 등록되는 디렉터리 파티션"""
+        digest = hashlib.blake2b(directory_key(email).encode(), digest_size=8).digest()
+        return int.from_bytes(digest, "big") % len(self.directory_engines)
+
+    def shard_for_email(self, email: str) -> Optional[int]:
+        """디렉터리에서 email 의 샤드 조회 (없으면 None)"""
+        with self.directory_engines[self.directory_partition(email)].connect() as connection:
+            return connection.scalar(
+                select(user_directory.c.shard).where(user_directory.c.email == directory_key(email))
+            )
+
+    @contextmanager
+    def session(self, shard: int) -> Iterator[Session]:
+        with self._sessions[shard]() as db:
+            yield db
+
+    def insert_user(self, values: dict) -> User:
+        """샤드에 사용자 저장 후 디렉터리에 email 등록
+
+        Raises:
+            IntegrityError: username 또는 email 이 이미 있는 경우
+        """
+        shard = self.shard_for_username(values["username"])
+        # 샤드 k 의 id 는 k + 1, k + 1 + N, k + 1 + 2N, ... (시퀀스 UPDATE 가 쓰기 락을 잡는다)
+        next_id = (
+            update(user_id_sequence)
+            .where(user_id_sequence.c.id == 1)
+            .values(last_id=user_id_sequence.c.last_id + self.shard_count)
+            .returning(user_id_sequence.c.last_id)
+        )
+        with self.session(shard) as db:
+            user_id = db.scalar(next_id)
+            user = db.scalars(insert(User).values(id=user_id, **values).returning(User)).one()
+            db.commit()
+
+        try:
+            with self.directory_engines[self.directory_partition(user.email)].begin() as connection:
+                connection.execute(insert(user_directory).values(email=directory_key(user.email), shard=shard))
+        except IntegrityError:
+            with self.session(shard) as db:
+                db.execute(delete(User).where(User.id == user.id))
+                db.commit()
+            raise
+        return user
+
+    def rebuild_directory(self) -> int:
+        """샤드 내용으로 디렉터리를 다시 만든다 (등록된 email 수 반환)
+
+        샤드 쓰기와 디렉터리 등록 사이에 프로세스가 죽어 빠진 항목을 복구한다.
+        대소문자만 다른 email 이 여러 샤드에 있으면 앞 샤드의 것만 등록된다.
+        """
+        shards_by_key = {}
+        for shard, engine in enumerate(self.engines):
+            with engine.connect() as shard_connection:
+                for email in shard_connection.scalars(select(User.email)):
+                    shards_by_key.setdefault(directory_key(email), shard)
+        partitions = [[] for _ in self.directory_engines]
+        for key, shard in shards_by_key.items():
+            partitions[self.directory_partition(key)].append({"email": key, "shard": shard})
+        for engine, rows in zip(self.directory_engines, partitions):
+            with engine.begin() as connection:
+                connection.execute(delete(user_directory))
+                if rows:
+                    connection.execute(insert(user_directory), rows)
+        return len(shards_by_key)
+
+
+user_shards = UserShards(USER_SHARDS) if USER_SHARDS > 0 else None
@@ -1,19 +1,158 @@
-from sqlalchemy import create_engine
+import threading
+
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
+from app.utils import backup, batch, deadline, tracing
+
 SQLALCHEMY_DATABASE_URL = "sqlite:///./app.db"
 
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
 )
+tracing.instrument_engine(engine)
+deadline.install_statement_timeouts(engine)
+
+
+@event.listens_for(engine, "connect")
+def _enable_incremental_vacuum(dbapi_connection, connection_record):
+    # 새로 만드는 DB 파일만 적용된다 (기존 DB 는 python -m app.cli maintenance 로 전환)
+    dbapi_connection.execute("PRAGMA auto_vacuum = INCREMENTAL")
+
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# POST /api/batch 전용 엔진: 배치 전체를 한 트랜잭션으로 묶고 하위 요청의
+# commit/rollback 을 SAVEPOINT 로 처리한다 (app.utils.batch.open_batch_session)
+batch_engine = create_engine(
+    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+)
+tracing.instrument_engine(batch_engine)
+deadline.install_statement_timeouts(batch_engine)
+batch.use_explicit_transactions(batch_engine)
+BatchSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=batch_engine)
+# 무거운 읽기 엔드포인트용 메모리 복제본 (READ_REPLICA=1 일 때만)
+read_replica = backup.ReadReplica(engine) if backup.READ_REPLICA else None
+
 Base = declarative_base()
 
 
+class SessionStats:
+    """get_db 세션 사용 통계
+
+    requested: get_db 가 세션을 내준 횟수
+    materialized: 실제 Session 객체가 만들어진 횟수
+    touched: 커넥션을 체크아웃해 DB 에 접근한 횟수
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requested = 0
+        self.materialized = 0
+        self.touched = 0
+
+    def add(self, materialized: bool, touched: bool) -> None:
+        with self._lock:
+            self.requested += 1
+            self.materialized += materialized
+            self.touched += touched
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "requested": self.requested,
+                "materialized": self.materialized,
+                "touched": self.touched,
+                "untouched": self.requested - self.touched,
+            }
+
+
+session_stats = SessionStats()
+
+
+@event.listens_for(SessionLocal, "after_begin")
+def _mark_touched(session, transaction, connection):
+    session.info["touched"] = True
+
+
+class LazySession:
+    """첫 사용 시점에 Session 을 만드는 프록시
+
+    핸들러가 DB 에 닿기 전에 끝나면(잘못된 토큰, 캐시 적중, 검증 실패 등)
+    Session 객체를 만들지 않는다. Session 도 첫 쿼리 전에는 커넥션을 체크아웃하지
+    않으므로 아끼는 것은 Session 생성 비용뿐이다.
+
+    Session 의 메서드와 속성은 그대로 위임하지만 Session 의 하위 클래스가
+    아니므로 isinstance(db, Session) 검사는 False 다.
+    """
+
+    __slots__ = ("_session", "_closed")
+
+    def __init__(self):
+        self._session = None
+        self._closed = False
+
+    def _materialize(self):
+        if self._session is None:
+            with tracing.span("db.session.checkout"):
+                self._session = SessionLocal()
+        return self._session
+
+    def __getattr__(self, name):
+        return getattr(self._materialize(), name)
+
+    def __contains__(self, instance):
+        return instance in self._materialize()
+
+    def __iter__(self):
+        return iter(self._materialize())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Session 을 닫는다. 통계는 처음 닫을 때 한 번만 센다."""
+        session = self._session
+        touched = session is not None and session.info.get("touched", False)
+        if session is not None:
+            session.close()
+            self._session = None
+        if self._closed:
+            return
+        self._closed = True
+        session_stats.add(session is not None, touched)
+
+
 def get_db():
-    db = SessionLocal()
+    # 배치 요청의 하위 요청이면 배치가 연 세션을 공유 (닫기는 배치가 담당)
+    context = batch.current_batch()
+    if context is not None:
+        yield context.session
+        return
+
+    db = LazySession()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_read_db():
+    """읽기 전용 엔드포인트용 세션
+
+    READ_REPLICA=1 이면 메모리 읽기 복제본 세션을 내준다. 복제본은
+    READ_REPLICA_REFRESH_SECONDS 만큼 늦을 수 있다. 배치 요청 안에서는
+    배치의 스냅샷을 보도록 get_db 와 같은 세션을 쓴다.
+    """
+    if read_replica is None or batch.current_batch() is not None:
+        yield from get_db()
+        return
+
+    db = read_replica.session()
     try:
         yield db
     finally:
@@ -1,13 +1,97 @@
-from fastapi import FastAPI
+import os
+from contextlib import asynccontextmanager
+
+import anyio
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.database import engine, Base
-from app.routers import examples, auth
+from app.database import engine, batch_engine, Base, SessionLocal, read_replica
+from app.crud.stats import rebuild_stats, stats_initialized
+from app.crud.user_shards import user_shards
+from app.models.example import ensure_example_search_index
+from app.models.user import ensure_user_lookup_indexes
+from app.utils.admission import ADMISSION_CONTROL
+from app.utils.audit import audit_log
+from app.utils.auth import revocation_store
+from app.utils.compression import COMPRESSION
+from app.utils.deadline import DeadlineExceeded
+from app.utils import tracing
+from app.utils.lifecycle import lifecycle
+from app.utils.maintenance import MAINTENANCE_SCHEDULER, maintenance_scheduler
+from app.utils.user_cache import user_cache
+from app.middleware import (
+    AdmissionControlMiddleware,
+    CompressionMiddleware,
+    DeadlineMiddleware,
+    IdempotencyMiddleware,
+    InFlightMiddleware,
+    TracingMiddleware,
+)
+from app.routers import examples, auth, admin, batch, stats
+
+# 마스터가 fork 전에 init_db 를 실행했으면 app.server 가 "1" 로 설정한다.
+# 워커가 DDL, 카운터 재계산, 공유 캐시 비우기를 다시 하지 않게 한다.
+SKIP_INIT_DB_ENV = "SKIP_INIT_DB"
+
+
+def init_db() -> None:
+    """데이터베이스 테이블 생성 (import 시점이 아니라 앱 시작 시 실행)"""
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        ensure_example_search_index(connection)
+        ensure_user_lookup_indexes(connection)
+    if user_shards is not None:
+        user_shards.create_all()
+    # 카운터 도입 이전 DB 는 처음 한 번 테이블을 세어 채운다
+    with SessionLocal() as db:
+        if not stats_initialized(db):
+            rebuild_stats(db)
+    # 공유 사용자 캐시는 서버 재시작 뒤에도 남으므로 (DB 복원 등) 시작할 때 비운다
+    if user_cache is not None:
+        user_cache.invalidate_all()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if os.getenv(SKIP_INIT_DB_ENV) != "1":
+        await anyio.to_thread.run_sync(init_db)
+    # 폐기 목록을 채운 뒤 받기 시작하고, 이후 동기화는 백그라운드 스레드가 맡는다
+    await anyio.to_thread.run_sync(revocation_store.sync)
+    revocation_store.start()
+    # 읽기 복제본은 워커 프로세스의 메모리 DB 이므로 워커마다 첫 요청 전에 채운다
+    if read_replica is not None:
+        await anyio.to_thread.run_sync(read_replica.refresh)
+    # 부하가 낮을 때 ANALYZE / incremental vacuum 을 조금씩 실행
+    if MAINTENANCE_SCHEDULER:
+        maintenance_scheduler.start()
+    lifecycle.mark_ready()
+    yield
+    # 서버가 실행 중인 요청을 모두 끝낸 뒤 호출된다
+    lifecycle.begin_drain()
+    await anyio.to_thread.run_sync(maintenance_scheduler.stop)
+    await anyio.to_thread.run_sync(revocation_store.stop)
+    # 종료 시 큐에 남은 감사 이벤트와 트레이스 기록
+    await anyio.to_thread.run_sync(audit_log.flush)
+    await anyio.to_thread.run_sync(tracing.flush)
+    engine.dispose()
+    batch_engine.dispose()
+
+
+app = FastAPI(title="Module 5 API", version="1.0.0", lifespan=lifespan)
 
-# 데이터베이스 테이블 생성
-Base.metadata.create_all(bind=engine)
+# 부하 차단 (route 클래스별 동시성 한도, 우선순위: health > read > write > auth)
+if ADMISSION_CONTROL:
+    app.add_middleware(AdmissionControlMiddleware)
+else:
+    # 부하 차단 없이도 유지보수 스케줄러가 부하를 볼 수 있게 실행 중 요청 수만 센다
+    app.add_middleware(InFlightMiddleware)
 
-app = FastAPI(title="Module 5 API", version="1.0.0")
+# Idempotency-Key 재시도 응답 재생 (재생은 부하 차단 슬롯을 쓰지 않음)
+app.add_middleware(IdempotencyMiddleware)
+
+# 요청 마감 시간 (X-Request-Timeout 헤더 또는 라우트 기본값, DB 문장 타임아웃으로 전파)
+app.add_middleware(DeadlineMiddleware)
 
 # CORS 설정
 app.add_middleware(
@@ -18,11 +102,36 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 응답 압축 (gzip / brotli / zstd, ETag 별 압축 결과 캐시)
+if COMPRESSION:
+    app.add_middleware(CompressionMiddleware)
+
+# 요청 트레이싱 (TRACE_SAMPLE_RATE > 0 일 때만 기록)
+app.add_middleware(TracingMiddleware)
+
+
+@app.exception_handler(DeadlineExceeded)
+async def deadline_exceeded_handler(request: Request, exc: DeadlineExceeded):
+    return JSONResponse(status_code=504, content={"detail": "Request deadline exceeded"})
+
+
 # 라우터 등록
 app.include_router(examples.router)
 app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
+app.include_router(admin.router)
+app.include_router(batch.router)
+app.include_router(stats.router)
 
 
 @app.get("/api/health")
 def health_check():
     return {"status": "ok", "message": "FastAPI 서버가 정상 작동 중입니다."}
+
+
+@app.get("/api/ready")
+def readiness_check():
+    """트래픽을 받아도 되는지 (시작 전이거나 종료 드레인 중이면 503)"""
+    status = lifecycle.status()
+    if not lifecycle.ready:
+        return JSONResponse(status_code=503, content=status)
+    return status
@@ -0,0 +1,15 @@
+from app.middleware.admission import AdmissionControlMiddleware
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.deadline import DeadlineMiddleware
+from app.middleware.idempotency import IdempotencyMiddleware
+from app.middleware.lifecycle import InFlightMiddleware
+from app.middleware.tracing import TracingMiddleware
+
+__all__ = [
+    "AdmissionControlMiddleware",
+    "CompressionMiddleware",
+    "DeadlineMiddleware",
+    "IdempotencyMiddleware",
+    "InFlightMiddleware",
+    "TracingMiddleware",
+]
@@ -0,0 +1,51 @@
+import json
+
+from app.utils.admission import AdmissionRejected, admission_controller, classify
+
+
+class AdmissionControlMiddleware:
+    """요청 클래스별 동시성 한도를 적용하는 ASGI 미들웨어
+
+    한도를 넘으면 대기열에서 기다리고, 대기열이 가득 찼거나 대기 시간이 지나면
+    503 과 Retry-After 헤더로 바로 응답한다.
+    """
+
+    def __init__(self, app, controller=admission_controller):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope.get("app.batch_subrequest"):
+            # 배치 하위 요청은 이미 슬롯을 가진 배치 요청 안에서 실행된다
+            await self.app(scope, receive, send)
+            return
+
+        route_class = classify(scope["method"], scope["path"])
+        if route_class is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await self.controller.acquire(route_class)
+        except AdmissionRejected as exc:
+            await _send_overloaded(send, exc)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(route_class)
+
+
+async def _send_overloaded(send, exc: AdmissionRejected) -> None:
+    body = json.dumps({"detail": "Service temporarily overloaded", "class": exc.route_class}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": 503,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(exc.retry_after).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
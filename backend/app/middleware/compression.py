@@ -0,0 +1,118 @@
+import anyio
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.utils import tracing
+from app.utils.compression import (
+    COMPRESSION_MIN_SIZE,
+    COMPRESSION_THREAD_MIN_BYTES,
+    COMPRESSION_TYPES,
+    available_encoders,
+    body_etag,
+    choose_encoding,
+    compression_cache,
+    encoded_etag,
+    etag_matches,
+    is_compressible,
+    timed,
+)
+
+
+class CompressionMiddleware:
+    """Accept-Encoding 에 맞춰 응답 본문을 압축하는 ASGI 미들웨어
+
+    한 번에 보내는 응답만 압축한다. 여러 조각으로 흘려보내는 응답(SSE,
+    StreamingResponse)은 모으지 않고 그대로 통과시킨다.
+    """
+
+    def __init__(
+        self,
+        app,
+        encoders=None,
+        cache=compression_cache,
+        min_size: int = COMPRESSION_MIN_SIZE,
+        types=COMPRESSION_TYPES,
+    ):
+        self.app = app
+        self.encoders = encoders if encoders is not None else available_encoders()
+        self.cache = cache
+        self.min_size = min_size
+        self.types = types
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope.get("app.batch_subrequest"):
+            # 배치 하위 응답은 배치 응답 전체가 한 번에 압축된다
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        encoding = choose_encoding(request_headers.get("accept-encoding"), self.encoders)
+        if_none_match = request_headers.get("if-none-match")
+        start = None
+        streaming = False
+
+        async def send_wrapper(message):
+            nonlocal start, streaming
+            if message["type"] == "http.response.start":
+                # 본문을 보기 전까지 헤더를 보내지 않는다
+                start = message
+                return
+            if message["type"] != "http.response.body" or streaming:
+                await send(message)
+                return
+            if message.get("more_body", False):
+                streaming = True
+                await send(start)
+                await send(message)
+                return
+            await self._send_response(
+                send, scope["method"], start, message.get("body", b""), encoding, if_none_match
+            )
+
+        await self.app(scope, receive, send_wrapper)
+
+    async def _send_response(self, send, method, start, body, encoding, if_none_match) -> None:
+        headers = MutableHeaders(raw=list(start.get("headers", ())))
+        status = start["status"]
+        if not is_compressible(headers.get("content-type"), self.types) or "content-encoding" in headers:
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        headers.add_vary_header("Accept-Encoding")
+        if len(body) < self.min_size:
+            encoding = None
+
+        etag = None
+        if method == "GET" and status == 200 and "no-store" not in headers.get("cache-control", ""):
+            etag = headers.get("etag") or body_etag(body)
+            headers["etag"] = encoded_etag(etag, encoding) if encoding else etag
+            if etag_matches(if_none_match, etag, self.encoders):
+                self.cache.not_modified += 1
+                del headers["content-length"]
+                del headers["content-type"]
+                await send({"type": "http.response.start", "status": 304, "headers": headers.raw})
+                await send({"type": "http.response.body", "body": b""})
+                return
+
+        if encoding is not None:
+            compressed = self.cache.get(etag, encoding) if etag else None
+            if compressed is None:
+                compressed = await self._compress(encoding, body)
+                if etag:
+                    self.cache.put(etag, encoding, compressed)
+            body = compressed
+            headers["content-encoding"] = encoding
+            headers["content-length"] = str(len(body))
+
+        await send({**start, "headers": headers.raw})
+        await send({"type": "http.response.body", "body": body})
+
+    async def _compress(self, encoding: str, body: bytes) -> bytes:
+        encoder = self.encoders[encoding]
+        with tracing.span("http.compress", **{"compression.encoding": encoding, "compression.bytes_in": len(body)}):
+            if len(body) >= COMPRESSION_THREAD_MIN_BYTES:
+                compressed, seconds = await anyio.to_thread.run_sync(timed, encoder, body)
+            else:
+                compressed, seconds = timed(encoder, body)
+        self.cache.record(len(body), len(compressed), seconds)
+        return compressed
@@ -0,0 +1,66 @@
+import asyncio
+import json
+
+from app.utils import deadline
+from app.utils.admission import classify
+
+# DB interrupt 가 먼저 504 를 만들 수 있도록 바깥 타임아웃에 두는 여유(초)
+DEADLINE_GRACE_SECONDS = 0.05
+
+
+class DeadlineMiddleware:
+    """요청 마감 시간을 설정하고, 넘기면 504 로 끊는 ASGI 미들웨어
+
+    마감은 X-Request-Timeout 헤더(초) 또는 라우트 클래스 기본값에서 정한다.
+    DB 계층은 같은 마감을 읽어 문장을 중단하므로, 스레드풀에서 도는 동기
+    핸들러도 마감 이후 DB 작업을 계속하지 않는다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope.get("app.batch_subrequest"):
+            # 배치 하위 요청은 배치 요청의 마감을 그대로 따른다
+            await self.app(scope, receive, send)
+            return
+
+        header_value = None
+        for key, value in scope.get("headers", ()):
+            if key == deadline.REQUEST_TIMEOUT_HEADER.encode():
+                header_value = value.decode("latin-1")
+                break
+        timeout = deadline.resolve_timeout(header_value, classify(scope["method"], scope["path"]))
+        if timeout is None:
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_wrapper(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        token = deadline.set_deadline(timeout)
+        try:
+            await asyncio.wait_for(self.app(scope, receive, send_wrapper), timeout + DEADLINE_GRACE_SECONDS)
+        except asyncio.TimeoutError:
+            if not response_started:
+                await send_gateway_timeout(send)
+        finally:
+            deadline.reset_deadline(token)
+
+
+async def send_gateway_timeout(send) -> None:
+    body = json.dumps({"detail": "Request deadline exceeded"}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": 504,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,153 @@
+import asyncio
+import json
+
+from app.utils.idempotency import (
+    IDEMPOTENCY_HEADER,
+    IDEMPOTENCY_KEY_MAX_LENGTH,
+    IDEMPOTENCY_MAX_BODY_BYTES,
+    IDEMPOTENCY_REPLAYED_HEADER,
+    IDEMPOTENT_ROUTES,
+    fingerprint,
+    idempotency_store,
+    scope_key,
+)
+
+
+class IdempotencyMiddleware:
+    """Idempotency-Key 헤더가 있는 요청의 응답을 저장하고 재생하는 ASGI 미들웨어
+
+    IDEMPOTENT_ROUTES 에 등록된 엔드포인트에만 적용된다. 헤더가 없으면
+    아무것도 하지 않는다.
+    """
+
+    def __init__(self, app, store=idempotency_store):
+        self.app = app
+        self.store = store
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope.get("app.batch_subrequest")
+            or (scope["method"], scope["path"]) not in IDEMPOTENT_ROUTES
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        idempotency_key = None
+        authorization = None
+        for name, value in scope.get("headers", ()):
+            if name == IDEMPOTENCY_HEADER.encode():
+                idempotency_key = value.decode("latin-1")
+            elif name == b"authorization":
+                authorization = value
+        if idempotency_key is None:
+            await self.app(scope, receive, send)
+            return
+        if not idempotency_key or len(idempotency_key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+            await _send_error(send, 400, "Invalid Idempotency-Key header")
+            return
+
+        # 지문을 만들기 위해 본문을 먼저 읽고, 앱에는 그대로 다시 넘긴다
+        messages = []
+        body = b""
+        while True:
+            message = await receive()
+            messages.append(message)
+            if message["type"] != "http.request":
+                break
+            body += message.get("body", b"")
+            if not message.get("more_body", False):
+                break
+
+        async def replay_receive():
+            if messages:
+                return messages.pop(0)
+            return await receive()
+
+        key = scope_key(authorization, scope["method"], scope["path"], idempotency_key)
+        request_fingerprint = fingerprint(body)
+
+        while True:
+            stored = self.store.get(key)
+            if stored is not None:
+                if stored.fingerprint != request_fingerprint:
+                    self.store.conflicts += 1
+                    await _send_error(send, 422, "Idempotency-Key was already used with a different request")
+                    return
+                self.store.replays += 1
+                await _send_stored(send, stored)
+                return
+
+            in_flight = self.store.in_flight(key)
+            if in_flight is None:
+                break
+            in_flight_fingerprint, future = in_flight
+            if in_flight_fingerprint != request_fingerprint:
+                self.store.conflicts += 1
+                await _send_error(send, 409, "A request with this Idempotency-Key is in progress")
+                return
+            # 처음 요청이 끝나면 저장된 응답을 재생하거나, 저장되지 않았으면 직접 실행
+            self.store.waits += 1
+            await asyncio.shield(future)
+
+        status = None
+        headers = []
+        chunks = []
+        size = 0
+        forward = True
+
+        async def send_wrapper(message):
+            nonlocal status, headers, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", ()))
+            elif message["type"] == "http.response.body":
+                chunk = message.get("body", b"")
+                size += len(chunk)
+                if size <= IDEMPOTENCY_MAX_BODY_BYTES:
+                    chunks.append(chunk)
+            if forward:
+                await send(message)
+
+        async def run():
+            try:
+                await self.app(scope, replay_receive, send_wrapper)
+                # 5xx 는 일시적 실패일 수 있으므로 재시도가 다시 실행되게 둔다
+                if status is not None and status < 500 and size <= IDEMPOTENCY_MAX_BODY_BYTES:
+                    self.store.put(key, request_fingerprint, status, headers, b"".join(chunks))
+            finally:
+                self.store.finish(key)
+
+        self.store.begin(key, request_fingerprint)
+        task = asyncio.ensure_future(run())
+        try:
+            await asyncio.shield(task)
+        except asyncio.CancelledError:
+            # 마감(504)으로 이 요청이 끊겨도 스레드풀의 핸들러는 계속 실행되어 커밋할 수
+            # 있다. 핸들러가 끝날 때까지 처리 중으로 두고 그 응답을 저장해서, 같은 키의
+            # 재시도가 다시 실행하지 않고 기다렸다가 재생하게 한다.
+            forward = False
+            self.store.abandoned += 1
+            raise
+
+
+async def _send_stored(send, stored) -> None:
+    await send({
+        "type": "http.response.start",
+        "status": stored.status,
+        "headers": stored.headers + [(IDEMPOTENCY_REPLAYED_HEADER.encode(), b"true")],
+    })
+    await send({"type": "http.response.body", "body": stored.body})
+
+
+async def _send_error(send, status: int, detail: str) -> None:
+    body = json.dumps({"detail": detail}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
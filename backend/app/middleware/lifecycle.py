@@ -0,0 +1,29 @@
+from app.utils.admission import classify
+from app.utils.lifecycle import lifecycle
+
+
+class InFlightMiddleware:
+    """실행 중인 요청 수를 lifecycle.in_flight 에 세는 ASGI 미들웨어
+
+    부하 차단(ADMISSION_CONTROL)이 꺼져 있을 때 유지보수 스케줄러가 부하를
+    판단하는 데 쓴다. 부하 차단과 같이 분류되지 않는 요청(스트림 등)은 세지 않는다.
+    """
+
+    def __init__(self, app, state=lifecycle):
+        self.app = app
+        self.state = state
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope.get("app.batch_subrequest")
+            or classify(scope["method"], scope["path"]) is None
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        self.state.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.state.in_flight -= 1
@@ -0,0 +1,60 @@
+from app.utils import tracing
+
+
+class TracingMiddleware:
+    """요청마다 루트 스팬을 여는 ASGI 미들웨어
+
+    라우팅이 끝난 뒤 scope["route"] 에서 라우트 경로를 읽어 스팬 이름으로 쓴다.
+    샘플링되지 않은 요청은 그대로 통과시킨다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if scope.get("app.batch_subrequest"):
+            # 배치 하위 요청은 배치 요청의 트레이스 안에 자식 스팬으로 기록
+            with tracing.span(f"batch {scope['method']} {scope['path']}"):
+                await self.app(scope, receive, send)
+            return
+
+        traceparent = None
+        for key, value in scope.get("headers", ()):
+            if key == b"traceparent":
+                traceparent = value.decode("latin-1")
+                break
+
+        method = scope["method"]
+        root = tracing.start_root_span(
+            f"{method} {scope['path']}",
+            {"http.method": method, "http.target": scope["path"]},
+            traceparent,
+        )
+        if root is None:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                root.set_attribute("http.status_code", message["status"])
+                if message["status"] >= 500:
+                    root.status_code = tracing.STATUS_ERROR
+            await send(message)
+
+        token = tracing.activate(root)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except BaseException as exc:
+            root.set_error(exc)
+            raise
+        finally:
+            tracing.deactivate(token)
+            route = scope.get("route")
+            if route is not None:
+                root.name = f"{method} {route.path}"
+                root.set_attribute("http.route", route.path)
+            root.end()
@@ -1,4 +1,7 @@
+from app.models.auth_event import AuthEvent
 from app.models.example import Example
+from app.models.revoked_token import RevokedToken
+from app.models.stat_counter import StatDaily, StatTotal
 from app.models.user import User
 
-__all__ = ["Example", "User"]
+__all__ = ["AuthEvent", "Example", "RevokedToken", "StatDaily", "StatTotal", "User"]
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, DateTime, Index
+
+from app.database import Base
+
+
+class AuthEvent(Base):
+    __tablename__ = "auth_events"
+
+    id = Column(Integer, primary_key=True)
+    event_type = Column(String(32), nullable=False)
+    user_id = Column(Integer, nullable=True)
+    username = Column(String(50), nullable=True)
+    email = Column(String(100), nullable=True)
+    client_ip = Column(String(45), nullable=True)
+    user_agent = Column(String(255), nullable=True)
+    detail = Column(String(64), nullable=True)
+    # 큐에 넣은 시각 (배치로 늦게 쓰이므로 server_default 를 쓰지 않는다)
+    occurred_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        # 시간 범위 + keyset 페이지네이션용
+        Index("ix_auth_events_occurred_at_id", "occurred_at", "id"),
+        Index("ix_auth_events_type_occurred_at", "event_type", "occurred_at"),
+    )
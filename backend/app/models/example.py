@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime, DDL, Index, event
 from sqlalchemy.sql import func
 
 from app.database import Base
@@ -12,3 +12,75 @@ class Example(Base):
     description = Column(String(500))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+
+# 전문 검색용 tsvector 식 (PostgreSQL). 인덱스와 검색 쿼리가 같은 식을 써야 인덱스를 탄다.
+EXAMPLE_SEARCH_VECTOR = func.to_tsvector(
+    "simple",
+    func.coalesce(Example.name, "") + " " + func.coalesce(Example.description, ""),
+)
+
+Index(
+    "ix_examples_search_vector",
+    EXAMPLE_SEARCH_VECTOR,
+    postgresql_using="gin",
+).ddl_if(dialect="postgresql")
+
+# 전문 검색 인덱스 (SQLite FTS5)
+# examples 를 content 테이블로 쓰는 external-content 인덱스이며,
+# 트리거로 INSERT/UPDATE/DELETE 를 따라가므로 ORM 을 거치지 않은 쓰기도 반영된다.
+EXAMPLE_FTS_DDL = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS examples_fts USING fts5(
+        name, description,
+        content='examples', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS examples_fts_ai AFTER INSERT ON examples BEGIN
+        INSERT INTO examples_fts(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS examples_fts_ad AFTER DELETE ON examples BEGIN
+        INSERT INTO examples_fts(examples_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS examples_fts_au AFTER UPDATE OF name, description ON examples BEGIN
+        INSERT INTO examples_fts(examples_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO examples_fts(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+)
+
+for _statement in EXAMPLE_FTS_DDL:
+    event.listen(Example.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+
+event.listen(
+    Example.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS examples_fts").execute_if(dialect="sqlite"),
+)
+
+
+def ensure_example_search_index(connection) -> None:
+    """기존 DB 에 FTS 인덱스가 없으면 만들고 현재 행으로 채운다 (SQLite 전용)
+
+    create_all 은 이미 있는 테이블에 after_create 이벤트를 보내지 않으므로,
+    검색 기능 추가 이전에 만들어진 DB 를 위해 앱 시작 시 호출한다.
+    """
+    if connection.dialect.name != "sqlite":
+        return
+    exists = connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'examples_fts'"
+    ).first()
+    for statement in EXAMPLE_FTS_DDL:
+        connection.exec_driver_sql(statement)
+    if not exists:
+        connection.exec_driver_sql("INSERT INTO examples_fts(examples_fts) VALUES ('rebuild')")
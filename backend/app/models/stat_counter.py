@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Date, Integer, String
+
+from app.database import Base
+
+
+class StatTotal(Base):
+    """집계 카운터 (name 별 현재 행 수)"""
+    __tablename__ = "stat_totals"
+
+    name = Column(String(32), primary_key=True)
+    value = Column(Integer, nullable=False, default=0)
+
+
+class StatDaily(Base):
+    """일별 집계 (created_at 의 UTC 날짜별 현재 행 수)"""
+    __tablename__ = "stat_daily"
+
+    name = Column(String(32), primary_key=True)
+    day = Column(Date, primary_key=True)
+    value = Column(Integer, nullable=False, default=0)
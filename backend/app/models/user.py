@@ -1,8 +1,13 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean
+import logging
+
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Index
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.sql import func
 
 from app.database import Base
 
+logger = logging.getLogger(__name__)
+
 
 class User(Base):
     __tablename__ = "users"
@@ -14,3 +19,49 @@ class User(Base):
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+
+# 대소문자 구분 없는 조회용 식 인덱스. 조회문이 같은 식(lower(컬럼) = lower(값))을
+# 써야 인덱스를 탄다. 대소문자만 다른 email / username 의 중복 가입도 막는다.
+# (SQLite 의 lower() 는 ASCII 문자만 바꾼다)
+USER_LOOKUP_COLUMNS = ("email", "username")
+USER_LOOKUP_INDEXES = tuple(
+    Index(f"ux_users_{column}_lower", func.lower(getattr(User, column)), unique=True)
+    for column in USER_LOOKUP_COLUMNS
+)
+
+
+def ensure_user_lookup_indexes(connection) -> list[str]:
+    """기존 DB 에 대소문자 무시 조회 인덱스가 없으면 만든다
+
+    create_all 은 이미 있는 테이블에 인덱스를 추가하지 않으므로 앱 시작 시
+    호출한다. 식 인덱스는 만들 때 기존 행으로 채워지므로 별도 backfill 이
+    필요 없다. 대소문자만 다른 중복 행이 이미 있으면 UNIQUE 로 만들 수 없으니
+    같은 이름의 일반 인덱스로 만들어 조회 속도만 유지한다 (중복을 정리하고
+    인덱스를 지우면 다음 시작 때 UNIQUE 로 다시 만든다).
+
+    Returns:
+        중복 때문에 UNIQUE 없이 만든 인덱스 이름 목록
+    """
+    existing = _index_names(connection)
+    not_unique = []
+    for column, index in zip(USER_LOOKUP_COLUMNS, USER_LOOKUP_INDEXES):
+        if index.name in existing:
+            continue
+        try:
+            with connection.begin_nested():
+                index.create(bind=connection)
+        except IntegrityError:
+            connection.exec_driver_sql(f"CREATE INDEX {index.name} ON users (lower({column}))")
+            not_unique.append(index.name)
+            logger.warning("users.%s has case-insensitive duplicates, %s created without UNIQUE", column, index.name)
+    return not_unique
+
+
+def _index_names(connection) -> set[str]:
+    # 식 인덱스는 SQLAlchemy 반영(inspect)에서 빠지므로 카탈로그를 직접 본다
+    if connection.dialect.name == "sqlite":
+        statement = "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'users'"
+    else:
+        statement = "SELECT indexname FROM pg_indexes WHERE tablename = 'users'"
+    return set(connection.exec_driver_sql(statement).scalars())
@@ -0,0 +1,216 @@
+from datetime import datetime
+from typing import Optional
+
+import anyio
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.orm import Session
+
+from app.crud.audit import list_auth_events
+from app.database import engine, get_db, read_replica, session_stats
+from app.schemas.audit import AuthEventPage
+from app.utils import backup, profiler
+from app.utils.admission import admission_controller
+from app.utils.audit import audit_log
+from app.utils.compression import compression_cache
+from app.utils.idempotency import idempotency_store
+from app.utils.maintenance import maintenance_scheduler
+from app.utils.user_cache import user_cache
+from app.utils.auth import get_current_admin_user
+
+router = APIRouter(prefix="/api/admin", tags=["admin"])
+
+# 샘플에 라우트 라벨을 붙일 엔드포인트 모듈
+PROFILED_MODULES = ("app.routers.auth", "app.routers.examples")
+
+# 프로파일러 전용 스레드 (기본 스레드풀 슬롯을 점유하지 않음)
+_profiler_limiter = anyio.CapacityLimiter(1)
+
+# 온라인 백업 (한 번에 하나, 백그라운드 스레드)
+backup_runner = backup.BackupRunner(engine)
+
+
+@router.get("/profile", response_class=PlainTextResponse)
+async def profile(
+    request: Request,
+    seconds: float = Query(5.0, gt=0, le=profiler.PROFILE_MAX_SECONDS),
+    interval_ms: float = Query(10.0, ge=1, le=1000),
+    admin=Depends(get_current_admin_user),
+):
+    """실행 중인 워커를 샘플링해 collapsed-stack 프로파일 반환
+
+    Args:
+        seconds: 샘플링 시간(초)
+        interval_ms: 샘플 간격(밀리초)
+
+    Returns:
+        `frame;frame;frame count` 형식의 텍스트 (flamegraph.pl 입력)
+
+    Raises:
+        HTTPException 409: 다른 프로파일링이 진행 중인 경우
+    """
+    if profiler.is_running():
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A profile is already running",
+        )
+    labels = profiler.route_labels(request.app.routes, PROFILED_MODULES)
+    try:
+        stacks = await anyio.to_thread.run_sync(
+            profiler.sample, seconds, interval_ms / 1000, labels, limiter=_profiler_limiter
+        )
+    except profiler.ProfilerBusyError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A profile is already running",
+        )
+    return profiler.format_collapsed(stacks)
+
+
+@router.get("/db/sessions")
+def db_session_stats(admin=Depends(get_current_admin_user)):
+    """get_db 세션 통계 (DB 에 닿지 않은 세션 수 포함)"""
+    return session_stats.snapshot()
+
+
+@router.get("/admission")
+async def admission_metrics(admin=Depends(get_current_admin_user)):
+    """요청 클래스별 동시 실행 수, 대기열 길이, 거절/타임아웃 수"""
+    return admission_controller.metrics()
+
+
+@router.get("/idempotency")
+async def idempotency_stats(admin=Depends(get_current_admin_user)):
+    """Idempotency-Key 저장 항목 수, 처리 중 요청 수, 재생/대기/충돌 수"""
+    return idempotency_store.stats()
+
+
+@router.get("/compression")
+async def compression_stats(admin=Depends(get_current_admin_user)):
+    """응답 압축 횟수, 압축 전후 바이트, 압축 CPU 시간, ETag 캐시 적중 수"""
+    return compression_cache.stats()
+
+
+@router.get("/user-cache")
+async def user_cache_stats(admin=Depends(get_current_admin_user)):
+    """공유 메모리 사용자 캐시 크기, 세대, 이 워커의 적중/채우기/무효화 수"""
+    if user_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **user_cache.stats()}
+
+
+@router.get("/audit", response_model=AuthEventPage)
+def audit_events(
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    event_type: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+    db: Session = Depends(get_db),
+    admin=Depends(get_current_admin_user),
+):
+    """인증 감사 이벤트 조회 (최신순, 시간 범위 + 커서 페이지네이션)
+
+    auth_events 테이블 기록(AUDIT_SINK=table)일 때만 결과가 있다.
+
+    Args:
+        since: 이 시각 이후 (포함, UTC)
+        until: 이 시각 이전 (미포함, UTC)
+        event_type: signup / login / login_failed / logout
+        cursor: 이전 응답의 next_cursor
+        limit: 페이지 크기
+
+    Raises:
+        HTTPException 400: 커서가 올바르지 않은 경우
+    """
+    try:
+        events, next_cursor = list_auth_events(db, since, until, event_type, cursor, limit)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+    return AuthEventPage(events=events, next_cursor=next_cursor)
+
+
+@router.get("/audit/stats")
+async def audit_stats(admin=Depends(get_current_admin_user)):
+    """감사 로그 큐 길이, 기록/버림/실패 수"""
+    return audit_log.stats()
+
+
+@router.post("/backup", status_code=status.HTTP_202_ACCEPTED)
+async def start_backup(
+    pages: int = Query(backup.BACKUP_PAGES_PER_STEP, ge=1),
+    pause_ms: float = Query(backup.BACKUP_STEP_PAUSE_MS, ge=0, le=1000),
+    admin=Depends(get_current_admin_user),
+):
+    """app.db 온라인 백업 시작 (BACKUP_DIR 에 타임스탬프 파일로 저장)
+
+    Args:
+        pages: 단계당 복사할 페이지 수
+        pause_ms: 단계 사이 대기 시간(밀리초)
+
+    Returns:
+        백업 진행 상태 (GET /api/admin/backup 으로 이어서 조회)
+
+    Raises:
+        HTTPException 409: 다른 백업이 진행 중인 경우
+    """
+    try:
+        progress = backup_runner.start(backup.default_backup_path(), pages, pause_ms / 1000)
+    except backup.BackupBusyError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A backup is already running",
+        )
+    return progress.to_dict()
+
+
+@router.get("/backup")
+async def backup_status(admin=Depends(get_current_admin_user)):
+    """마지막 백업의 진행 상태
+
+    Raises:
+        HTTPException 404: 백업을 실행한 적이 없는 경우
+    """
+    if backup_runner.last is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No backup has been started",
+        )
+    return backup_runner.last.to_dict()
+
+
+@router.get("/replica")
+async def replica_stats(admin=Depends(get_current_admin_user)):
+    """메모리 읽기 복제본 세대, 나이, 갱신 시간"""
+    if read_replica is None:
+        return {"enabled": False}
+    return {"enabled": True, **read_replica.stats()}
+
+
+@router.get("/maintenance")
+async def maintenance_status(admin=Depends(get_current_admin_user)):
+    """유지보수 스케줄러 상태와 마지막 크기 통계 (테이블/인덱스 크기, 빈 공간 비율)"""
+    return maintenance_scheduler.status()
+
+
+@router.post("/maintenance/run")
+async def run_maintenance(
+    analyze: bool = Query(False, description="PRAGMA optimize 대신 전체 ANALYZE"),
+    admin=Depends(get_current_admin_user),
+):
+    """유지보수 한 틱을 즉시 실행하고 크기 통계를 새로 수집
+
+    Raises:
+        HTTPException 400: SQLite 가 아닌 DB 인 경우
+    """
+    if not maintenance_scheduler.supported:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Maintenance is only supported on SQLite",
+        )
+    return await anyio.to_thread.run_sync(
+        lambda: maintenance_scheduler.run_once(analyze=analyze, force_stats=True)
+    )
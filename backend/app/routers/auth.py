@@ -1,25 +1,49 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.schemas.user import UserCreate, UserResponse
 from app.schemas.auth import UserLogin, Token
-from app.crud.user import get_user_by_email, get_user_by_username, create_user
+from app.crud.user import (
+    get_user_by_email,
+    get_user_by_username,
+    get_user_credentials_by_email,
+    create_user,
+)
+from app.utils import audit, batch, serialization
 from app.utils.auth import (
     get_password_hash,
     verify_password,
     create_access_token,
+    decode_access_token,
     get_current_user,
+    oauth2_scheme,
+    revocation_store,
 )
 
 router = APIRouter()
 
 
+def _audit(request: Request, event_type: str, **fields) -> None:
+    """요청 정보와 함께 인증 이벤트를 감사 로그 큐에 넣는다
+
+    배치 하위 요청이면 배치 트랜잭션이 커밋된 뒤에 기록한다.
+    """
+    batch.after_commit(
+        audit.audit_log.record,
+        event_type,
+        client_ip=request.client.host if request.client else None,
+        user_agent=request.headers.get("user-agent"),
+        **fields,
+    )
+
+
 @router.post("/signup", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def signup(user: UserCreate, db: Session = Depends(get_db)):
+def signup(request: Request, user: UserCreate, db: Session = Depends(get_db)):
     """회원가입 엔드포인트
 
     Args:
+        request: 요청 객체 (감사 로그용 클라이언트 정보)
         user: 회원가입 정보 (username, email, password)
         db: 데이터베이스 세션
 
@@ -46,15 +70,17 @@ def signup(user: UserCreate, db: Session = Depends(get_db)):
     # 비밀번호 해싱 후 사용자 생성
     hashed_password = get_password_hash(user.password)
     db_user = create_user(db, user, hashed_password)
+    _audit(request, audit.SIGNUP, user_id=db_user.id, username=db_user.username, email=db_user.email)
 
     return db_user
 
 
 @router.post("/login", response_model=Token)
-def login(user_login: UserLogin, db: Session = Depends(get_db)):
+def login(request: Request, user_login: UserLogin, db: Session = Depends(get_db)):
     """로그인 엔드포인트
 
     Args:
+        request: 요청 객체 (감사 로그용 클라이언트 정보)
         user_login: 로그인 정보 (email, password)
         db: 데이터베이스 세션
 
@@ -64,9 +90,10 @@ def login(user_login: UserLogin, db: Session = Depends(get_db)):
     Raises:
         HTTPException 401: 이메일 또는 비밀번호가 올바르지 않은 경우
     """
-    # 이메일로 사용자 조회
-    user = get_user_by_email(db, user_login.email)
+    # 이메일로 로그인에 필요한 컬럼만 조회
+    user = get_user_credentials_by_email(db, user_login.email)
     if not user:
+        _audit(request, audit.LOGIN_FAILED, email=user_login.email, detail="unknown_email")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -75,6 +102,10 @@ def login(user_login: UserLogin, db: Session = Depends(get_db)):
 
     # 비밀번호 검증
     if not verify_password(user_login.password, user.hashed_password):
+        _audit(
+            request, audit.LOGIN_FAILED,
+            user_id=user.id, username=user.username, email=user_login.email, detail="bad_password",
+        )
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -83,6 +114,7 @@ def login(user_login: UserLogin, db: Session = Depends(get_db)):
 
     # JWT 토큰 생성
     access_token = create_access_token(data={"sub": user.username})
+    _audit(request, audit.LOGIN, user_id=user.id, username=user.username, email=user_login.email)
 
     return Token(access_token=access_token, token_type="bearer")
 
@@ -97,4 +129,39 @@ async def get_me(current_user=Depends(get_current_user)):
     Returns:
         현재 사용자 정보
     """
+    if serialization.FAST_JSON_RESPONSES:
+        return serialization.json_response(UserResponse, current_user)
     return current_user
+
+
+@router.post("/logout")
+def logout(
+    request: Request,
+    token: str = Depends(oauth2_scheme),
+    current_user=Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """로그아웃 엔드포인트 (현재 토큰 폐기)
+
+    Args:
+        request: 요청 객체 (감사 로그용 클라이언트 정보)
+        token: JWT 액세스 토큰
+        current_user: 현재 인증된 사용자 (유효한 토큰인지 확인용)
+        db: 데이터베이스 세션
+
+    Returns:
+        로그아웃 결과 메시지
+
+    Raises:
+        HTTPException 400: jti 클레임이 없어 폐기할 수 없는 토큰인 경우
+    """
+    payload = decode_access_token(token)
+    jti = payload.get("jti")
+    if jti is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Token cannot be revoked",
+        )
+    revocation_store.revoke(db, jti, payload["exp"])
+    _audit(request, audit.LOGOUT, user_id=current_user.id, username=current_user.username)
+    return {"message": "Logged out successfully"}
@@ -0,0 +1,134 @@
+import json
+from urllib.parse import quote
+
+import anyio
+from fastapi import APIRouter, HTTPException, Request
+
+from app.database import BatchSessionLocal
+from app.schemas.batch import BatchRequest, BatchResponse, BatchSubRequest, BatchSubResponse
+from app.utils import batch
+from app.utils.admission import classify
+from app.utils.auth import authenticate_token
+
+router = APIRouter(prefix="/api", tags=["batch"])
+
+# 배치로 실행할 수 없는 경로 (중첩 배치, 장시간 스트림)
+EXCLUDED_PATHS = ("/api/batch", "/api/examples/stream")
+
+
+async def _dispatch(app, parent_scope: dict, sub: BatchSubRequest, headers: list) -> BatchSubResponse:
+    """하위 요청 하나를 앱에 직접(ASGI) 전달하고 응답을 모은다"""
+    path, _, query_string = sub.path.partition("?")
+    # 하위 요청은 부하 차단을 거치지 않으므로 auth 클래스(bcrypt 로그인/가입)와
+    # 분류되지 않는 장시간 작업은 배치로 실행하지 않는다
+    if path.rstrip("/") in EXCLUDED_PATHS or classify(sub.method, path) in (None, "auth"):
+        return BatchSubResponse(id=sub.id, status=400, body={"detail": "Path not allowed in batch"})
+
+    body = b"" if sub.body is None else json.dumps(sub.body).encode("utf-8")
+    scope = {
+        "type": "http",
+        "asgi": parent_scope.get("asgi", {"version": "3.0"}),
+        "http_version": parent_scope.get("http_version", "1.1"),
+        "method": sub.method,
+        "scheme": parent_scope.get("scheme", "http"),
+        "server": parent_scope.get("server"),
+        "client": parent_scope.get("client"),
+        "root_path": parent_scope.get("root_path", ""),
+        "path": path,
+        "raw_path": quote(path).encode("latin-1"),
+        "query_string": query_string.encode("latin-1"),
+        "headers": headers + [(b"content-length", str(len(body)).encode("latin-1"))],
+        # 하위 요청 표시 (미들웨어가 중복 처리를 건너뛸 수 있도록)
+        "app.batch_subrequest": True,
+    }
+
+    request_sent = False
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return {"type": "http.disconnect"}
+
+    status = 500
+    content_type = b""
+    chunks = []
+
+    async def send(message):
+        nonlocal status, content_type
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            for key, value in message.get("headers", ()):
+                if key.lower() == b"content-type":
+                    content_type = value
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    try:
+        await app(scope, receive, send)
+    except Exception:
+        status = 500
+        chunks = [b'{"detail":"Internal Server Error"}']
+        content_type = b"application/json"
+
+    raw = b"".join(chunks)
+    if not raw:
+        payload = None
+    elif content_type.startswith(b"application/json"):
+        payload = json.loads(raw)
+    else:
+        payload = raw.decode("utf-8", errors="replace")
+    return BatchSubResponse(id=sub.id, status=status, body=payload)
+
+
+@router.post("/batch", response_model=BatchResponse)
+async def run_batch(batch_request: BatchRequest, request: Request):
+    """여러 API 호출을 한 번의 HTTP 왕복으로 실행
+
+    - 모든 하위 요청은 배치 요청의 Authorization 으로 인증되며, 토큰 검증과
+      사용자 조회는 배치 전체에서 한 번만 한다.
+    - 하위 요청들은 배치 전체를 감싸는 한 트랜잭션의 세션을 공유하고, 요청
+      순서대로 하나씩 실행된다. 모든 하위 요청이 같은 스냅샷을 보며, 하위
+      요청의 commit 은 SAVEPOINT 해제라서 스냅샷을 끝내지 않는다.
+    - 실패한(4xx/5xx) 하위 요청의 변경은 그 SAVEPOINT 로 되돌리고 다음 하위
+      요청을 계속 실행한다. 나머지는 배치가 끝날 때 한 번에 커밋된다.
+    - 각 하위 요청은 자신의 상태 코드와 본문을 돌려받는다. 배치 자체는 200.
+    - SSE 이벤트, 감사 로그 같은 부수 효과는 배치가 커밋된 뒤에 나간다.
+    - 세션 열기(쓰기 락 대기 포함), 사용자 조회, 롤백과 커밋은 스레드풀에서
+      실행해 이벤트 루프를 막지 않는다.
+    """
+    headers = [(b"content-type", b"application/json")]
+    authorization = request.headers.get("authorization")
+    token = None
+    if authorization:
+        headers.append((b"authorization", authorization.encode("latin-1")))
+        scheme, _, credentials = authorization.partition(" ")
+        if scheme.lower() == "bearer" and credentials:
+            token = credentials
+
+    write = any(sub.method != "GET" for sub in batch_request.requests)
+    async with batch.open_batch_session_async(BatchSessionLocal, write=write) as session:
+        user = None
+        if token is not None:
+            try:
+                user = await anyio.to_thread.run_sync(authenticate_token, token, session)
+            except HTTPException:
+                user = None
+        context = batch.BatchContext(session, token=token, user=user)
+
+        responses: list[BatchSubResponse] = []
+        context_token = batch.activate(context)
+        try:
+            for sub in batch_request.requests:
+                mark = batch.pending_effects(session)
+                result = await _dispatch(request.app, request.scope, sub, headers)
+                if result.status >= 400:
+                    # 실패한 하위 요청이 남긴 변경과 부수 효과가 다음 하위 요청에 섞이지 않도록
+                    batch.discard_effects(session, mark)
+                    await anyio.to_thread.run_sync(session.rollback)
+                responses.append(result)
+        finally:
+            batch.deactivate(context_token)
+
+    return BatchResponse(responses=responses)
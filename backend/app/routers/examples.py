@@ -1,40 +1,203 @@
-from fastapi import APIRouter, Depends, HTTPException
+import os
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import delete, select, update
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.crud import stats
+from app.crud.example import get_example_by_id, list_examples, search_examples
+from app.database import SessionLocal, get_db, get_read_db
 from app.models import Example
-from app.schemas import ExampleCreate, ExampleResponse
+from app.schemas import ExampleCreate, ExampleUpdate, ExampleResponse
+from app.utils import batch, serialization
+from app.utils.events import broker
+from app.utils.write_coalescer import WriteCoalescer
+
+# SSE 연결 유지용 주석 전송 간격(초)
+STREAM_KEEPALIVE_SECONDS = 15.0
 
 router = APIRouter(prefix="/api/examples", tags=["examples"])
 
+# 응답 스키마에 필요한 컬럼 (RETURNING / 컬럼 프로젝션용)
+RESPONSE_COLUMNS = [getattr(Example, name) for name in ExampleResponse.model_fields]
+_LIST_COLUMNS = select(*RESPONSE_COLUMNS)
+
+# 동시 생성 요청 group commit 설정 (opt-in)
+EXAMPLE_WRITE_COALESCING = os.getenv("EXAMPLE_WRITE_COALESCING", "0") == "1"
+WRITE_COALESCE_MAX_BATCH = int(os.getenv("WRITE_COALESCE_MAX_BATCH", "64"))
+WRITE_COALESCE_MAX_WAIT_MS = float(os.getenv("WRITE_COALESCE_MAX_WAIT_MS", "2"))
+
+insert_coalescer = WriteCoalescer(
+    SessionLocal,
+    Example,
+    RESPONSE_COLUMNS,
+    max_batch=WRITE_COALESCE_MAX_BATCH,
+    max_wait=WRITE_COALESCE_MAX_WAIT_MS / 1000,
+    # 배치에서 성공한 행들을 같은 트랜잭션에서 카운터에 반영
+    before_commit=lambda session, rows: stats.add_counts(
+        session, stats.EXAMPLES, [row["created_at"] for row in rows]
+    ),
+)
+
 
 @router.get("/", response_model=list[ExampleResponse])
-def get_examples(db: Session = Depends(get_db)):
-    return db.query(Example).all()
+def get_examples(db: Session = Depends(get_read_db)):
+    if serialization.FAST_JSON_RESPONSES:
+        # ORM 엔티티 로딩과 response_model 재검증 없이 컬럼만 읽어 바로 직렬화
+        rows = db.execute(_LIST_COLUMNS).mappings()
+        return serialization.json_list_response(ExampleResponse, rows)
+    return list_examples(db)
+
+
+@router.get("/search", response_model=list[ExampleResponse])
+def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_read_db),
+):
+    examples = search_examples(db, q, limit=limit, offset=offset)
+    if serialization.FAST_JSON_RESPONSES:
+        return serialization.json_list_response(ExampleResponse, examples)
+    return examples
+
+
+@router.get("/stream")
+async def stream_examples(
+    request: Request,
+    last_event_id: str | None = Header(None, alias="Last-Event-ID"),
+    since: str | None = Query(None, description="Last-Event-ID 헤더 대신 쓸 수 있는 이어받기 ID"),
+):
+    """Example 생성/삭제 이벤트 SSE 스트림
+
+    Last-Event-ID(또는 since) 를 주면 그 이후 이벤트를 먼저 재전송한다.
+    이어받을 수 없을 만큼 오래된 ID 이거나 다른 워커(또는 재시작 이전
+    프로세스)가 발급한 ID 라면 `reset` 이벤트를 보내며, 클라이언트는
+    GET /api/examples 로 전체를 다시 읽어야 한다.
+    """
+    resume_from = last_event_id if last_event_id is not None else since
+    subscriber, backlog = broker.subscribe(resume_from)
+
+    async def event_source():
+        sent = broker.local_sequence(resume_from) or 0
+        try:
+            yield "retry: 3000\n\n"
+            if backlog is None:
+                sent = 0
+                yield f"id: {broker.last_event_id()}\nevent: reset\ndata: {{}}\n\n"
+            else:
+                for event in backlog:
+                    sent = event.id
+                    yield event.encode()
+            while True:
+                try:
+                    event = await subscriber.get(STREAM_KEEPALIVE_SECONDS)
+                except ConnectionAbortedError:
+                    return
+                if event is None:
+                    if await request.is_disconnected():
+                        return
+                    yield ": keepalive\n\n"
+                elif event.id > sent:
+                    sent = event.id
+                    yield event.encode()
+        finally:
+            broker.unsubscribe(subscriber)
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get("/{example_id}", response_model=ExampleResponse)
 def get_example(example_id: int, db: Session = Depends(get_db)):
-    example = db.query(Example).filter(Example.id == example_id).first()
-    if not example:
+    example = get_example_by_id(db, example_id)
+    if example is None:
         raise HTTPException(status_code=404, detail="Example not found")
+    if serialization.FAST_JSON_RESPONSES:
+        return serialization.json_response(ExampleResponse, example)
     return example
 
 
 @router.post("/", response_model=ExampleResponse)
 def create_example(example: ExampleCreate, db: Session = Depends(get_db)):
+    if EXAMPLE_WRITE_COALESCING and batch.current_batch() is None:
+        # 다른 요청들과 한 트랜잭션으로 묶어 커밋 (배치 요청은 자기 세션 유지)
+        row = insert_coalescer.submit(example.model_dump())
+        broker.publish("example.created", serialization.get_serializer(ExampleResponse).to_dict(row))
+        if serialization.FAST_JSON_RESPONSES:
+            return serialization.json_response(ExampleResponse, row)
+        return row
+
     db_example = Example(**example.model_dump())
     db.add(db_example)
+    # created_at 은 INSERT ... RETURNING 으로 채워진다
+    db.flush()
+    stats.record_created(db, stats.EXAMPLES, db_example.created_at)
     db.commit()
     db.refresh(db_example)
+    # 배치 안이면 배치 트랜잭션이 커밋된 뒤에 발행된다
+    batch.after_commit(
+        broker.publish,
+        "example.created",
+        serialization.get_serializer(ExampleResponse).to_dict(db_example),
+    )
+    if serialization.FAST_JSON_RESPONSES:
+        return serialization.json_response(ExampleResponse, db_example)
     return db_example
 
 
+@router.patch("/{example_id}", response_model=ExampleResponse)
+def update_example(example_id: int, example: ExampleUpdate, db: Session = Depends(get_db)):
+    values = example.model_dump(exclude_unset=True)
+    if values.get("name", "") is None:
+        raise HTTPException(status_code=422, detail="name cannot be null")
+    if not values:
+        # 바꿀 필드가 없으면 현재 값을 그대로 돌려준다
+        example = get_example_by_id(db, example_id)
+        if example is None:
+            raise HTTPException(status_code=404, detail="Example not found")
+        if serialization.FAST_JSON_RESPONSES:
+            return serialization.json_response(ExampleResponse, example)
+        return example
+
+    # UPDATE ... RETURNING 한 문장으로 갱신과 조회를 처리 (updated_at 은 onupdate 로 설정)
+    statement = (
+        update(Example)
+        .where(Example.id == example_id)
+        .values(**values)
+        .returning(*RESPONSE_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )
+    row = db.execute(statement).mappings().first()
+    if row is None:
+        db.rollback()
+        raise HTTPException(status_code=404, detail="Example not found")
+    db.commit()
+
+    batch.after_commit(broker.publish, "example.updated", serialization.get_serializer(ExampleResponse).to_dict(row))
+    if serialization.FAST_JSON_RESPONSES:
+        return serialization.json_response(ExampleResponse, row)
+    return row
+
+
 @router.delete("/{example_id}")
 def delete_example(example_id: int, db: Session = Depends(get_db)):
-    example = db.query(Example).filter(Example.id == example_id).first()
-    if not example:
+    # SELECT 없이 DELETE ... RETURNING 한 문장으로 처리하고 반환 행으로 존재 여부 판단
+    statement = (
+        delete(Example)
+        .where(Example.id == example_id)
+        .returning(Example.created_at)
+        .execution_options(synchronize_session=False)
+    )
+    deleted = db.execute(statement).first()
+    if deleted is None:
+        db.rollback()
         raise HTTPException(status_code=404, detail="Example not found")
-    db.delete(example)
+    stats.record_deleted(db, stats.EXAMPLES, deleted.created_at)
     db.commit()
+    batch.after_commit(broker.publish, "example.deleted", {"id": example_id})
     return {"message": "Deleted successfully"}
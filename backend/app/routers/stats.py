@@ -0,0 +1,14 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.crud.stats import get_stats
+from app.database import get_db
+from app.schemas.stats import StatsResponse
+
+router = APIRouter(prefix="/api/stats", tags=["stats"])
+
+
+@router.get("", response_model=StatsResponse)
+def read_stats(days: int = Query(7, ge=1, le=366), db: Session = Depends(get_db)):
+    """examples / users 총 수와 최근 days 일의 일별 생성 수 (COUNT(*) 없이 카운터에서 읽음)"""
+    return get_stats(db, days=days)
@@ -1,13 +1,26 @@
-from app.schemas.example import ExampleCreate, ExampleResponse
+from app.schemas.example import ExampleCreate, ExampleUpdate, ExampleResponse
 from app.schemas.user import UserCreate, UserResponse
 from app.schemas.auth import UserLogin, Token, TokenData
+from app.schemas.audit import AuthEventPage, AuthEventResponse
+from app.schemas.batch import BatchRequest, BatchResponse, BatchSubRequest, BatchSubResponse
+from app.schemas.stats import CounterStats, DailyCount, StatsResponse
 
 __all__ = [
     "ExampleCreate",
+    "ExampleUpdate",
     "ExampleResponse",
     "UserCreate",
     "UserResponse",
     "UserLogin",
     "Token",
     "TokenData",
+    "BatchRequest",
+    "BatchResponse",
+    "BatchSubRequest",
+    "BatchSubResponse",
+    "AuthEventResponse",
+    "AuthEventPage",
+    "CounterStats",
+    "DailyCount",
+    "StatsResponse",
 ]
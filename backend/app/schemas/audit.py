@@ -0,0 +1,25 @@
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel
+
+
+class AuthEventResponse(BaseModel):
+    """인증 감사 이벤트 응답 스키마"""
+    id: int
+    event_type: str
+    user_id: Optional[int] = None
+    username: Optional[str] = None
+    email: Optional[str] = None
+    client_ip: Optional[str] = None
+    user_agent: Optional[str] = None
+    detail: Optional[str] = None
+    occurred_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class AuthEventPage(BaseModel):
+    """인증 감사 이벤트 페이지 (next_cursor 가 None 이면 마지막 페이지)"""
+    events: list[AuthEventResponse]
+    next_cursor: Optional[str] = None
@@ -0,0 +1,37 @@
+from typing import Any, Literal, Optional
+from pydantic import BaseModel, Field, field_validator
+
+# 한 번의 배치에 담을 수 있는 최대 하위 요청 수
+MAX_BATCH_SIZE = 20
+
+
+class BatchSubRequest(BaseModel):
+    """배치 하위 요청 스키마"""
+    id: Optional[str] = Field(None, max_length=64, description="응답과 짝을 맞추기 위한 클라이언트 지정 ID")
+    method: Literal["GET", "POST", "PUT", "PATCH", "DELETE"] = "GET"
+    path: str = Field(..., description="/api/ 로 시작하는 경로 (쿼리스트링 포함 가능)")
+    body: Any = None
+
+    @field_validator("path")
+    @classmethod
+    def path_must_be_api(cls, value: str) -> str:
+        if not value.startswith("/api/"):
+            raise ValueError("path must start with /api/")
+        return value
+
+
+class BatchRequest(BaseModel):
+    """배치 요청 스키마"""
+    requests: list[BatchSubRequest] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class BatchSubResponse(BaseModel):
+    """배치 하위 응답 스키마"""
+    id: Optional[str] = None
+    status: int
+    body: Any = None
+
+
+class BatchResponse(BaseModel):
+    """배치 응답 스키마"""
+    responses: list[BatchSubResponse]
@@ -7,6 +7,11 @@ class ExampleCreate(BaseModel):
     description: str | None = None
 
 
+class ExampleUpdate(BaseModel):
+    name: str | None = None
+    description: str | None = None
+
+
 class ExampleResponse(BaseModel):
     id: int
     name: str
@@ -0,0 +1,21 @@
+from datetime import date
+from pydantic import BaseModel
+
+
+class DailyCount(BaseModel):
+    """하루 동안 만들어진(아직 남아 있는) 행 수"""
+    day: date
+    count: int
+
+
+class CounterStats(BaseModel):
+    """카운터 하나의 총 수, 오늘 생성 수, 최근 일별 생성 수"""
+    total: int
+    today: int
+    daily: list[DailyCount]
+
+
+class StatsResponse(BaseModel):
+    """대시보드 집계 응답 (날짜는 UTC 기준)"""
+    examples: CounterStats
+    users: CounterStats
@@ -0,0 +1,192 @@
+"""운영 서버 실행 (gunicorn + uvicorn 워커)
+
+사용법:
+    python -m app.server [--bind HOST:PORT] [--workers N] [--loop LOOP] [--http HTTP]
+
+- 워커 수: WEB_CONCURRENCY 가 없으면 이 프로세스가 쓸 수 있는 CPU 수
+  (CPU affinity 와 cgroup 의 cpu.max 할당량 중 작은 값). bcrypt 해싱은 CPU 를
+  쓰고 SQLite 쓰기는 락 하나에 줄 서므로 코어보다 많은 워커는 이득이 없다.
+- preload: 마스터가 앱을 한 번 import 하고 테이블을 만든 뒤 fork 한다.
+  init_db 는 마스터에서만 실행되고 워커의 lifespan 은 건너뛴다 (SKIP_INIT_DB).
+  지연 import 되는 jose / passlib 도 미리 로드해 워커들이 메모리를 공유한다.
+  fork 된 워커는 부모의 커넥션 풀을 버리고(engine.dispose(close=False))
+  자기 커넥션을 새로 연다.
+- SIGTERM: 워커는 먼저 readiness 를 실패시키고(/api/ready → 503)
+  DRAIN_READINESS_DELAY_SECONDS 동안 계속 요청을 받아 로드 밸런서가 빼갈
+  시간을 준다. 그 뒤 새 연결을 끊고, 실행 중인 요청을 DRAIN_TIMEOUT_SECONDS
+  안에 끝낸 다음 lifespan 종료(감사 로그 flush, 커넥션 풀 정리)를 실행한다.
+  드레인 중 두 번째 신호를 받으면 바로 종료 단계로 넘어간다.
+- 이벤트 루프와 HTTP 파서: SERVER_LOOP (auto | asyncio | uvloop),
+  SERVER_HTTP (auto | h11 | httptools). auto 는 설치되어 있으면 uvloop /
+  httptools 를 쓴다.
+
+개발 중에는 지금처럼 `uvicorn app.main:app --reload` 를 쓰면 된다.
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import math
+import os
+import sys
+from pathlib import Path
+
+from gunicorn.app.base import BaseApplication
+from gunicorn.arbiter import Arbiter
+from uvicorn.server import Server
+from uvicorn.workers import UvicornWorker
+
+from app.utils.lifecycle import lifecycle
+
+# 서버 설정
+SERVER_BIND = os.getenv("SERVER_BIND", "0.0.0.0:8000")
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "0"))
+SERVER_LOOP = os.getenv("SERVER_LOOP", "auto")
+SERVER_HTTP = os.getenv("SERVER_HTTP", "auto")
+# 워커 heartbeat 가 이 시간(초) 동안 없으면 마스터가 워커를 다시 띄운다
+SERVER_WORKER_TIMEOUT = int(os.getenv("SERVER_WORKER_TIMEOUT", "30"))
+
+# 종료 드레인 설정
+DRAIN_READINESS_DELAY_SECONDS = float(os.getenv("DRAIN_READINESS_DELAY_SECONDS", "5"))
+DRAIN_TIMEOUT_SECONDS = int(os.getenv("DRAIN_TIMEOUT_SECONDS", "30"))
+
+LOOP_MODULES = {"auto": None, "asyncio": None, "uvloop": "uvloop"}
+HTTP_MODULES = {"auto": None, "h11": "h11", "httptools": "httptools"}
+
+CGROUP_CPU_MAX = Path("/sys/fs/cgroup/cpu.max")
+
+
+def available_cpus(cpu_max: Path = CGROUP_CPU_MAX) -> int:
+    """이 프로세스가 쓸 수 있는 CPU 수 (affinity 와 cgroup 할당량 반영)"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    try:
+        quota, period = cpu_max.read_text().split()
+        if quota != "max":
+            cpus = min(cpus, math.ceil(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+    return max(1, cpus)
+
+
+def worker_count(configured: int = WEB_CONCURRENCY) -> int:
+    """설정값이 있으면 그대로, 없으면 CPU 수"""
+    return configured if configured > 0 else available_cpus()
+
+
+def dispose_engines(close: bool = True) -> None:
+    """앱의 모든 엔진 커넥션 풀 정리
+
+    Args:
+        close: False 면 풀의 커넥션을 닫지 않고 버리기만 한다 (fork 된 자식에서
+            부모와 공유된 커넥션을 건드리지 않기 위해)
+    """
+    from app.crud.user_shards import user_shards
+    from app.database import batch_engine, engine
+
+    engine.dispose(close=close)
+    batch_engine.dispose(close=close)
+    if user_shards is not None:
+        for shard_engine in user_shards.engines:
+            shard_engine.dispose(close=close)
+        for directory_engine in user_shards.directory_engines:
+            directory_engine.dispose(close=close)
+
+
+class DrainingServer(Server):
+    """SIGTERM 을 받으면 readiness 를 먼저 실패시키고 잠시 뒤 종료하는 uvicorn 서버"""
+
+    drain_delay = DRAIN_READINESS_DELAY_SECONDS
+
+    def handle_exit(self, sig, frame) -> None:
+        if not lifecycle.begin_drain() or self.drain_delay <= 0:
+            super().handle_exit(sig, frame)
+            return
+        # 신호 처리기는 이벤트 루프 스레드에서 실행된다
+        asyncio.get_event_loop().call_later(self.drain_delay, super().handle_exit, sig, frame)
+
+
+class DrainingUvicornWorker(UvicornWorker):
+    """DrainingServer 를 쓰는 gunicorn 워커"""
+
+    CONFIG_KWARGS = {
+        "loop": SERVER_LOOP,
+        "http": SERVER_HTTP,
+        "timeout_graceful_shutdown": DRAIN_TIMEOUT_SECONDS,
+    }
+
+    async def _serve(self) -> None:
+        self.config.app = self.wsgi
+        server = DrainingServer(config=self.config)
+        self._install_sigquit_handler()
+        await server.serve(sockets=self.sockets)
+        if not server.started:
+            sys.exit(Arbiter.WORKER_BOOT_ERROR)
+
+
+def post_fork(server, worker) -> None:
+    # 부모에게서 복사된 풀의 커넥션은 부모 것이므로 닫지 않고 버린다
+    dispose_engines(close=False)
+
+
+class Application(BaseApplication):
+    """app.main:app 을 preload 해서 실행하는 gunicorn 애플리케이션"""
+
+    def __init__(self, options: dict):
+        self.options = options
+        super().__init__()
+
+    def load_config(self) -> None:
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        from app.main import SKIP_INIT_DB_ENV, app, init_db
+        from app.utils import auth
+
+        # fork 전에 한 번만: 테이블 생성, 지연 import 되는 인증 모듈 로드
+        init_db()
+        # 워커는 환경 변수를 물려받아 lifespan 에서 init_db 를 다시 실행하지 않는다
+        os.environ[SKIP_INIT_DB_ENV] = "1"
+        auth.get_pwd_context()
+        import jose.jwt  # noqa: F401
+        dispose_engines()
+        return app
+
+
+def server_options(bind: str, workers: int) -> dict:
+    return {
+        "bind": bind,
+        "workers": workers,
+        "worker_class": "app.server.DrainingUvicornWorker",
+        "preload_app": True,
+        "post_fork": post_fork,
+        "timeout": SERVER_WORKER_TIMEOUT,
+        # 마스터는 이 시간이 지나도 끝나지 않은 워커를 강제 종료한다
+        "graceful_timeout": math.ceil(DRAIN_READINESS_DELAY_SECONDS) + DRAIN_TIMEOUT_SECONDS + 5,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.server")
+    parser.add_argument("--bind", default=SERVER_BIND, help="address to listen on (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=WEB_CONCURRENCY, help="worker processes (default: CPU count)")
+    parser.add_argument("--loop", choices=sorted(LOOP_MODULES), default=SERVER_LOOP, help="event loop")
+    parser.add_argument("--http", choices=sorted(HTTP_MODULES), default=SERVER_HTTP, help="HTTP parser")
+    args = parser.parse_args(argv)
+
+    for module in (LOOP_MODULES[args.loop], HTTP_MODULES[args.http]):
+        if module is not None and importlib.util.find_spec(module) is None:
+            parser.error(f"{module} is not installed")
+    # gunicorn 은 워커 클래스를 이름으로 다시 import 하므로 설정은 환경 변수로 넘긴다
+    os.environ["SERVER_LOOP"] = args.loop
+    os.environ["SERVER_HTTP"] = args.http
+
+    Application(server_options(args.bind, worker_count(args.workers))).run()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
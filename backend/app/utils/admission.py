@@ -0,0 +1,206 @@
+"""요청 클래스별 동시성 제한과 우선순위 기반 부하 차단(admission control)
+
+요청을 health / read / write / auth 네 클래스로 나누고, 클래스마다
+동시 실행 한도와 대기열 크기, 최대 대기 시간을 둔다. 전체 동시 실행 한도도
+따로 있어서, 자리가 나면 우선순위가 높은 클래스의 대기자부터 들여보낸다.
+
+- 대기열이 가득 찬 클래스의 요청은 기다리지 않고 바로 거절한다.
+- 대기 시간이 max_wait 를 넘은 요청도 거절한다.
+- 거절된 요청은 미들웨어가 503 + Retry-After 로 응답한다.
+
+모든 상태는 이벤트 루프 스레드에서만 바뀌므로 락이 필요 없다.
+"""
+
+import asyncio
+import os
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+
+@dataclass
+class RouteClass:
+    """요청 클래스 설정과 통계"""
+    name: str
+    priority: int
+    limit: int
+    queue_size: int
+    max_wait: float
+    in_flight: int = 0
+    admitted: int = 0
+    rejected: int = 0
+    timed_out: int = 0
+    wait_seconds: float = 0.0
+    waiters: deque = field(default_factory=deque)
+
+    def metrics(self) -> dict:
+        return {
+            "priority": self.priority,
+            "limit": self.limit,
+            "queue_size": self.queue_size,
+            "max_wait": self.max_wait,
+            "in_flight": self.in_flight,
+            "queued": len(self.waiters),
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "avg_wait_ms": (self.wait_seconds / self.admitted * 1000) if self.admitted else 0.0,
+        }
+
+
+class AdmissionRejected(Exception):
+    """요청이 허용되지 않은 경우 (retry_after 초 뒤 재시도 권장)"""
+
+    def __init__(self, route_class: str, retry_after: int):
+        super().__init__(f"{route_class} requests are saturated")
+        self.route_class = route_class
+        self.retry_after = retry_after
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, str(default)))
+
+
+def _env_float(name: str, default: float) -> float:
+    return float(os.getenv(name, str(default)))
+
+
+class AdmissionController:
+    """클래스별 동시성 한도와 우선순위 대기열"""
+
+    def __init__(self, total_limit: int, classes: list[RouteClass]):
+        self.total_limit = total_limit
+        self.total_in_flight = 0
+        self.classes = {route_class.name: route_class for route_class in classes}
+        # 우선순위 높은 순 (숫자가 클수록 높음)
+        self._by_priority = sorted(classes, key=lambda c: c.priority, reverse=True)
+
+    def _can_run(self, route_class: RouteClass) -> bool:
+        return route_class.in_flight < route_class.limit and self.total_in_flight < self.total_limit
+
+    def _higher_priority_waiting(self, route_class: RouteClass) -> bool:
+        return any(
+            other.waiters and self._can_run(other)
+            for other in self._by_priority
+            if other.priority > route_class.priority
+        )
+
+    def _admit(self, route_class: RouteClass, waited: float) -> None:
+        route_class.in_flight += 1
+        route_class.admitted += 1
+        route_class.wait_seconds += waited
+        self.total_in_flight += 1
+
+    async def acquire(self, name: str) -> None:
+        """실행 슬롯 확보
+
+        Raises:
+            AdmissionRejected: 대기열이 가득 찼거나 max_wait 안에 자리가 나지 않은 경우
+        """
+        route_class = self.classes[name]
+        if (
+            not route_class.waiters
+            and self._can_run(route_class)
+            and not self._higher_priority_waiting(route_class)
+        ):
+            self._admit(route_class, 0.0)
+            return
+
+        retry_after = max(1, round(route_class.max_wait))
+        if len(route_class.waiters) >= route_class.queue_size:
+            route_class.rejected += 1
+            raise AdmissionRejected(name, retry_after)
+
+        waiter = asyncio.get_running_loop().create_future()
+        started = time.monotonic()
+        route_class.waiters.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), route_class.max_wait)
+        except asyncio.TimeoutError:
+            if waiter.done() and not waiter.cancelled():
+                # 타임아웃과 동시에 슬롯을 받은 경우: 받은 슬롯을 돌려준다
+                self.release(name)
+            else:
+                waiter.cancel()
+            route_class.timed_out += 1
+            raise AdmissionRejected(name, retry_after)
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release(name)
+            else:
+                waiter.cancel()
+            raise
+        finally:
+            try:
+                route_class.waiters.remove(waiter)
+            except ValueError:
+                pass
+        route_class.wait_seconds += time.monotonic() - started
+
+    def release(self, name: str) -> None:
+        """실행 슬롯 반납 후 우선순위 순으로 대기자를 깨운다"""
+        route_class = self.classes[name]
+        route_class.in_flight -= 1
+        self.total_in_flight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        for route_class in self._by_priority:
+            while route_class.waiters and self._can_run(route_class):
+                waiter = route_class.waiters.popleft()
+                if waiter.done():
+                    continue
+                self._admit(route_class, 0.0)
+                waiter.set_result(None)
+            if route_class.waiters and self.total_in_flight >= self.total_limit:
+                return
+
+    def metrics(self) -> dict:
+        return {
+            "total_limit": self.total_limit,
+            "total_in_flight": self.total_in_flight,
+            "classes": {name: route_class.metrics() for name, route_class in self.classes.items()},
+        }
+
+
+# 실행 시간이 요청 파라미터(seconds)나 작업량으로 정해지는 관리 작업.
+# 각자 한 번에 하나만 실행되므로 슬롯을 잡지 않고, 클래스별 마감도 적용하지 않는다.
+UNCLASSIFIED_ADMIN_PATHS = ("/api/admin/profile", "/api/admin/maintenance/run")
+
+
+def classify(method: str, path: str) -> str | None:
+    """요청을 클래스로 분류 (None 이면 제한 대상 아님)"""
+    if path.startswith("/api/health") or path.startswith("/api/ready"):
+        return "health"
+    if path.startswith("/api/examples/stream"):
+        # 장시간 유지되는 SSE 연결은 슬롯을 잡지 않는다
+        return None
+    if path.startswith(UNCLASSIFIED_ADMIN_PATHS):
+        return None
+    if path.startswith("/api/auth/login") or path.startswith("/api/auth/signup"):
+        return "auth"
+    if method in ("GET", "HEAD"):
+        return "read"
+    return "write"
+
+
+# 부하 차단 설정
+ADMISSION_CONTROL = os.getenv("ADMISSION_CONTROL", "1") == "1"
+
+admission_controller = AdmissionController(
+    total_limit=_env_int("ADMISSION_TOTAL_LIMIT", 40),
+    classes=[
+        RouteClass("health", priority=3, limit=_env_int("ADMISSION_HEALTH_LIMIT", 4),
+                   queue_size=_env_int("ADMISSION_HEALTH_QUEUE", 16),
+                   max_wait=_env_float("ADMISSION_HEALTH_MAX_WAIT", 1.0)),
+        RouteClass("read", priority=2, limit=_env_int("ADMISSION_READ_LIMIT", 32),
+                   queue_size=_env_int("ADMISSION_READ_QUEUE", 128),
+                   max_wait=_env_float("ADMISSION_READ_MAX_WAIT", 2.0)),
+        RouteClass("write", priority=1, limit=_env_int("ADMISSION_WRITE_LIMIT", 16),
+                   queue_size=_env_int("ADMISSION_WRITE_QUEUE", 64),
+                   max_wait=_env_float("ADMISSION_WRITE_MAX_WAIT", 5.0)),
+        RouteClass("auth", priority=0, limit=_env_int("ADMISSION_AUTH_LIMIT", 8),
+                   queue_size=_env_int("ADMISSION_AUTH_QUEUE", 32),
+                   max_wait=_env_float("ADMISSION_AUTH_MAX_WAIT", 5.0)),
+    ],
+)
@@ -0,0 +1,248 @@
+"""인증 이벤트 감사 로그 (비동기 배치 기록)
+
+signup / login / 로그인 실패 / logout 을 append-only 로 남긴다. 요청 경로에서는
+이벤트를 메모리 큐에 넣기만 하고, 백그라운드 작성기 스레드가 모아서
+auth_events 테이블이나 회전(rotating) JSONL 파일에 한 번에 쓴다.
+인증 핸들러에 커밋이 하나 더 붙지 않는다.
+
+- 큐가 가득 찼을 때의 정책(AUDIT_BACKPRESSURE):
+  - drop: 기다리지 않고 이벤트를 버린다 (기본값, 인증 지연 없음)
+  - block: 최대 AUDIT_BLOCK_TIMEOUT 초 기다린 뒤에도 자리가 없으면 버린다
+  버린 이벤트 수는 stats() 의 dropped 로 드러난다.
+- 쓰기에 실패한 배치는 재시도하지 않고 write_errors 와 dropped 에 센다.
+  감사 로그 장애가 인증 경로를 막지 않도록 하기 위함이다.
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models import AuthEvent
+
+# 감사 로그 설정
+AUDIT_SINK = os.getenv("AUDIT_SINK", "table")  # table | jsonl | off
+AUDIT_JSONL_PATH = os.getenv("AUDIT_JSONL_PATH", "audit.jsonl")
+AUDIT_JSONL_MAX_BYTES = int(os.getenv("AUDIT_JSONL_MAX_BYTES", str(10 * 1024 * 1024)))
+AUDIT_JSONL_BACKUPS = int(os.getenv("AUDIT_JSONL_BACKUPS", "5"))
+AUDIT_QUEUE_SIZE = int(os.getenv("AUDIT_QUEUE_SIZE", "10000"))
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "256"))
+AUDIT_FLUSH_INTERVAL = float(os.getenv("AUDIT_FLUSH_INTERVAL", "0.5"))
+AUDIT_BACKPRESSURE = os.getenv("AUDIT_BACKPRESSURE", "drop")  # drop | block
+AUDIT_BLOCK_TIMEOUT = float(os.getenv("AUDIT_BLOCK_TIMEOUT", "0.05"))
+
+# 이벤트 종류
+SIGNUP = "signup"
+LOGIN = "login"
+LOGIN_FAILED = "login_failed"
+LOGOUT = "logout"
+
+# 문자열 컬럼 길이 제한 (AuthEvent 와 동일)
+_FIELD_LIMITS = {"username": 50, "email": 100, "client_ip": 45, "user_agent": 255, "detail": 64}
+
+
+class TableSink:
+    """auth_events 테이블에 배치 INSERT"""
+
+    def __init__(self, session_factory: Callable[[], Session]):
+        self.session_factory = session_factory
+
+    def write(self, events: list[dict]) -> None:
+        with self.session_factory() as db:
+            db.execute(insert(AuthEvent), events)
+            db.commit()
+
+
+class JsonlSink:
+    """JSONL 파일에 추가 기록, max_bytes 를 넘으면 path.1 ... path.N 으로 회전"""
+
+    def __init__(self, path: str, max_bytes: int = AUDIT_JSONL_MAX_BYTES, backups: int = AUDIT_JSONL_BACKUPS):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backups = backups
+
+    def _rotate(self) -> None:
+        for index in range(self.backups - 1, 0, -1):
+            source = self.path.with_name(f"{self.path.name}.{index}")
+            if source.exists():
+                source.replace(self.path.with_name(f"{self.path.name}.{index + 1}"))
+        if self.backups > 0:
+            self.path.replace(self.path.with_name(f"{self.path.name}.1"))
+        else:
+            self.path.unlink()
+
+    def write(self, events: list[dict]) -> None:
+        lines = "".join(
+            json.dumps({**event, "occurred_at": event["occurred_at"].isoformat() + "Z"}, ensure_ascii=False) + "\n"
+            for event in events
+        )
+        if self.path.exists() and self.path.stat().st_size >= self.max_bytes:
+            self._rotate()
+        with self.path.open("a", encoding="utf-8") as file:
+            file.write(lines)
+
+
+class AuditLog:
+    """크기 제한 큐 + 백그라운드 배치 작성기"""
+
+    def __init__(
+        self,
+        sink,
+        queue_size: int = AUDIT_QUEUE_SIZE,
+        batch_size: int = AUDIT_BATCH_SIZE,
+        flush_interval: float = AUDIT_FLUSH_INTERVAL,
+        backpressure: str = AUDIT_BACKPRESSURE,
+        block_timeout: float = AUDIT_BLOCK_TIMEOUT,
+    ):
+        """
+        Args:
+            sink: write(events) 를 가진 기록 대상 (None 이면 감사 로그 비활성화)
+            queue_size: 큐에 쌓아둘 최대 이벤트 수
+            batch_size: 한 번에 쓸 최대 이벤트 수
+            flush_interval: 첫 이벤트 이후 배치를 채우려고 기다리는 최대 시간(초)
+            backpressure: 큐가 가득 찼을 때 정책 (drop | block)
+            block_timeout: block 정책에서 기다리는 최대 시간(초)
+        """
+        if backpressure not in ("drop", "block"):
+            raise ValueError(f"unknown backpressure policy: {backpressure}")
+        self.sink = sink
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.backpressure = backpressure
+        self.block_timeout = block_timeout
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        # 통계
+        self.enqueued = 0
+        self.dropped = 0
+        self.written = 0
+        self.batches = 0
+        self.write_errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.sink is not None
+
+    def record(self, event_type: str, **fields) -> bool:
+        """이벤트를 큐에 넣는다 (쓰기는 작성기 스레드가 나중에 한다)
+
+        Returns:
+            큐에 들어갔으면 True, 비활성화 또는 backpressure 로 버려졌으면 False
+        """
+        if self.sink is None:
+            return False
+        event = {
+            "event_type": event_type,
+            "user_id": fields.get("user_id"),
+            "occurred_at": datetime.utcnow(),
+        }
+        for name, limit in _FIELD_LIMITS.items():
+            value = fields.get(name)
+            event[name] = value[:limit] if value is not None else None
+
+        self._ensure_started()
+        try:
+            if self.backpressure == "block":
+                self._queue.put(event, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+            return False
+        self.enqueued += 1
+        return True
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """지금까지 큐에 들어간 이벤트가 기록될 때까지 대기
+
+        Returns:
+            timeout 안에 끝났으면 True
+        """
+        if self.sink is None or self._thread is None:
+            return True
+        marker = threading.Event()
+        try:
+            self._queue.put(marker, timeout=timeout)
+        except queue.Full:
+            return False
+        return marker.wait(timeout)
+
+    def stats(self) -> dict:
+        return {
+            "sink": type(self.sink).__name__ if self.sink is not None else None,
+            "backpressure": self.backpressure,
+            "queued": self._queue.qsize(),
+            "enqueued": self.enqueued,
+            "dropped": self.dropped,
+            "written": self.written,
+            "batches": self.batches,
+            "write_errors": self.write_errors,
+        }
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            batch: list[dict] = []
+            markers: list[threading.Event] = []
+            item = self._queue.get()
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if isinstance(item, threading.Event):
+                    # flush() 요청: 기다리지 않고 지금까지 모은 것을 쓴다
+                    markers.append(item)
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            self._write(batch)
+            for marker in markers:
+                marker.set()
+
+    def _write(self, batch: list[dict]) -> None:
+        if not batch:
+            return
+        try:
+            self.sink.write(batch)
+        except Exception:
+            self.write_errors += 1
+            self.dropped += len(batch)
+            return
+        self.batches += 1
+        self.written += len(batch)
+
+
+def build_sink(kind: str, session_factory: Callable[[], Session]):
+    """AUDIT_SINK 값으로 기록 대상 생성 (off 면 None)"""
+    if kind == "off":
+        return None
+    if kind == "jsonl":
+        return JsonlSink(AUDIT_JSONL_PATH)
+    if kind == "table":
+        return TableSink(session_factory)
+    raise ValueError(f"unknown audit sink: {kind}")
+
+
+audit_log = AuditLog(build_sink(AUDIT_SINK, SessionLocal))
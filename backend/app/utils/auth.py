@@ -1,36 +1,64 @@
+import os
+import uuid
 from datetime import datetime, timedelta
 from typing import Optional
 
-from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 
-from app.database import get_db
-from app.crud.user import get_user_by_username
+from app.database import SessionLocal, get_db
+from app.crud.user import get_user_snapshot_by_username
 from app.schemas.auth import TokenData
+from app.utils import batch, tracing
+from app.utils.revocation import RevocationStore
 
 # JWT 설정
 SECRET_KEY = "your-secret-key-here-change-in-production"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
-# 비밀번호 해싱 컨텍스트
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# 관리자 계정 (쉼표로 구분된 username 목록)
+ADMIN_USERNAMES = frozenset(
+    name.strip() for name in os.getenv("ADMIN_USERNAMES", "").split(",") if name.strip()
+)
+
+# 비밀번호 해싱 컨텍스트 (passlib/bcrypt 는 첫 사용 시 로드)
+_pwd_context = None
 
 # OAuth2 스키마
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
+# 폐기된 토큰 저장소 (로그아웃)
+revocation_store = RevocationStore(SessionLocal)
+
+
+def get_pwd_context():
+    """비밀번호 해싱 컨텍스트 (최초 호출 시 passlib 를 import)"""
+    global _pwd_context
+    if _pwd_context is None:
+        from passlib.context import CryptContext
+        _pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    return _pwd_context
+
+
+def __getattr__(name):
+    # 기존 `from app.utils.auth import pwd_context` 호환
+    if name == "pwd_context":
+        return get_pwd_context()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 def get_password_hash(password: str) -> str:
     """비밀번호를 bcrypt로 해싱"""
-    return pwd_context.hash(password)
+    with tracing.span("auth.password_hash", **{"hash.scheme": "bcrypt"}):
+        return get_pwd_context().hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """평문 비밀번호와 해시된 비밀번호 비교"""
-    return pwd_context.verify(plain_password, hashed_password)
+    with tracing.span("auth.password_verify", **{"hash.scheme": "bcrypt"}):
+        return get_pwd_context().verify(plain_password, hashed_password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -43,47 +71,122 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     Returns:
         인코딩된 JWT 문자열
     """
+    from jose import jwt
+
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
+    # 토큰 단위 폐기(로그아웃)를 위한 고유 ID
+    to_encode.setdefault("jti", uuid.uuid4().hex)
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-):
-    """현재 인증된 사용자 조회 (의존성 함수)
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def authenticate_token(token: str, db: Session):
+    """토큰을 검증하고 사용자 조회 (동기 함수, DB 에 접근할 수 있다)
 
     Args:
         token: JWT 액세스 토큰
         db: 데이터베이스 세션
 
     Returns:
-        인증된 User 객체
+        인증된 사용자
 
     Raises:
         HTTPException: 토큰이 유효하지 않거나 사용자를 찾을 수 없는 경우
     """
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+    from jose import JWTError, jwt
+
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        with tracing.span("auth.jwt_decode"):
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: str = payload.get("sub")
         if username is None:
-            raise credentials_exception
+            raise _credentials_exception()
+        jti = payload.get("jti")
+        if jti is not None and revocation_store.is_revoked(jti):
+            raise _credentials_exception()
         token_data = TokenData(username=username)
     except JWTError:
-        raise credentials_exception
+        raise _credentials_exception()
 
-    user = get_user_by_username(db, username=token_data.username)
+    user = get_user_snapshot_by_username(db, username=token_data.username)
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
     return user
+
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+):
+    """현재 인증된 사용자 조회 (의존성 함수)
+
+    Args:
+        token: JWT 액세스 토큰
+        db: 데이터베이스 세션
+
+    Returns:
+        인증된 User 객체
+
+    Raises:
+        HTTPException: 토큰이 유효하지 않거나 사용자를 찾을 수 없는 경우
+    """
+    # 배치 하위 요청은 배치가 미리 확인한 사용자를 재사용
+    context = batch.current_batch()
+    if context is not None and context.token == token:
+        if context.user is None:
+            raise _credentials_exception()
+        return context.user
+
+    return authenticate_token(token, db)
+
+
+async def get_current_admin_user(current_user=Depends(get_current_user)):
+    """현재 사용자가 관리자인지 확인 (의존성 함수)
+
+    Args:
+        current_user: 현재 인증된 사용자
+
+    Returns:
+        관리자 User 객체
+
+    Raises:
+        HTTPException 403: 관리자가 아닌 경우
+    """
+    if current_user.username not in ADMIN_USERNAMES:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin privileges required",
+        )
+    return current_user
+
+
+def decode_access_token(token: str) -> dict:
+    """JWT 디코딩 후 클레임 반환
+
+    Raises:
+        HTTPException 401: 토큰이 유효하지 않은 경우
+    """
+    from jose import JWTError, jwt
+
+    try:
+        with tracing.span("auth.jwt_decode"):
+            return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
@@ -0,0 +1,329 @@
+"""SQLite 온라인 백업과 메모리 읽기 복제본
+
+파일을 그대로 복사하면 쓰기를 막거나 찢어진(torn) 사본이 생긴다. 여기서는
+SQLite 온라인 백업 API 로 페이지를 조금씩(pages 개) 복사하고, 단계 사이에
+pause 초만큼 쉰다. 소스 DB 의 읽기 락은 각 단계 안에서만 잡히므로 단계 사이에
+signup / create_example 같은 쓰기가 커밋될 수 있다.
+
+- 백업 도중 다른 연결이 소스를 바꾸면 SQLite 가 처음부터 다시 복사하므로,
+  결과는 항상 한 시점의 일관된 스냅샷이다. (진행률의 remaining 이 늘어나면
+  재시작된 것이다.) 쓰기가 계속되면 끝나지 않을 수 있으므로 max_restarts 번
+  재시작되면 나머지를 한 단계(pages=-1)로 복사한다. 그 단계 동안은 소스의 읽기
+  락을 쥐므로 rollback journal 모드에서는 쓰기가 잠시 기다린다.
+- 파일 백업은 `<path>.partial` 에 쓴 뒤 완료되면 rename 한다.
+
+같은 방식으로 DB 를 메모리 DB 로 복사해 무거운 읽기 엔드포인트용 읽기
+복제본(ReadReplica)을 만든다. 첫 복사는 앱 시작 시(lifespan) 하고, 이후
+refresh_interval 마다 백그라운드에서 새로 복사해 교체하므로 그만큼 늦을 수 있다.
+"""
+
+import itertools
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.utils import deadline, tracing
+
+# 온라인 백업 설정
+BACKUP_DIR = os.getenv("BACKUP_DIR", "./backups")
+BACKUP_PAGES_PER_STEP = int(os.getenv("BACKUP_PAGES_PER_STEP", "256"))
+BACKUP_STEP_PAUSE_MS = float(os.getenv("BACKUP_STEP_PAUSE_MS", "5"))
+# 이 횟수만큼 재시작되면 남은 페이지를 한 번에 복사
+BACKUP_MAX_RESTARTS = int(os.getenv("BACKUP_MAX_RESTARTS", "3"))
+
+# 읽기 복제본 설정
+READ_REPLICA = os.getenv("READ_REPLICA", "0") == "1"
+READ_REPLICA_REFRESH_SECONDS = float(os.getenv("READ_REPLICA_REFRESH_SECONDS", "5"))
+
+
+class BackupBusyError(Exception):
+    """다른 백업이 이미 진행 중인 경우"""
+
+
+class _TooManyRestarts(Exception):
+    """단계별 백업을 멈추고 한 번에 복사하라는 내부 신호"""
+
+
+@dataclass
+class BackupProgress:
+    """백업 진행 상태"""
+    path: str
+    state: str = "running"  # running | done | failed
+    pages_total: int = 0
+    pages_remaining: int = 0
+    steps: int = 0
+    restarts: int = 0
+    started_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+
+    def update(self, remaining: int, total: int) -> None:
+        self.pages_remaining = remaining
+        self.pages_total = total
+        self.steps += 1
+
+    def to_dict(self) -> dict:
+        done = self.pages_total - self.pages_remaining
+        return {
+            "path": self.path,
+            "state": self.state,
+            "pages_total": self.pages_total,
+            "pages_copied": done,
+            "percent": round(done / self.pages_total * 100, 1) if self.pages_total else 0.0,
+            "steps": self.steps,
+            "restarts": self.restarts,
+            "started_at": self.started_at.isoformat(),
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "error": self.error,
+        }
+
+
+def online_backup(
+    source: sqlite3.Connection,
+    target: sqlite3.Connection,
+    pages: int = BACKUP_PAGES_PER_STEP,
+    pause: float = BACKUP_STEP_PAUSE_MS / 1000,
+    progress: Optional[Callable[[int, int], None]] = None,
+    max_restarts: int = BACKUP_MAX_RESTARTS,
+) -> int:
+    """source 를 target 으로 pages 개씩 복사하고 단계 사이에 pause 초 쉰다
+
+    Args:
+        source: 복사할 sqlite3 연결
+        target: 복사받을 sqlite3 연결
+        pages: 단계당 복사할 페이지 수
+        pause: 단계 사이 대기 시간(초). 이 동안 다른 연결이 쓰기를 커밋할 수 있다.
+        progress: (remaining, total) 을 받는 진행률 콜백
+        max_restarts: 소스 쓰기로 인한 재시작 허용 횟수. 넘으면 한 단계로 복사한다.
+
+    Returns:
+        재시작 횟수
+    """
+    last_remaining = None
+    restarts = 0
+
+    def on_step(status, remaining, total):
+        nonlocal last_remaining, restarts
+        if progress is not None:
+            progress(remaining, total)
+        # 정상 단계는 remaining 을 줄이므로, 줄지 않았다면 처음부터 다시 복사 중이다
+        if last_remaining is not None and remaining >= last_remaining:
+            restarts += 1
+            if restarts >= max_restarts:
+                raise _TooManyRestarts
+        last_remaining = remaining
+        if remaining and pause > 0:
+            time.sleep(pause)
+
+    try:
+        source.backup(target, pages=pages, progress=on_step)
+    except _TooManyRestarts:
+        # 한 단계로 끝나므로 더 이상 재시작되지 않는다
+        last_remaining = None
+        source.backup(target, pages=-1, progress=on_step)
+    return restarts
+
+
+def backup_to_file(
+    engine,
+    path: str,
+    pages: int = BACKUP_PAGES_PER_STEP,
+    pause: float = BACKUP_STEP_PAUSE_MS / 1000,
+    progress: Optional[BackupProgress] = None,
+    max_restarts: int = BACKUP_MAX_RESTARTS,
+) -> BackupProgress:
+    """엔진의 SQLite DB 를 path 에 온라인 백업
+
+    Raises:
+        sqlite3.Error: 백업에 실패한 경우 (progress.state 는 failed)
+    """
+    progress = progress or BackupProgress(path)
+    partial = f"{path}.partial"
+    if os.path.exists(partial):
+        os.remove(partial)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    source = engine.raw_connection()
+    try:
+        target = sqlite3.connect(partial)
+        try:
+            progress.restarts = online_backup(
+                source.driver_connection, target, pages, pause, progress.update, max_restarts
+            )
+        finally:
+            target.close()
+        os.replace(partial, path)
+        progress.state = "done"
+    except Exception as exc:
+        progress.state = "failed"
+        progress.error = str(exc)
+        if os.path.exists(partial):
+            os.remove(partial)
+        raise
+    finally:
+        source.close()
+        progress.finished_at = datetime.now(timezone.utc)
+    return progress
+
+
+def default_backup_path(directory: str = BACKUP_DIR) -> str:
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    return os.path.join(directory, f"app-{stamp}.db")
+
+
+class BackupRunner:
+    """관리자 엔드포인트용 백그라운드 백업 (한 번에 하나)"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.last: Optional[BackupProgress] = None
+        self._lock = threading.Lock()
+
+    def start(self, path: str, pages: int = BACKUP_PAGES_PER_STEP, pause: float = BACKUP_STEP_PAUSE_MS / 1000) -> BackupProgress:
+        """백업 스레드 시작
+
+        Raises:
+            BackupBusyError: 다른 백업이 진행 중인 경우
+        """
+        with self._lock:
+            if self.last is not None and self.last.state == "running":
+                raise BackupBusyError("a backup is already running")
+            progress = BackupProgress(path)
+            self.last = progress
+
+        def run():
+            try:
+                backup_to_file(self.engine, path, pages, pause, progress)
+            except Exception:
+                # 실패 내용은 progress.error 로 조회한다
+                pass
+
+        threading.Thread(target=run, name="sqlite-backup", daemon=True).start()
+        return progress
+
+
+class ReadReplica:
+    """온라인 백업으로 채운 메모리 읽기 복제본"""
+
+    _ids = itertools.count(1)
+
+    def __init__(
+        self,
+        source_engine,
+        refresh_interval: float = READ_REPLICA_REFRESH_SECONDS,
+        pages: int = BACKUP_PAGES_PER_STEP,
+        pause: float = BACKUP_STEP_PAUSE_MS / 1000,
+    ):
+        self.source_engine = source_engine
+        self.refresh_interval = refresh_interval
+        self.pages = pages
+        self.pause = pause
+        self._name = f"read_replica_{next(self._ids)}"
+        self._generation = 0
+        self._keeper: Optional[sqlite3.Connection] = None
+        self._sessionmaker: Optional[sessionmaker] = None
+        self._refreshed_at = 0.0
+        self._next_refresh = 0.0
+        self._refreshing = False
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        # 통계
+        self.refreshes = 0
+        self.last_refresh_ms = 0.0
+
+    def session(self) -> Session:
+        """복제본 세션 (오래되었으면 백그라운드 갱신 시작)
+
+        첫 복사는 앱 시작 시 refresh() 로 끝내 둔다. lifespan 없이 쓰는 경우에만
+        첫 호출이 동기로 복사한다.
+        """
+        if self._sessionmaker is None:
+            with self._refresh_lock:
+                if self._sessionmaker is None:
+                    self._refresh()
+        elif time.monotonic() >= self._next_refresh:
+            self._refresh_in_background()
+        return self._sessionmaker()
+
+    def refresh(self) -> None:
+        """소스 DB 를 새 메모리 DB 로 복사한 뒤 교체"""
+        with self._refresh_lock:
+            self._refresh()
+
+    def _refresh(self) -> None:
+        started = time.monotonic()
+        # 실패해도 다음 시도까지 refresh_interval 만큼 기다린다
+        self._next_refresh = started + self.refresh_interval
+        generation = self._generation + 1
+        uri = f"file:{self._name}_{generation}?mode=memory&cache=shared"
+
+        # keeper 연결이 열려 있는 동안 메모리 DB 가 유지된다
+        keeper = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        source = self.source_engine.raw_connection()
+        try:
+            online_backup(source.driver_connection, keeper, self.pages, self.pause)
+        except Exception:
+            keeper.close()
+            raise
+        finally:
+            source.close()
+
+        engine = create_engine(
+            "sqlite://",
+            creator=lambda: sqlite3.connect(uri, uri=True, check_same_thread=False),
+            poolclass=NullPool,
+        )
+
+        @event.listens_for(engine, "connect")
+        def _read_only(dbapi_connection, connection_record):
+            dbapi_connection.execute("PRAGMA query_only = ON")
+
+        tracing.instrument_engine(engine)
+        deadline.install_statement_timeouts(engine)
+
+        with self._lock:
+            old_keeper = self._keeper
+            self._keeper = keeper
+            self._sessionmaker = sessionmaker(bind=engine, autoflush=False)
+            self._generation = generation
+            self._refreshed_at = time.monotonic()
+            self._next_refresh = self._refreshed_at + self.refresh_interval
+            self.refreshes += 1
+            self.last_refresh_ms = (self._refreshed_at - started) * 1000
+        if old_keeper is not None:
+            # 이전 세대를 읽는 중인 세션은 자기 연결로 DB 를 유지하다가 닫는다
+            old_keeper.close()
+
+    def _refresh_in_background(self) -> None:
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def run():
+            try:
+                self.refresh()
+            except Exception:
+                # 실패하면 이전 복제본을 계속 쓰고 다음 요청에서 다시 시도한다
+                pass
+            finally:
+                self._refreshing = False
+
+        threading.Thread(target=run, name="read-replica-refresh", daemon=True).start()
+
+    def stats(self) -> dict:
+        return {
+            "generation": self._generation,
+            "age_seconds": round(time.monotonic() - self._refreshed_at, 3) if self._generation else None,
+            "refresh_interval": self.refresh_interval,
+            "refreshes": self.refreshes,
+            "last_refresh_ms": round(self.last_refresh_ms, 3),
+        }
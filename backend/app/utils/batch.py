@@ -0,0 +1,161 @@
+"""배치 요청 실행 컨텍스트
+
+POST /api/batch 의 하위 요청들이 하나의 인증 주체와 하나의 DB 세션을
+공유하도록 contextvar 로 상태를 전달한다. get_db 와 get_current_user 가
+이 컨텍스트를 확인해, 설정되어 있으면 새로 만들지 않고 공유 자원을 쓴다.
+
+배치 세션은 배치 전체를 감싸는 한 트랜잭션 위에서 동작한다
+(open_batch_session). 하위 요청 핸들러의 commit() 은 SAVEPOINT 해제,
+rollback() 은 그 SAVEPOINT 로 되돌리기가 되므로, 쓰기 하위 요청이 커밋해도
+트랜잭션과 스냅샷은 끝나지 않는다. 하위 요청은 세션을 공유하므로 순서대로
+하나씩 실행한다 (Session 은 스레드 안전하지 않다).
+
+하위 요청의 commit 은 아직 확정이 아니므로, 커밋 뒤에 하는 부수 효과(SSE 이벤트,
+감사 로그, 폐기 목록 메모리 반영)는 after_commit 으로 등록해 배치 트랜잭션이
+실제로 커밋된 다음에 실행한다. 배치가 롤백되거나 하위 요청이 실패하면 버려진다.
+"""
+
+import logging
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Callable, Iterator, Optional
+
+import anyio
+from sqlalchemy import event
+from sqlalchemy.orm import Session, sessionmaker
+
+logger = logging.getLogger(__name__)
+
+# session.info 에서 커밋 후 실행할 부수 효과 목록의 키
+_AFTER_COMMIT_KEY = "batch_after_commit"
+
+_current_batch: ContextVar[Optional["BatchContext"]] = ContextVar("current_batch", default=None)
+
+
+def use_explicit_transactions(engine) -> None:
+    """SQLite 트랜잭션을 pysqlite 대신 SQLAlchemy 가 시작하게 한다
+
+    pysqlite 는 SELECT 앞에 BEGIN 을 보내지 않고 SAVEPOINT 도 제대로 다루지
+    못한다. SQLAlchemy 문서의 방법대로 드라이버의 자동 트랜잭션을 끄고
+    begin 이벤트에서 BEGIN 을 보낸다 (connection.info["begin_immediate"] 면
+    BEGIN IMMEDIATE). SQLite 가 아니면 아무 것도 하지 않는다.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine, "connect")
+    def _disable_driver_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _begin(connection):
+        connection.exec_driver_sql("BEGIN IMMEDIATE" if connection.info.get("begin_immediate") else "BEGIN")
+
+
+@contextmanager
+def open_batch_session(session_factory: sessionmaker, write: bool = False) -> Iterator[Session]:
+    """배치 전체를 한 트랜잭션으로 감싼 세션
+
+    스냅샷은 트랜잭션의 첫 읽기(배치 사용자 조회)에서 정해지고, 모든 하위
+    요청이 그 스냅샷과 앞선 하위 요청의 쓰기를 본다. PostgreSQL 은
+    REPEATABLE READ 로 시작한다. 정상 종료하면 바깥 트랜잭션을 한 번
+    커밋하고, 예외로 끝나면 전부 되돌린다.
+
+    SQLite 에서 오래된 스냅샷의 읽기 트랜잭션은 그 사이 다른 커밋이 있으면
+    쓰기로 올라갈 수 없다 (SQLITE_BUSY). 그래서 쓰기가 있는 배치는 처음부터
+    쓰기 락을 잡는다 (BEGIN IMMEDIATE). 다른 쓰기는 배치가 끝날 때까지
+    busy_timeout 만큼 기다린다.
+
+    Args:
+        session_factory: use_explicit_transactions 를 적용한 엔진에 묶인 sessionmaker
+        write: 쓰기 하위 요청이 있는지
+    """
+    engine = session_factory.kw["bind"]
+    with engine.connect() as connection:
+        connection.info["begin_immediate"] = write
+        if connection.dialect.name == "postgresql":
+            connection.execution_options(isolation_level="REPEATABLE READ")
+        transaction = connection.begin()
+        session = session_factory(bind=connection, join_transaction_mode="create_savepoint")
+        session.info[_AFTER_COMMIT_KEY] = []
+        try:
+            yield session
+            session.commit()
+            transaction.commit()
+        except BaseException:
+            transaction.rollback()
+            raise
+        finally:
+            effects = session.info.pop(_AFTER_COMMIT_KEY)
+            session.close()
+        _run_effects(effects)
+
+
+@asynccontextmanager
+async def open_batch_session_async(session_factory: sessionmaker, write: bool = False) -> AsyncIterator[Session]:
+    """open_batch_session 의 시작과 커밋/롤백을 스레드풀에서 실행하는 async 버전
+
+    연결, BEGIN IMMEDIATE 의 잠금 대기, 최종 커밋이 이벤트 루프를 막지 않는다.
+    """
+    manager = open_batch_session(session_factory, write=write)
+    session = await anyio.to_thread.run_sync(manager.__enter__)
+    try:
+        yield session
+    except BaseException as exc:
+        if not await anyio.to_thread.run_sync(manager.__exit__, type(exc), exc, exc.__traceback__):
+            raise
+    else:
+        await anyio.to_thread.run_sync(manager.__exit__, None, None, None)
+
+
+def _run_effects(effects: list) -> None:
+    for callback, args, kwargs in effects:
+        try:
+            callback(*args, **kwargs)
+        except Exception:
+            # 이미 커밋된 배치의 응답을 부수 효과 실패로 바꾸지 않는다
+            logger.exception("batch after-commit effect failed")
+
+
+def after_commit(callback: Callable, *args, **kwargs) -> None:
+    """커밋이 확정된 뒤 실행할 부수 효과
+
+    배치 밖이면 바로 실행한다 (호출하는 쪽이 이미 커밋했다). 배치 안이면
+    배치 트랜잭션이 커밋될 때까지 미룬다.
+    """
+    context = current_batch()
+    if context is None:
+        callback(*args, **kwargs)
+    else:
+        context.session.info[_AFTER_COMMIT_KEY].append((callback, args, kwargs))
+
+
+def pending_effects(session: Session) -> int:
+    """배치 세션에 쌓인 부수 효과 수 (discard_effects 의 기준점)"""
+    return len(session.info[_AFTER_COMMIT_KEY])
+
+
+def discard_effects(session: Session, mark: int) -> None:
+    """mark 이후 등록된 부수 효과를 버린다 (실패해서 되돌린 하위 요청)"""
+    del session.info[_AFTER_COMMIT_KEY][mark:]
+
+
+class BatchContext:
+    """하나의 배치 요청이 공유하는 상태"""
+
+    def __init__(self, session: Session, token: Optional[str] = None, user: Any = None):
+        self.session = session
+        self.token = token
+        self.user = user
+
+
+def current_batch() -> Optional[BatchContext]:
+    return _current_batch.get()
+
+
+def activate(context: BatchContext):
+    return _current_batch.set(context)
+
+
+def deactivate(token) -> None:
+    _current_batch.reset(token)
@@ -0,0 +1,213 @@
+"""응답 압축 (gzip, 설치되어 있으면 brotli / zstd)
+
+Accept-Encoding 에 맞춰 응답 본문을 압축한다. GET /api/examples 처럼 큰 JSON
+목록에서 전송량이 크게 준다.
+
+- COMPRESSION_MIN_SIZE 보다 작은 본문은 압축하지 않는다 (헤더 비용이 더 크다).
+- COMPRESSION_TYPES 의 content-type 만 압축한다. text/event-stream 처럼 여러
+  조각으로 흘려보내는 응답은 모아서 압축하지 않고 그대로 보낸다.
+- 캐시 가능한 GET 200 응답에는 본문 해시로 ETag 를 붙이고, 압축 결과를
+  (ETag, 인코딩) 키로 캐시한다. 같은 응답이 반복되면 해시만 계산하고 다시
+  압축하지 않는다. If-None-Match 가 맞으면 304 로 본문 없이 응답한다.
+- 압축된 표현은 ETag 에 인코딩 접미사가 붙는다 ("<hash>-gzip").
+
+캐시 상태는 이벤트 루프 스레드에서만 바뀌므로 락이 필요 없다. 큰 본문의
+압축 자체는 스레드에서 실행한다 (zlib / brotli / zstd 는 GIL 을 놓는다).
+"""
+
+import gzip
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # 선택 의존성
+    zstandard = None
+
+# 응답 압축 설정
+COMPRESSION = os.getenv("COMPRESSION", "1") == "1"
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+COMPRESSION_ZSTD_LEVEL = int(os.getenv("COMPRESSION_ZSTD_LEVEL", "3"))
+COMPRESSION_TYPES = frozenset(
+    media_type.strip()
+    for media_type in os.getenv(
+        "COMPRESSION_TYPES",
+        "application/json,text/plain,text/html,text/css,text/csv,application/javascript",
+    ).split(",")
+    if media_type.strip()
+)
+# 이보다 큰 본문은 이벤트 루프를 막지 않도록 스레드에서 압축
+COMPRESSION_THREAD_MIN_BYTES = int(os.getenv("COMPRESSION_THREAD_MIN_BYTES", str(64 * 1024)))
+COMPRESSION_CACHE_ENTRIES = int(os.getenv("COMPRESSION_CACHE_ENTRIES", "256"))
+COMPRESSION_CACHE_MAX_BYTES = int(os.getenv("COMPRESSION_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+
+
+def _gzip(level: int) -> Callable[[bytes], bytes]:
+    # mtime=0 이면 같은 입력에 같은 출력 (캐시/ETag 와 맞음)
+    return lambda data: gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def _brotli(quality: int) -> Callable[[bytes], bytes]:
+    return lambda data: brotli.compress(data, quality=quality)
+
+
+def _zstd(level: int) -> Callable[[bytes], bytes]:
+    # ZstdCompressor 는 스레드 간 공유할 수 없으므로 호출마다 만든다
+    return lambda data: zstandard.ZstdCompressor(level=level).compress(data)
+
+
+def available_encoders(
+    gzip_level: int = COMPRESSION_GZIP_LEVEL,
+    brotli_quality: int = COMPRESSION_BROTLI_QUALITY,
+    zstd_level: int = COMPRESSION_ZSTD_LEVEL,
+) -> dict[str, Callable[[bytes], bytes]]:
+    """사용 가능한 인코더 (서버 선호 순서: br, zstd, gzip)"""
+    encoders = {}
+    if brotli is not None:
+        encoders["br"] = _brotli(brotli_quality)
+    if zstandard is not None:
+        encoders["zstd"] = _zstd(zstd_level)
+    encoders["gzip"] = _gzip(gzip_level)
+    return encoders
+
+
+def parse_accept_encoding(header: str) -> dict[str, float]:
+    """Accept-Encoding 헤더를 {코딩: q} 로 (잘못된 q 는 1 로 본다)"""
+    accepted = {}
+    for item in header.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 1.0
+        accepted[name] = quality
+    return accepted
+
+
+def choose_encoding(header: Optional[str], encoders) -> Optional[str]:
+    """클라이언트가 받는 인코딩 중 서버 선호 순서로 첫 번째 (없으면 None)"""
+    if not header:
+        return None
+    accepted = parse_accept_encoding(header)
+    wildcard = accepted.get("*", 0.0)
+    for name in encoders:
+        if accepted.get(name, wildcard) > 0:
+            return name
+    return None
+
+
+def is_compressible(content_type: Optional[str], types=COMPRESSION_TYPES) -> bool:
+    if not content_type:
+        return False
+    return content_type.split(";", 1)[0].strip().lower() in types
+
+
+def body_etag(body: bytes) -> str:
+    """본문 해시로 만든 강한 ETag (SHA-NI 가 있는 CPU 에서 sha256 이 가장 빠르다)"""
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """압축된 표현의 ETag ("abc" → "abc-gzip", W/ 접두사 유지)"""
+    return etag[:-1] + f'-{encoding}"' if etag.endswith('"') else f"{etag}-{encoding}"
+
+
+def etag_matches(if_none_match: Optional[str], etag: str, encodings) -> bool:
+    """If-None-Match 가 etag 또는 그 압축 표현 중 하나와 맞는지 (약한 비교)"""
+    if not if_none_match:
+        return False
+    candidates = {etag} | {encoded_etag(etag, encoding) for encoding in encodings}
+    candidates = {candidate.removeprefix("W/") for candidate in candidates}
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") in candidates:
+            return True
+    return False
+
+
+class CompressionCache:
+    """(ETag, 인코딩) → 압축 본문 LRU 캐시 (항목 수와 총 바이트로 제한)"""
+
+    def __init__(self, max_entries: int = COMPRESSION_CACHE_ENTRIES, max_bytes: int = COMPRESSION_CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[tuple[str, str], bytes] = OrderedDict()
+        self._bytes = 0
+        # 통계
+        self.hits = 0
+        self.misses = 0
+        self.compressed = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.compress_seconds = 0.0
+        self.not_modified = 0
+
+    def get(self, etag: str, encoding: str) -> Optional[bytes]:
+        body = self._entries.get((etag, encoding))
+        if body is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end((etag, encoding))
+        self.hits += 1
+        return body
+
+    def put(self, etag: str, encoding: str, body: bytes) -> None:
+        if self.max_entries <= 0 or len(body) > self.max_bytes:
+            return
+        key = (etag, encoding)
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= len(previous)
+        self._entries[key] = body
+        self._bytes += len(body)
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+
+    def record(self, size_in: int, size_out: int, seconds: float) -> None:
+        """압축 1 회 통계"""
+        self.compressed += 1
+        self.bytes_in += size_in
+        self.bytes_out += size_out
+        self.compress_seconds += seconds
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+            "compressed": self.compressed,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "ratio": round(self.bytes_out / self.bytes_in, 4) if self.bytes_in else None,
+            "compress_ms": round(self.compress_seconds * 1000, 3),
+        }
+
+
+def timed(encoder: Callable[[bytes], bytes], body: bytes) -> tuple[bytes, float]:
+    started = time.perf_counter()
+    return encoder(body), time.perf_counter() - started
+
+
+compression_cache = CompressionCache()
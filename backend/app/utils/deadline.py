@@ -0,0 +1,140 @@
+"""요청 마감 시간(deadline)과 DB 문장 타임아웃
+
+요청마다 마감 시각을 contextvar 에 두고, DB 계층이 이를 읽어 문장 실행을
+끊는다.
+
+- SQLite: 연결마다 progress handler 를 걸어, 마감이 지나면 실행 중인 문장을
+  interrupt 한다. 잠금 대기(busy timeout)도 남은 시간으로 줄인다.
+- PostgreSQL: 문장 실행 전 `SET statement_timeout` 으로 남은 시간을 넘긴다.
+
+마감 때문에 중단된 DB 오류(SQLite interrupted, PostgreSQL query_canceled)만
+DeadlineExceeded 로 바뀌어 504 로 응답된다. 마감 이후라도 다른 DB 오류는 그대로
+올라간다.
+"""
+
+import os
+import sqlite3
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+
+# 요청 마감 설정
+REQUEST_TIMEOUT_HEADER = "x-request-timeout"
+MAX_REQUEST_TIMEOUT = float(os.getenv("MAX_REQUEST_TIMEOUT", "60"))
+ROUTE_CLASS_TIMEOUTS = {
+    "health": float(os.getenv("HEALTH_REQUEST_TIMEOUT", "2")),
+    "read": float(os.getenv("READ_REQUEST_TIMEOUT", "5")),
+    "write": float(os.getenv("WRITE_REQUEST_TIMEOUT", "10")),
+    "auth": float(os.getenv("AUTH_REQUEST_TIMEOUT", "10")),
+}
+
+# SQLite progress handler 호출 간격 (VM 명령 수)
+SQLITE_PROGRESS_STEPS = 1000
+# SQLite 기본 잠금 대기 시간(ms). pysqlite connect(timeout=5.0) 와 같다.
+SQLITE_DEFAULT_BUSY_TIMEOUT_MS = 5000
+# PostgreSQL query_canceled (statement_timeout 초과) SQLSTATE
+PG_QUERY_CANCELED = "57014"
+
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """요청 마감 시간이 지나 작업을 중단한 경우"""
+
+
+def set_deadline(timeout: Optional[float]):
+    """지금부터 timeout 초 뒤를 마감으로 설정하고 리셋 토큰 반환"""
+    deadline = None if timeout is None else time.monotonic() + timeout
+    return _deadline.set(deadline)
+
+
+def reset_deadline(token) -> None:
+    _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """마감까지 남은 초 (마감이 없으면 None, 지났으면 0 이하)"""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def expired() -> bool:
+    deadline = _deadline.get()
+    return deadline is not None and time.monotonic() >= deadline
+
+
+def resolve_timeout(header_value: Optional[str], route_class: Optional[str]) -> Optional[float]:
+    """헤더 값 또는 라우트 기본값으로 요청 타임아웃(초) 결정
+
+    헤더 값은 MAX_REQUEST_TIMEOUT 으로 제한되며, 올바르지 않으면 무시한다.
+    """
+    if header_value:
+        try:
+            timeout = float(header_value)
+        except ValueError:
+            timeout = None
+        if timeout is not None and timeout > 0:
+            return min(timeout, MAX_REQUEST_TIMEOUT)
+    if route_class is None:
+        return None
+    return ROUTE_CLASS_TIMEOUTS.get(route_class)
+
+
+def _sqlite_progress_handler() -> int:
+    # 0 이 아닌 값을 돌려주면 SQLite 가 현재 문장을 interrupt 한다
+    return 1 if expired() else 0
+
+
+def _is_interrupt(error: BaseException) -> bool:
+    """마감 처리로 DB 가 문장을 중단했을 때 나는 오류인지 여부"""
+    if isinstance(error, sqlite3.OperationalError):
+        return str(error) == "interrupted"
+    # psycopg2 는 pgcode, psycopg 3 은 sqlstate 로 SQLSTATE 를 준다
+    sqlstate = getattr(error, "pgcode", None) or getattr(error, "sqlstate", None)
+    return sqlstate == PG_QUERY_CANCELED
+
+
+def install_statement_timeouts(engine) -> None:
+    """엔진에 요청 마감 기반 문장 타임아웃을 적용"""
+    dialect = engine.dialect.name
+
+    if dialect == "sqlite":
+        @event.listens_for(engine, "connect")
+        def _on_connect(dbapi_connection, connection_record):
+            dbapi_connection.set_progress_handler(_sqlite_progress_handler, SQLITE_PROGRESS_STEPS)
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def _limit_busy_wait(conn, cursor, statement, parameters, context, executemany):
+            left = remaining()
+            busy_ms = SQLITE_DEFAULT_BUSY_TIMEOUT_MS
+            if left is not None:
+                if left <= 0:
+                    raise DeadlineExceeded("request deadline exceeded")
+                busy_ms = min(busy_ms, max(1, int(left * 1000)))
+            if conn.info.get("busy_timeout_ms", SQLITE_DEFAULT_BUSY_TIMEOUT_MS) != busy_ms:
+                cursor.connection.execute(f"PRAGMA busy_timeout = {busy_ms}")
+                conn.info["busy_timeout_ms"] = busy_ms
+
+    elif dialect == "postgresql":
+        @event.listens_for(engine, "before_cursor_execute")
+        def _set_statement_timeout(conn, cursor, statement, parameters, context, executemany):
+            left = remaining()
+            timeout_ms = 0
+            if left is not None:
+                if left <= 0:
+                    raise DeadlineExceeded("request deadline exceeded")
+                timeout_ms = max(1, int(left * 1000))
+            if conn.info.get("statement_timeout_ms", 0) != timeout_ms:
+                cursor.execute(f"SET statement_timeout = {timeout_ms}")
+                conn.info["statement_timeout_ms"] = timeout_ms
+
+    @event.listens_for(engine, "handle_error")
+    def _translate_interrupt(exception_context):
+        # 마감 때문에 중단된 문장만 DB 오류 대신 DeadlineExceeded 로 올린다
+        if expired() and _is_interrupt(exception_context.original_exception):
+            return DeadlineExceeded("request deadline exceeded")
+        return None
@@ -0,0 +1,184 @@
+"""프로세스 내 변경 이벤트 pub/sub
+
+create_example / delete_example 같은 쓰기 경로가 이벤트를 발행하면
+SSE 스트림 구독자들에게 전달한다.
+
+- 발행은 스레드풀(동기 핸들러)에서도 안전하다. 각 구독자의 이벤트 루프로
+  call_soon_threadsafe 를 통해 넘긴다.
+- 구독자마다 크기가 제한된 큐를 가지며, 큐가 가득 찬(느린) 구독자는 끊는다.
+  발행자는 절대 기다리지 않는다.
+- 최근 이벤트를 링 버퍼에 보관해 Last-Event-ID 로 재연결한 클라이언트가
+  놓친 이벤트만 받아갈 수 있게 한다.
+- 이벤트 ID 는 "<네임스페이스>:<순번>" 형식이다. 네임스페이스는 워커 프로세스마다
+  (pid + 기동 시 난수) 다르고 순번은 그 안에서만 증가한다. 다른 워커나 재시작
+  이전 프로세스의 ID 로 재연결하면 이어받지 않고 reset 을 보낸다.
+
+브로커는 프로세스 안에서만 전달한다. gunicorn 워커가 여럿이면 한 워커의 쓰기는
+그 워커에 붙은 구독자에게만 전달되므로, 워커 간 전달이 필요하면 Redis pub/sub
+같은 외부 버스를 두고 각 워커가 그 버스를 구독해 publish 해야 한다.
+"""
+
+import asyncio
+import itertools
+import json
+import os
+import secrets
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
+
+# 이벤트 스트림 설정
+EVENT_QUEUE_SIZE = int(os.getenv("EVENT_QUEUE_SIZE", "256"))
+EVENT_HISTORY_SIZE = int(os.getenv("EVENT_HISTORY_SIZE", "1024"))
+
+
+@dataclass(frozen=True)
+class Event:
+    namespace: str
+    id: int
+    type: str
+    data: str
+
+    @property
+    def event_id(self) -> str:
+        """클라이언트에 보내는 Last-Event-ID"""
+        return f"{self.namespace}:{self.id}"
+
+    def encode(self) -> str:
+        """SSE 와이어 형식으로 변환"""
+        return f"id: {self.event_id}\nevent: {self.type}\ndata: {self.data}\n\n"
+
+
+# 구독 종료 신호 (느린 구독자 축출)
+_EVICTED = object()
+
+
+class Subscriber:
+    """하나의 스트림 연결"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, maxsize: int):
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.evicted = False
+
+    def offer(self, event: Event) -> None:
+        """이벤트 루프 스레드에서 호출됨. 큐가 가득 차면 구독자를 축출한다."""
+        if self.evicted:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.evicted = True
+            # 남은 이벤트를 버리고 종료 신호만 남긴다
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(_EVICTED)
+
+    async def get(self, timeout: float) -> Optional[Event]:
+        """다음 이벤트 (timeout 동안 없으면 None)
+
+        Raises:
+            ConnectionAbortedError: 느린 구독자로 축출된 경우
+        """
+        try:
+            item = await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        if item is _EVICTED:
+            raise ConnectionAbortedError("subscriber evicted: queue overflow")
+        return item
+
+
+class EventBroker:
+    """프로세스 내 이벤트 브로커"""
+
+    def __init__(
+        self,
+        queue_size: int = EVENT_QUEUE_SIZE,
+        history_size: int = EVENT_HISTORY_SIZE,
+        namespace: Optional[str] = None,
+    ):
+        self.queue_size = queue_size
+        # pid 는 재시작 후 재사용될 수 있으므로 기동마다 난수를 붙인다
+        self.namespace = namespace or f"{os.getpid()}.{secrets.token_hex(4)}"
+        self._ids = itertools.count(1)
+        self._history: deque[Event] = deque(maxlen=history_size)
+        self._subscribers: set[Subscriber] = set()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def publish(self, event_type: str, payload: dict) -> Event:
+        """이벤트 발행 (어느 스레드에서나 호출 가능, 대기하지 않음)"""
+        data = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            event = Event(self.namespace, next(self._ids), event_type, data)
+            self._history.append(event)
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            try:
+                subscriber.loop.call_soon_threadsafe(self._deliver, subscriber, event)
+            except RuntimeError:
+                # 이벤트 루프가 이미 닫힘
+                self.unsubscribe(subscriber)
+        return event
+
+    def _deliver(self, subscriber: Subscriber, event: Event) -> None:
+        subscriber.offer(event)
+        if subscriber.evicted:
+            self.unsubscribe(subscriber)
+            self.evictions += 1
+
+    def local_sequence(self, event_id: Optional[str]) -> Optional[int]:
+        """이 브로커가 발급한 이벤트 ID 의 순번 (다른 워커/프로세스의 ID 면 None)"""
+        if event_id is None:
+            return None
+        namespace, _, sequence = event_id.rpartition(":")
+        if namespace != self.namespace or not sequence.isdigit():
+            return None
+        return int(sequence)
+
+    def subscribe(self, last_event_id: Optional[str] = None) -> tuple[Subscriber, Optional[list[Event]]]:
+        """구독 시작 (이벤트 루프 안에서 호출)
+
+        Args:
+            last_event_id: 클라이언트가 마지막으로 받은 이벤트 ID
+
+        Returns:
+            (구독자, 재전송할 이벤트 목록). last_event_id 가 다른 네임스페이스의
+            ID 이거나 버퍼 범위를 벗어나 이어받을 수 없으면 목록 대신 None 을
+            돌려준다 (클라이언트 전체 재조회 필요).
+        """
+        subscriber = Subscriber(asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            self._subscribers.add(subscriber)
+            if last_event_id is None:
+                return subscriber, []
+            history = list(self._history)
+        sequence = self.local_sequence(last_event_id)
+        if sequence is None:
+            # 다른 워커나 재시작 이전 프로세스에서 받은 ID
+            return subscriber, None
+        newest = history[-1].id if history else 0
+        if sequence > newest:
+            # 이 네임스페이스에서 아직 발급하지 않은 ID
+            return subscriber, None
+        if history and history[0].id > sequence + 1:
+            # 버퍼에서 이미 밀려난 이벤트가 있음
+            return subscriber, None
+        return subscriber, [event for event in history if event.id > sequence]
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def last_event_id(self) -> str:
+        with self._lock:
+            return f"{self.namespace}:{self._history[-1].id if self._history else 0}"
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+
+broker = EventBroker()
@@ -0,0 +1,125 @@
+"""Idempotency-Key 응답 저장소
+
+클라이언트가 타임아웃 뒤 같은 Idempotency-Key 로 재시도하면, 처음 요청의
+응답을 그대로 돌려준다. bcrypt 해싱이나 DB 쓰기를 다시 하지 않는다.
+
+- 키는 (Authorization, 메서드, 경로, Idempotency-Key) 단위로 구분되므로
+  다른 사용자가 같은 키를 써도 섞이지 않는다.
+- 같은 키에 다른 본문이 오면 재사용 오류(422)로 거절한다.
+- 처음 요청이 아직 처리 중이면 중복 요청은 그 결과를 기다렸다가 재생한다.
+  처음 요청이 5xx 로 끝나면 저장하지 않으므로, 기다리던 요청이 직접 실행한다.
+- 처음 요청이 마감(504)으로 끊기면 핸들러가 실제로 끝날 때까지 처리 중으로
+  두고, 끝난 결과를 저장한다. 그 사이 재시도는 기다렸다가 그 결과를 재생한다.
+- 저장소는 TTL 과 최대 항목 수(LRU)로 제한된다. 프로세스 단위 저장소이므로
+  여러 워커 사이에서는 공유되지 않는다.
+
+모든 상태는 이벤트 루프 스레드에서만 바뀌므로 락이 필요 없다.
+"""
+
+import asyncio
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+# 멱등성 키 설정
+IDEMPOTENCY_HEADER = "idempotency-key"
+IDEMPOTENCY_REPLAYED_HEADER = "idempotent-replayed"
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+IDEMPOTENCY_TTL_SECONDS = float(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400"))
+IDEMPOTENCY_MAX_ENTRIES = int(os.getenv("IDEMPOTENCY_MAX_ENTRIES", "10000"))
+# 이보다 큰 응답 본문은 저장하지 않는다
+IDEMPOTENCY_MAX_BODY_BYTES = int(os.getenv("IDEMPOTENCY_MAX_BODY_BYTES", str(64 * 1024)))
+
+# Idempotency-Key 를 지원하는 엔드포인트
+IDEMPOTENT_ROUTES = frozenset({
+    ("POST", "/api/auth/signup"),
+    ("POST", "/api/examples/"),
+})
+
+
+@dataclass
+class StoredResponse:
+    fingerprint: str
+    status: int
+    headers: list
+    body: bytes
+    expires_at: float
+
+
+def scope_key(authorization: Optional[bytes], method: str, path: str, idempotency_key: str) -> str:
+    """저장소 키 (토큰 원문을 보관하지 않도록 해시)"""
+    digest = hashlib.sha256()
+    for part in (authorization or b"", method.encode(), path.encode(), idempotency_key.encode()):
+        digest.update(part)
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def fingerprint(body: bytes) -> str:
+    """요청 본문 지문"""
+    return hashlib.sha256(body).hexdigest()
+
+
+class IdempotencyStore:
+    """TTL + LRU 로 제한된 응답 저장소와 처리 중 요청 목록"""
+
+    def __init__(self, ttl: float = IDEMPOTENCY_TTL_SECONDS, max_entries: int = IDEMPOTENCY_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, StoredResponse] = OrderedDict()
+        self._in_flight: dict[str, tuple[str, asyncio.Future]] = {}
+        # 통계
+        self.replays = 0
+        self.waits = 0
+        self.conflicts = 0
+        self.abandoned = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[StoredResponse]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: str, fingerprint: str, status: int, headers: list, body: bytes) -> None:
+        self._entries[key] = StoredResponse(fingerprint, status, headers, body, time.monotonic() + self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def in_flight(self, key: str) -> Optional[tuple[str, asyncio.Future]]:
+        return self._in_flight.get(key)
+
+    def begin(self, key: str, fingerprint: str) -> asyncio.Future:
+        """처리 시작 표시 (중복 요청은 돌려준 future 를 기다린다)"""
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = (fingerprint, future)
+        return future
+
+    def finish(self, key: str) -> None:
+        """처리 종료 표시 후 기다리던 중복 요청을 깨운다"""
+        _, future = self._in_flight.pop(key)
+        if not future.done():
+            future.set_result(None)
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "in_flight": len(self._in_flight),
+            "replays": self.replays,
+            "waits": self.waits,
+            "conflicts": self.conflicts,
+            "abandoned": self.abandoned,
+        }
+
+
+idempotency_store = IdempotencyStore()
@@ -0,0 +1,54 @@
+"""프로세스 수명 상태 (준비 여부와 종료 드레인)
+
+GET /api/ready 가 이 상태를 보고 응답한다. 로드 밸런서는 ready 가 아닌
+워커로 새 요청을 보내지 않는다.
+
+- starting: 앱 시작(lifespan startup) 전. 테이블 생성 등이 끝나지 않았다.
+- ready: 요청을 받을 수 있다.
+- draining: SIGTERM 을 받았다. 실행 중인 요청은 끝까지 처리하지만 readiness
+  는 실패시켜 새 트래픽이 빠지게 한다.
+"""
+
+import time
+from typing import Optional
+
+STARTING = "starting"
+READY = "ready"
+DRAINING = "draining"
+
+
+class Lifecycle:
+    """워커 프로세스의 준비/드레인 상태"""
+
+    def __init__(self):
+        self.state = STARTING
+        self._drain_started: Optional[float] = None
+        # 실행 중인 요청 수 (InFlightMiddleware 가 이벤트 루프에서만 갱신)
+        self.in_flight = 0
+
+    @property
+    def ready(self) -> bool:
+        return self.state == READY
+
+    def mark_ready(self) -> None:
+        self.state = READY
+        self._drain_started = None
+
+    def begin_drain(self) -> bool:
+        """드레인 시작 (이미 드레인 중이면 False)"""
+        if self.state == DRAINING:
+            return False
+        self.state = DRAINING
+        self._drain_started = time.monotonic()
+        return True
+
+    def status(self) -> dict:
+        return {
+            "status": self.state,
+            "draining_seconds": (
+                round(time.monotonic() - self._drain_started, 3) if self._drain_started is not None else None
+            ),
+        }
+
+
+lifecycle = Lifecycle()
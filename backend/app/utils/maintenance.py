@@ -0,0 +1,307 @@
+"""SQLite 정기 유지보수 (ANALYZE, incremental vacuum, 크기 통계)
+
+delete_example 가 많이 일어나면 빈 페이지가 freelist 에 쌓여 파일이 줄지
+않고, 플래너 통계도 오래된다. 백그라운드 스케줄러가 부하가 낮을 때만
+(실행 중 요청 수 기준: 부하 차단이 켜져 있으면 admission_controller, 꺼져
+있으면 InFlightMiddleware 의 lifecycle.in_flight) 다음을 조금씩 실행한다.
+
+- `PRAGMA optimize`: analysis_limit 로 범위를 제한한 통계 갱신
+- `PRAGMA incremental_vacuum(N)`: N 페이지씩 나눠 freelist 반환. 조각마다
+  별도 트랜잭션이라 사이사이에 쓰기가 끼어들 수 있다. 틱마다 시간 예산이 있다.
+- dbstat 로 테이블/인덱스별 크기와 빈 공간 비율(fragmentation)을 기록
+
+incremental vacuum 은 auto_vacuum=INCREMENTAL 인 DB 에서만 동작한다. 새 DB 는
+생성 시 켜지고, 기존 DB 는 `python -m app.cli maintenance
+--enable-incremental-vacuum` 으로 한 번 VACUUM 해서 바꾼다 (VACUUM 동안 쓰기가
+막힌다).
+
+gunicorn 워커마다 스케줄러 스레드가 뜨지만, DB 파일 옆 잠금 파일
+(MAINTENANCE_LOCK_PATH) 에 flock 을 잡은 워커 하나만 틱을 실행한다. 그 워커가
+죽으면 커널이 잠금을 풀고, 다음 틱에 다른 워커가 이어받는다.
+"""
+
+import fcntl
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+from sqlalchemy.exc import OperationalError
+
+from app.database import engine
+from app.utils.admission import ADMISSION_CONTROL, admission_controller
+from app.utils.lifecycle import lifecycle
+
+# 유지보수 설정
+MAINTENANCE_SCHEDULER = os.getenv("MAINTENANCE_SCHEDULER", "1") == "1"
+MAINTENANCE_INTERVAL_SECONDS = float(os.getenv("MAINTENANCE_INTERVAL_SECONDS", "60"))
+MAINTENANCE_MAX_IN_FLIGHT = int(os.getenv("MAINTENANCE_MAX_IN_FLIGHT", "2"))
+MAINTENANCE_VACUUM_PAGES = int(os.getenv("MAINTENANCE_VACUUM_PAGES", "256"))
+MAINTENANCE_SLICE_BUDGET_MS = float(os.getenv("MAINTENANCE_SLICE_BUDGET_MS", "200"))
+MAINTENANCE_STATS_INTERVAL_SECONDS = float(os.getenv("MAINTENANCE_STATS_INTERVAL_SECONDS", "600"))
+# PRAGMA optimize 가 인덱스당 살펴볼 최대 행 수
+MAINTENANCE_ANALYSIS_LIMIT = int(os.getenv("MAINTENANCE_ANALYSIS_LIMIT", "1000"))
+# 워커 중 하나만 스케줄러를 돌리기 위한 잠금 파일 (기본: <DB 파일>.maintenance.lock)
+MAINTENANCE_LOCK_PATH = os.getenv("MAINTENANCE_LOCK_PATH")
+
+_AUTO_VACUUM_MODES = {0: "none", 1: "full", 2: "incremental"}
+
+_SIZE_QUERY = """
+SELECT d.name, m.type, m.tbl_name, count(*) AS pages, sum(d.pgsize) AS bytes,
+       sum(d.unused) AS unused, sum(d.payload) AS payload
+FROM dbstat AS d LEFT JOIN sqlite_master AS m ON m.name = d.name
+GROUP BY d.name ORDER BY bytes DESC
+"""
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _pragma(connection, name: str):
+    return connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+
+
+def size_report(engine) -> dict:
+    """파일/페이지 수준 통계와 테이블·인덱스별 크기 (dbstat 가 없으면 objects 는 None)"""
+    with engine.connect() as connection:
+        page_size = _pragma(connection, "page_size")
+        page_count = _pragma(connection, "page_count")
+        freelist_count = _pragma(connection, "freelist_count")
+        auto_vacuum = _AUTO_VACUUM_MODES.get(_pragma(connection, "auto_vacuum"), "unknown")
+        try:
+            rows = connection.exec_driver_sql(_SIZE_QUERY).mappings().all()
+        except OperationalError:
+            rows = None
+
+    objects = None
+    if rows is not None:
+        objects = [
+            {
+                "name": row["name"],
+                "type": row["type"] or "internal",
+                "table": row["tbl_name"],
+                "pages": row["pages"],
+                "bytes": row["bytes"],
+                "unused_bytes": row["unused"],
+                "payload_bytes": row["payload"],
+                "fragmentation": round(row["unused"] / row["bytes"], 4) if row["bytes"] else 0.0,
+            }
+            for row in rows
+        ]
+    return {
+        "collected_at": _now(),
+        "page_size": page_size,
+        "page_count": page_count,
+        "file_bytes": page_size * page_count,
+        "freelist_pages": freelist_count,
+        "freelist_ratio": round(freelist_count / page_count, 4) if page_count else 0.0,
+        "auto_vacuum": auto_vacuum,
+        "objects": objects,
+    }
+
+
+class MaintenanceScheduler:
+    """부하가 낮을 때 조금씩 유지보수를 실행하는 백그라운드 스레드"""
+
+    def __init__(
+        self,
+        engine,
+        load: Callable[[], int] = lambda: 0,
+        interval: float = MAINTENANCE_INTERVAL_SECONDS,
+        max_in_flight: int = MAINTENANCE_MAX_IN_FLIGHT,
+        vacuum_pages: int = MAINTENANCE_VACUUM_PAGES,
+        slice_budget: float = MAINTENANCE_SLICE_BUDGET_MS / 1000,
+        stats_interval: float = MAINTENANCE_STATS_INTERVAL_SECONDS,
+        lock_path: Optional[str] = MAINTENANCE_LOCK_PATH,
+    ):
+        """
+        Args:
+            engine: 유지보수할 SQLite 엔진
+            load: 현재 실행 중인 요청 수를 돌려주는 함수
+            interval: 틱 간격(초)
+            max_in_flight: 이보다 요청이 많으면 틱을 건너뛴다
+            vacuum_pages: incremental_vacuum 한 조각의 페이지 수
+            slice_budget: 한 틱에서 vacuum 에 쓸 최대 시간(초)
+            stats_interval: 크기 통계 수집 간격(초)
+            lock_path: 스케줄러 선출용 잠금 파일 (None 이면 DB 파일 경로에서 정한다.
+                메모리 DB 면 잠금 없이 실행)
+        """
+        self.engine = engine
+        self.load = load
+        self.interval = interval
+        self.max_in_flight = max_in_flight
+        self.vacuum_pages = vacuum_pages
+        self.slice_budget = slice_budget
+        self.stats_interval = stats_interval
+        self._stop = threading.Event()
+        self._run_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._next_stats = 0.0
+        if lock_path is None:
+            database = engine.url.database
+            if database and database != ":memory:":
+                lock_path = f"{database}.maintenance.lock"
+        self.lock_path = lock_path
+        self._lock_file = None
+        # 상태
+        self.ticks = 0
+        self.skipped_busy = 0
+        self.skipped_follower = 0
+        self.optimize_runs = 0
+        self.analyze_runs = 0
+        self.vacuum_slices = 0
+        self.pages_vacuumed = 0
+        self.last_tick_at: Optional[str] = None
+        self.last_tick_ms = 0.0
+        self.last_error: Optional[str] = None
+        self.last_report: Optional[dict] = None
+
+    @property
+    def supported(self) -> bool:
+        return self.engine.dialect.name == "sqlite"
+
+    def start(self) -> None:
+        if not self.supported or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="db-maintenance", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._lock_file is not None:
+            # 닫으면 잠금이 풀려 다른 워커가 스케줄러를 이어받는다
+            self._lock_file.close()
+            self._lock_file = None
+
+    @property
+    def leader(self) -> bool:
+        return self.lock_path is None or self._lock_file is not None
+
+    def _try_lead(self) -> bool:
+        """잠금 파일을 잡아 이 프로세스가 틱을 실행할 스케줄러가 될지 결정"""
+        if self.leader:
+            return True
+        lock_file = open(self.lock_path, "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        return True
+
+    def _busy(self) -> bool:
+        return self.load() > self.max_in_flight
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                leader = self._try_lead()
+            except OSError as exc:
+                self.last_error = f"{type(exc).__name__}: {exc}"
+                continue
+            if not leader:
+                self.skipped_follower += 1
+                continue
+            if self._busy():
+                self.skipped_busy += 1
+                continue
+            try:
+                self.run_once()
+            except Exception as exc:
+                self.last_error = f"{type(exc).__name__}: {exc}"
+
+    def run_once(self, analyze: bool = False, force_stats: bool = False) -> dict:
+        """유지보수 한 틱 실행 (optimize, vacuum 조각들, 필요하면 통계 수집)
+
+        Args:
+            analyze: True 면 PRAGMA optimize 대신 전체 ANALYZE
+            force_stats: True 면 통계 수집 간격과 관계없이 수집
+        """
+        with self._run_lock:
+            started = time.monotonic()
+            with self.engine.connect() as connection:
+                if analyze:
+                    connection.exec_driver_sql("ANALYZE")
+                    self.analyze_runs += 1
+                else:
+                    connection.exec_driver_sql(f"PRAGMA analysis_limit = {MAINTENANCE_ANALYSIS_LIMIT}")
+                    connection.exec_driver_sql("PRAGMA optimize").fetchall()
+                    self.optimize_runs += 1
+                connection.commit()
+            self._vacuum_slices(started)
+
+            if force_stats or started >= self._next_stats:
+                self.last_report = size_report(self.engine)
+                self._next_stats = time.monotonic() + self.stats_interval
+
+            self.ticks += 1
+            self.last_tick_at = _now()
+            self.last_tick_ms = (time.monotonic() - started) * 1000
+            self.last_error = None
+            return self.status()
+
+    def _vacuum_slices(self, started: float) -> None:
+        with self.engine.connect() as connection:
+            if _pragma(connection, "auto_vacuum") != 2:
+                return
+            while time.monotonic() - started < self.slice_budget and not self._busy():
+                free_before = _pragma(connection, "freelist_count")
+                if free_before == 0:
+                    break
+                # 조각마다 자동 커밋되는 별도 트랜잭션 (사이에 쓰기가 끼어들 수 있음).
+                # incremental_vacuum 은 한 step 에 한 페이지만 반환하는데 pysqlite 의
+                # execute 는 결과 컬럼이 없는 문장을 한 번만 step 하므로, 끝까지
+                # step 하는 executescript 로 실행한다.
+                connection.connection.driver_connection.executescript(
+                    f"PRAGMA incremental_vacuum({self.vacuum_pages})"
+                )
+                self.vacuum_slices += 1
+                self.pages_vacuumed += max(0, free_before - _pragma(connection, "freelist_count"))
+
+    def status(self) -> dict:
+        return {
+            "running": self._thread is not None,
+            "leader": self._thread is not None and self.leader,
+            "skipped_follower": self.skipped_follower,
+            "interval": self.interval,
+            "ticks": self.ticks,
+            "skipped_busy": self.skipped_busy,
+            "optimize_runs": self.optimize_runs,
+            "analyze_runs": self.analyze_runs,
+            "vacuum_slices": self.vacuum_slices,
+            "pages_vacuumed": self.pages_vacuumed,
+            "last_tick_at": self.last_tick_at,
+            "last_tick_ms": round(self.last_tick_ms, 3),
+            "last_error": self.last_error,
+            "report": self.last_report,
+        }
+
+
+def enable_incremental_vacuum(engine) -> str:
+    """auto_vacuum 을 INCREMENTAL 로 바꾸고 VACUUM (쓰기를 막는 1회성 작업)
+
+    Returns:
+        바뀐 뒤의 auto_vacuum 모드
+    """
+    with engine.connect() as connection:
+        connection.exec_driver_sql("PRAGMA auto_vacuum = INCREMENTAL")
+        connection.exec_driver_sql("VACUUM")
+        connection.commit()
+        return _AUTO_VACUUM_MODES.get(_pragma(connection, "auto_vacuum"), "unknown")
+
+
+def current_load() -> int:
+    """실행 중인 요청 수 (부하 차단이 꺼져 있으면 InFlightMiddleware 의 카운터)"""
+    if ADMISSION_CONTROL:
+        return admission_controller.total_in_flight
+    return lifecycle.in_flight
+
+
+maintenance_scheduler = MaintenanceScheduler(engine, load=current_load)
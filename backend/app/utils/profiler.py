@@ -0,0 +1,118 @@
+"""실행 중인 프로세스를 위한 통계적 샘플링 프로파일러
+
+별도 스레드에서 일정 간격으로 `sys._current_frames()` 를 읽어 모든 스레드의
+콜 스택을 수집한다. 결과는 flamegraph.pl / speedscope 가 읽을 수 있는
+collapsed-stack 형식(`frame;frame;frame count`)으로 반환한다.
+
+스택에 라우트 엔드포인트 함수가 있으면 맨 앞에 `route:METHOD /path` 프레임을
+붙여, 샘플을 FastAPI 라우트 단위로 묶어 볼 수 있게 한다.
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from types import CodeType
+
+# 프로파일러 설정
+PROFILE_MAX_SECONDS = float(os.getenv("PROFILE_MAX_SECONDS", "60"))
+PROFILE_MIN_INTERVAL = 0.001
+PROFILE_MAX_DEPTH = 128
+
+
+class ProfilerBusyError(RuntimeError):
+    """이미 다른 프로파일링이 진행 중인 경우"""
+
+
+# 한 번에 하나의 프로파일링만 허용
+_profile_lock = threading.Lock()
+
+
+def route_labels(routes, modules: tuple[str, ...]) -> dict[CodeType, str]:
+    """라우트 엔드포인트의 코드 객체 → `route:METHOD /path` 라벨 매핑 생성
+
+    Args:
+        routes: FastAPI 앱의 라우트 목록 (app.routes)
+        modules: 라벨을 붙일 엔드포인트 모듈 이름
+
+    Returns:
+        코드 객체를 키로 하는 라벨 딕셔너리
+    """
+    labels = {}
+    for route in routes:
+        endpoint = getattr(route, "endpoint", None)
+        code = getattr(endpoint, "__code__", None)
+        if code is None or endpoint.__module__ not in modules:
+            continue
+        methods = ",".join(sorted(getattr(route, "methods", None) or ()))
+        labels[code] = f"route:{methods} {route.path}"
+    return labels
+
+
+def _frame_name(code: CodeType) -> str:
+    module = os.path.splitext(os.path.basename(code.co_filename))[0]
+    return f"{module}:{code.co_name}"
+
+
+def _collect(frame, labels: dict[CodeType, str]) -> str:
+    names = []
+    route = None
+    depth = 0
+    while frame is not None and depth < PROFILE_MAX_DEPTH:
+        code = frame.f_code
+        names.append(_frame_name(code))
+        if code in labels:
+            route = labels[code]
+        frame = frame.f_back
+        depth += 1
+    names.reverse()
+    if route is not None:
+        names.insert(0, route)
+    return ";".join(names)
+
+
+def sample(seconds: float, interval: float, labels: dict[CodeType, str]) -> Counter:
+    """현재 프로세스를 seconds 동안 interval 간격으로 샘플링
+
+    Args:
+        seconds: 샘플링 시간 (PROFILE_MAX_SECONDS 로 제한)
+        interval: 샘플 간격(초)
+        labels: route_labels() 결과
+
+    Returns:
+        collapsed stack → 샘플 수
+
+    Raises:
+        ProfilerBusyError: 다른 프로파일링이 진행 중인 경우
+    """
+    if not _profile_lock.acquire(blocking=False):
+        raise ProfilerBusyError("A profile is already running")
+    try:
+        seconds = min(max(seconds, 0.0), PROFILE_MAX_SECONDS)
+        interval = max(interval, PROFILE_MIN_INTERVAL)
+        me = threading.get_ident()
+        stacks: Counter = Counter()
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            frames = sys._current_frames()
+            try:
+                for thread_id, frame in frames.items():
+                    if thread_id != me:
+                        stacks[_collect(frame, labels)] += 1
+            finally:
+                # 프레임 참조를 오래 들고 있지 않도록 즉시 해제 (예외가 나도)
+                frames = frame = None
+            time.sleep(interval)
+        return stacks
+    finally:
+        _profile_lock.release()
+
+
+def is_running() -> bool:
+    return _profile_lock.locked()
+
+
+def format_collapsed(stacks: Counter) -> str:
+    """collapsed-stack 텍스트로 변환 (샘플 수 내림차순)"""
+    return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
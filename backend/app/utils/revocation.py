@@ -0,0 +1,154 @@
+"""액세스 토큰 폐기(revocation) 저장소
+
+폐기된 토큰의 jti 를 revoked_tokens 테이블에 영구 저장하고, 프로세스마다
+메모리 dict(jti → exp) 를 앞단에 둬서 get_current_user 의 확인을 O(1) 로 한다.
+
+- 항목은 토큰의 exp 가 지나면 메모리와 테이블에서 지워진다. 폐기 목록은
+  "아직 만료되지 않은 폐기 토큰" 수로 제한되므로 크기가 계속 커지지 않는다.
+- 다른 워커가 폐기한 토큰은 백그라운드 스레드가 REVOCATION_SYNC_SECONDS 마다
+  테이블에서 revoked_at 기준으로 증분 동기화한다. 같은 워커에서 폐기한 토큰은
+  즉시 반영된다. is_revoked 는 메모리만 보므로 이벤트 루프에서 불러도 막히지 않는다.
+"""
+
+import heapq
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.models import RevokedToken
+from app.utils import batch
+
+logger = logging.getLogger(__name__)
+
+# 폐기 목록 동기화 설정
+REVOCATION_SYNC_SECONDS = float(os.getenv("REVOCATION_SYNC_SECONDS", "5"))
+# 늦게 커밋된 다른 워커의 행을 놓치지 않도록 증분 동기화 구간을 겹치게 읽는 폭
+REVOCATION_SYNC_OVERLAP = timedelta(seconds=30)
+
+
+def _to_datetime(timestamp: float) -> datetime:
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).replace(tzinfo=None)
+
+
+def _to_timestamp(value: datetime) -> float:
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+class RevocationStore:
+    """메모리 앞단 + 테이블 백엔드 토큰 폐기 저장소"""
+
+    def __init__(self, session_factory: Callable[[], Session], sync_interval: float = REVOCATION_SYNC_SECONDS):
+        self.session_factory = session_factory
+        self.sync_interval = sync_interval
+        self._revoked: dict[str, float] = {}
+        self._expiry_heap: list[tuple[float, str]] = []
+        self._lock = threading.Lock()
+        self._synced_until: datetime | None = None
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+    def _remember(self, jti: str, expires_at: float) -> None:
+        if jti not in self._revoked:
+            self._revoked[jti] = expires_at
+            heapq.heappush(self._expiry_heap, (expires_at, jti))
+
+    def _prune(self, now: float) -> None:
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            _, jti = heapq.heappop(heap)
+            self._revoked.pop(jti, None)
+
+    def is_revoked(self, jti: str) -> bool:
+        """jti 가 폐기되었는지 확인 (메모리 조회만 하고 DB 에 접근하지 않는다)"""
+        expires_at = self._revoked.get(jti)
+        return expires_at is not None and expires_at > time.time()
+
+    def start(self) -> None:
+        """백그라운드 동기화 스레드 시작 (워커 프로세스마다 한 번)"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="revocation-sync", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """동기화 스레드 종료"""
+        thread = self._thread
+        if thread is None:
+            return
+        self._stop.set()
+        thread.join()
+        self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.sync_interval):
+            try:
+                self.sync()
+            except Exception:
+                # DB 오류로 스레드가 끝나지 않게 하고 다음 주기에 다시 시도
+                logger.exception("revocation sync failed")
+
+    def revoke(self, db: Session, jti: str, expires_at: float) -> None:
+        """토큰 폐기 (테이블에 기록 후 메모리에 반영)
+
+        Args:
+            db: 데이터베이스 세션
+            jti: 토큰 ID
+            expires_at: 토큰 exp (unix timestamp)
+        """
+        values = {"jti": jti, "expires_at": _to_datetime(expires_at)}
+        if db.get_bind().dialect.name == "sqlite":
+            db.execute(sqlite_insert(RevokedToken).values(**values).on_conflict_do_nothing())
+        elif db.get(RevokedToken, jti) is None:
+            db.add(RevokedToken(**values))
+        db.commit()
+        # 배치 하위 요청의 commit 은 SAVEPOINT 해제뿐이므로 배치가 커밋된 뒤 반영
+        batch.after_commit(self._remember_locked, jti, expires_at)
+
+    def _remember_locked(self, jti: str, expires_at: float) -> None:
+        with self._lock:
+            self._remember(jti, expires_at)
+
+    def sync(self) -> None:
+        """다른 워커가 폐기한 토큰을 가져오고 만료 항목을 정리 (DB 접근, 블로킹)"""
+        with self._lock:
+            now = time.time()
+            synced_until = self._synced_until
+
+        statement = select(RevokedToken.jti, RevokedToken.expires_at, RevokedToken.revoked_at).where(
+            RevokedToken.expires_at > _to_datetime(now)
+        )
+        if synced_until is not None:
+            statement = statement.where(RevokedToken.revoked_at >= synced_until - REVOCATION_SYNC_OVERLAP)
+
+        with self.session_factory() as db:
+            rows = db.execute(statement).all()
+            if synced_until is None:
+                # 최초 동기화 시 만료된 행 정리
+                db.execute(delete(RevokedToken).where(RevokedToken.expires_at <= _to_datetime(now)))
+                db.commit()
+
+        with self._lock:
+            for jti, expires_at, revoked_at in rows:
+                self._remember(jti, _to_timestamp(expires_at))
+                if self._synced_until is None or revoked_at > self._synced_until:
+                    self._synced_until = revoked_at
+            if self._synced_until is None:
+                self._synced_until = _to_datetime(now).replace(microsecond=0)
+            self._prune(now)
+
+    def purge_expired(self, db: Session) -> int:
+        """테이블에서 만료된 폐기 항목 삭제 (삭제된 행 수 반환)"""
+        result = db.execute(delete(RevokedToken).where(RevokedToken.expires_at <= datetime.utcnow()))
+        db.commit()
+        return result.rowcount
@@ -0,0 +1,128 @@
+"""응답 스키마용 사전 컴파일 JSON 직렬화
+
+FastAPI 기본 경로는 ORM 객체를 response_model 로 다시 검증(from_attributes)한 뒤
+jsonable_encoder 와 json.dumps 를 거친다. 이미 DB 에서 읽은 값은 스키마를 만족하므로,
+스키마별로 한 번만 필드 목록과 필드별 인코더를 만들어 두고 ORM 객체나
+Core row mapping 을 곧바로 JSON bytes 로 만든다.
+
+출력은 기본 경로와 같은 JSON 이다 (datetime 은 ISO 8601, UTC 는 `Z`).
+"""
+
+import json
+import os
+import types
+from collections.abc import Mapping
+from datetime import date, datetime, time
+from operator import attrgetter, itemgetter
+from typing import Any, Callable, Iterable, Union, get_args, get_origin
+
+from fastapi import Response
+from pydantic import BaseModel
+
+# 빠른 직렬화 경로 사용 여부 (opt-in)
+FAST_JSON_RESPONSES = os.getenv("FAST_JSON_RESPONSES", "0") == "1"
+
+_encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), allow_nan=False)
+
+
+def _encode_datetime(value: datetime) -> str:
+    text = value.isoformat()
+    if value.utcoffset() is not None and not value.utcoffset():
+        text = text[:-6] + "Z"
+    return text
+
+
+def _encode_isoformat(value) -> str:
+    return value.isoformat()
+
+
+def _field_encoder(annotation) -> Callable[[Any], Any] | None:
+    """필드 타입에 맞는 값 변환 함수 (JSON 기본 타입이면 None)"""
+    if get_origin(annotation) in (Union, types.UnionType):
+        encoders = {_field_encoder(arg) for arg in get_args(annotation) if arg is not type(None)}
+        return encoders.pop() if len(encoders) == 1 else None
+    if annotation is datetime:
+        return _encode_datetime
+    if annotation in (date, time):
+        return _encode_isoformat
+    return None
+
+
+class CompiledSerializer:
+    """하나의 Pydantic 스키마에 대한 직렬화기
+
+    필드 이름으로 itemgetter/attrgetter 를 미리 만들어 두고,
+    변환이 필요한 필드(datetime 등)만 인코더를 적용한다.
+    """
+
+    def __init__(self, schema: type[BaseModel]):
+        self.schema = schema
+        self.names = tuple(schema.model_fields)
+        self.encoders = tuple(
+            (index, encoder)
+            for index, field in enumerate(schema.model_fields.values())
+            if (encoder := _field_encoder(field.annotation)) is not None
+        )
+        self._get_items = itemgetter(*self.names)
+        self._get_attrs = attrgetter(*self.names)
+        if len(self.names) == 1:
+            self._get_items = lambda obj, get=self._get_items: (get(obj),)
+            self._get_attrs = lambda obj, get=self._get_attrs: (get(obj),)
+
+    def _getter(self, obj) -> Callable[[Any], tuple]:
+        if isinstance(obj, Mapping):
+            return self._get_items
+        if hasattr(obj, "_mapping"):
+            return lambda row: self._get_items(row._mapping)
+        return self._get_attrs
+
+    def to_dict(self, obj, getter: Callable[[Any], tuple] | None = None) -> dict:
+        """ORM 객체 또는 row mapping 을 JSON 호환 딕셔너리로 변환"""
+        values = list((getter or self._getter(obj))(obj))
+        for index, encode in self.encoders:
+            if values[index] is not None:
+                values[index] = encode(values[index])
+        return dict(zip(self.names, values))
+
+    def dumps(self, obj) -> bytes:
+        return _encoder.encode(self.to_dict(obj)).encode("utf-8")
+
+    def dumps_many(self, rows: Iterable) -> bytes:
+        rows = iter(rows)
+        first = next(rows, None)
+        if first is None:
+            return b"[]"
+        getter = self._getter(first)
+        to_dict = self.to_dict
+        items = [to_dict(first, getter)]
+        items.extend(to_dict(row, getter) for row in rows)
+        return _encoder.encode(items).encode("utf-8")
+
+
+_serializers: dict[type[BaseModel], CompiledSerializer] = {}
+
+
+def get_serializer(schema: type[BaseModel]) -> CompiledSerializer:
+    """스키마별 직렬화기 반환 (최초 호출 시 컴파일 후 캐시)"""
+    serializer = _serializers.get(schema)
+    if serializer is None:
+        serializer = _serializers[schema] = CompiledSerializer(schema)
+    return serializer
+
+
+def json_response(schema: type[BaseModel], obj, status_code: int = 200) -> Response:
+    """단일 객체를 response_model 검증 없이 JSON 응답으로 반환"""
+    return Response(
+        content=get_serializer(schema).dumps(obj),
+        status_code=status_code,
+        media_type="application/json",
+    )
+
+
+def json_list_response(schema: type[BaseModel], rows: Iterable, status_code: int = 200) -> Response:
+    """객체 목록을 response_model 검증 없이 JSON 응답으로 반환"""
+    return Response(
+        content=get_serializer(schema).dumps_many(rows),
+        status_code=status_code,
+        media_type="application/json",
+    )
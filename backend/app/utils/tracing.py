@@ -0,0 +1,374 @@
+"""요청 단위 경량 트레이싱
+
+HTTP 요청마다 루트 스팬을 만들고, 그 아래에 세션 체크아웃 / SQL 실행 /
+JWT 디코딩 / bcrypt 해싱 같은 자식 스팬을 기록한다.
+샘플링은 루트 스팬 생성 시점에 한 번 결정되며(head-based), 샘플링되지 않은
+요청에서는 스팬 객체를 만들지 않는다.
+
+완료된 트레이스는 OTLP JSON 형식(resourceSpans)으로 한 줄씩 파일에 기록된다.
+파일 쓰기는 백그라운드 스레드가 하므로 요청 경로(이벤트 루프)에서 디스크
+I/O 가 일어나지 않는다.
+
+상위 서비스가 보낸 traceparent 의 sampled 플래그는 기본적으로 따르지 않는다.
+클라이언트가 보낸 헤더로 누구나 요청마다 트레이스 기록을 강제할 수 있기
+때문이다. trace_id / parent span 은 이어 받고 샘플링은 TRACE_SAMPLE_RATE 로
+정한다. 앞단이 신뢰할 수 있는 프록시뿐이면 TRACE_TRUST_UPSTREAM_SAMPLING=1.
+"""
+
+import json
+import os
+import queue
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+# 트레이싱 설정
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "0.0"))
+TRACE_EXPORT_PATH = os.getenv("TRACE_EXPORT_PATH", "./traces.jsonl")
+TRACE_SERVICE_NAME = os.getenv("TRACE_SERVICE_NAME", "module5-api")
+TRACE_TRUST_UPSTREAM_SAMPLING = os.getenv("TRACE_TRUST_UPSTREAM_SAMPLING", "0") == "1"
+# 파일 작성기 큐 크기 (가득 차면 트레이스를 버린다)
+TRACE_EXPORT_QUEUE_SIZE = int(os.getenv("TRACE_EXPORT_QUEUE_SIZE", "1000"))
+
+# OTLP span kind 값
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CLIENT = 3
+
+# OTLP status code 값
+STATUS_UNSET = 0
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+class Span:
+    """하나의 작업 구간을 나타내는 스팬"""
+
+    __slots__ = (
+        "trace",
+        "span_id",
+        "parent_span_id",
+        "name",
+        "kind",
+        "start_ns",
+        "end_ns",
+        "attributes",
+        "status_code",
+        "status_message",
+    )
+
+    def __init__(self, trace: "Trace", name: str, parent: Optional["Span"], kind: int, attributes: dict):
+        self.trace = trace
+        self.span_id = os.urandom(8).hex()
+        self.parent_span_id = parent.span_id if parent else trace.parent_span_id
+        self.name = name
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes
+        self.status_code = STATUS_UNSET
+        self.status_message = ""
+
+    def set_attribute(self, key: str, value) -> None:
+        self.attributes[key] = value
+
+    def set_error(self, exc: BaseException) -> None:
+        self.status_code = STATUS_ERROR
+        self.status_message = f"{type(exc).__name__}: {exc}"
+
+    def end(self) -> None:
+        if self.end_ns is None:
+            self.end_ns = time.time_ns()
+            self.trace.finish(self)
+
+    def to_otlp(self) -> dict:
+        span = {
+            "traceId": self.trace.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": _otlp_attributes(self.attributes),
+            "status": {"code": self.status_code},
+        }
+        if self.parent_span_id:
+            span["parentSpanId"] = self.parent_span_id
+        if self.status_message:
+            span["status"]["message"] = self.status_message
+        return span
+
+
+class Trace:
+    """하나의 요청에 속한 스팬 묶음
+
+    루트 스팬이 끝나면 모아둔 스팬을 한 번에 익스포터로 넘긴다.
+    """
+
+    def __init__(self, trace_id: Optional[str] = None, parent_span_id: Optional[str] = None):
+        self.trace_id = trace_id or os.urandom(16).hex()
+        self.parent_span_id = parent_span_id
+        self.root: Optional[Span] = None
+        self._finished: list[Span] = []
+        self._lock = threading.Lock()
+
+    def finish(self, span: Span) -> None:
+        with self._lock:
+            self._finished.append(span)
+        if span is self.root:
+            get_exporter().export(self._finished)
+
+
+class JsonLinesExporter:
+    """OTLP JSON 형식의 트레이스를 파일에 한 줄씩 기록하는 익스포터
+
+    한 줄이 하나의 ExportTraceServiceRequest 이므로, 콜렉터의 file receiver나
+    `otlpjsonfile` 수집기로 그대로 읽을 수 있다.
+
+    export 는 큐에 넣기만 하고, 작성기 스레드가 직렬화와 파일 쓰기를 한다.
+    큐가 가득 차면 기다리지 않고 버리며 dropped 로 센다.
+    """
+
+    def __init__(self, path: str, service_name: str = TRACE_SERVICE_NAME, queue_size: int = TRACE_EXPORT_QUEUE_SIZE):
+        self.path = path
+        self.service_name = service_name
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    def export(self, spans: list[Span]) -> None:
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(spans)
+        except queue.Full:
+            self.dropped += 1
+
+    def _ensure_started(self) -> None:
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+                    self._thread.start()
+
+    def _line(self, spans: list[Span]) -> str:
+        payload = {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": _otlp_attributes({"service.name": self.service_name})
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": "app.utils.tracing"},
+                            "spans": [span.to_otlp() for span in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+        return json.dumps(payload, separators=(",", ":")) + "\n"
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.writelines(self._line(spans) for spans in batch)
+            except OSError:
+                self.dropped += len(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def flush(self) -> None:
+        """큐에 쌓인 트레이스를 모두 쓸 때까지 대기"""
+        if self._thread is not None:
+            self._queue.join()
+
+
+class InMemoryExporter:
+    """내보낸 스팬을 메모리에 보관하는 익스포터 (콜렉터 대용, 테스트용)"""
+
+    def __init__(self):
+        self.spans: list[dict] = []
+        self._lock = threading.Lock()
+
+    def export(self, spans: list[Span]) -> None:
+        with self._lock:
+            self.spans.extend(span.to_otlp() for span in spans)
+
+
+_exporter = None
+
+
+def get_exporter():
+    """현재 익스포터 반환 (최초 호출 시 파일 익스포터 생성)"""
+    global _exporter
+    if _exporter is None:
+        _exporter = JsonLinesExporter(TRACE_EXPORT_PATH)
+    return _exporter
+
+
+def set_exporter(exporter) -> None:
+    """익스포터 교체 (`export(spans)` 메서드를 가진 객체)"""
+    global _exporter
+    _exporter = exporter
+
+
+def flush() -> None:
+    """현재 익스포터의 대기 중인 트레이스 기록 (flush 가 있는 익스포터만)"""
+    flush_exporter = getattr(_exporter, "flush", None)
+    if flush_exporter is not None:
+        flush_exporter()
+
+
+def should_sample(sample_rate: float = None) -> bool:
+    """head-based 샘플링 결정"""
+    rate = TRACE_SAMPLE_RATE if sample_rate is None else sample_rate
+    if rate <= 0.0:
+        return False
+    return rate >= 1.0 or random.random() < rate
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[tuple[str, str, bool]]:
+    """W3C traceparent 헤더 파싱
+
+    Returns:
+        (trace_id, parent_span_id, sampled) 또는 형식이 올바르지 않으면 None
+    """
+    if not header:
+        return None
+    parts = header.strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        flags = int(parts[3], 16)
+        int(parts[1], 16)
+        int(parts[2], 16)
+    except ValueError:
+        return None
+    return parts[1], parts[2], bool(flags & 0x01)
+
+
+def start_root_span(name: str, attributes: dict, traceparent: Optional[str] = None) -> Optional[Span]:
+    """요청의 루트 스팬 시작
+
+    traceparent 가 있으면 그 트레이스를 이어 간다. 샘플링은 TRACE_SAMPLE_RATE
+    로 정하고, TRACE_TRUST_UPSTREAM_SAMPLING 일 때만 상위의 sampled 플래그를
+    따른다. 샘플링되지 않으면 None.
+    """
+    parent = parse_traceparent(traceparent)
+    if parent is not None and TRACE_TRUST_UPSTREAM_SAMPLING:
+        sampled = parent[2]
+    else:
+        sampled = should_sample()
+    if not sampled:
+        return None
+    trace = Trace(*parent[:2]) if parent is not None else Trace()
+    root = Span(trace, name, None, SPAN_KIND_SERVER, attributes)
+    trace.root = root
+    return root
+
+
+def activate(span: Optional[Span]):
+    """스팬을 현재 컨텍스트의 활성 스팬으로 설정하고 리셋 토큰 반환"""
+    return _current_span.set(span)
+
+
+def deactivate(token) -> None:
+    _current_span.reset(token)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def start_span(name: str, kind: int = SPAN_KIND_INTERNAL, **attributes) -> Optional[Span]:
+    """현재 활성 스팬의 자식 스팬 시작 (활성 트레이스가 없으면 None)
+
+    활성 스팬을 바꾸지 않으므로, 시작과 종료가 서로 다른 콜백에서
+    일어나는 경우(SQL 이벤트 등)에 사용한다.
+    """
+    parent = _current_span.get()
+    if parent is None:
+        return None
+    return Span(parent.trace, name, parent, kind, attributes)
+
+
+@contextmanager
+def span(name: str, kind: int = SPAN_KIND_INTERNAL, **attributes):
+    """자식 스팬 컨텍스트 매니저
+
+    샘플링되지 않은 요청에서는 None 을 내주고 아무 것도 기록하지 않는다.
+    """
+    child = start_span(name, kind, **attributes)
+    if child is None:
+        yield None
+        return
+    token = _current_span.set(child)
+    try:
+        yield child
+    except BaseException as exc:
+        child.set_error(exc)
+        raise
+    finally:
+        _current_span.reset(token)
+        child.end()
+
+
+def instrument_engine(engine) -> None:
+    """SQLAlchemy 엔진에 SQL 문장 단위 스팬을 붙인다"""
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        child = start_span(
+            "db.query",
+            SPAN_KIND_CLIENT,
+            **{"db.system": engine.dialect.name, "db.statement": statement},
+        )
+        conn.info.setdefault("trace_spans", []).append(child)
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        spans = conn.info.get("trace_spans")
+        if spans:
+            child = spans.pop()
+            if child is not None:
+                child.end()
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(exception_context):
+        conn = exception_context.connection
+        spans = conn.info.get("trace_spans") if conn is not None else None
+        if spans:
+            child = spans.pop()
+            if child is not None:
+                child.set_error(exception_context.original_exception)
+                child.end()
+
+
+def _otlp_attributes(attributes: dict) -> list[dict]:
+    result = []
+    for key, value in attributes.items():
+        if isinstance(value, bool):
+            encoded = {"boolValue": value}
+        elif isinstance(value, int):
+            encoded = {"intValue": str(value)}
+        elif isinstance(value, float):
+            encoded = {"doubleValue": value}
+        else:
+            encoded = {"stringValue": str(value)}
+        result.append({"key": key, "value": encoded})
+    return result
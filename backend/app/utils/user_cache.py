@@ -0,0 +1,332 @@
+"""워커 간 공유 메모리 사용자 캐시 (mmap)
+
+get_current_user 는 요청마다 토큰의 username 으로 사용자 행을 읽는다. 프로세스별
+캐시를 두면 워커 수만큼 중복되고 워커마다 따로 데워지므로, 같은 호스트의
+워커들이 파일 하나를 mmap(MAP_SHARED) 해서 사용자 스냅샷(id, username, email,
+is_active, created_at, updated_at)을 함께 읽는다. 읽기는 락이나 IPC 없이
+메모리만 본다.
+
+- 크기 고정: 헤더 + USER_CACHE_SLOTS 개의 고정 크기 슬롯. username 해시로
+  슬롯이 정해지고 (direct-mapped) 충돌하면 나중 항목이 덮어쓴다. username /
+  email 이 슬롯 필드보다 길면 캐시하지 않는다.
+- 읽기 (seqlock): 슬롯 seq 가 홀수면 쓰는 중이다. seq 를 읽고, 슬롯을 읽고,
+  seq 를 다시 읽어 같을 때만 쓴다.
+- 쓰기 (채우기, 무효화): 파일 flock 을 잡고 seq 를 홀수로 올린 뒤 슬롯을 쓰고
+  다시 짝수로 올린다. 쓰기는 캐시 miss 와 사용자 변경 때만 일어난다.
+- 세대(generation): 헤더의 세대가 슬롯에 기록된 세대와 다르면 miss 다.
+  invalidate_all 은 세대만 올려 전체를 한 번에 비운다.
+- 늦은 채우기 방지: miss 때 DB 를 읽기 전에 슬롯 seq 와 세대를 받아 두고
+  (reserve), 채울 때 둘 다 그대로일 때만 쓴다 (fill). 그 사이 다른 워커가
+  사용자를 바꾸고 invalidate 했다면 seq 가 바뀌었으므로 오래된 값을 넣지
+  않는다. 그래서 사용자 행을 바꾸는 쓰기는 커밋한 뒤 invalidate 를 호출한다.
+- 워커 비정상 종료: flock 은 프로세스가 죽으면 커널이 푼다. 쓰다 만 슬롯은
+  seq 가 홀수로 남아 읽기에서는 miss 이고, 다음 쓰기나 다른 프로세스가 파일을
+  열 때 락을 잡은 채 비운다 (락을 잡았는데 홀수면 쓰던 프로세스가 죽은 것).
+  헤더가 맞지 않으면 (슬롯 수 변경, 손상) 파일을 새로 초기화한다.
+
+키는 username 의 ASCII 문자만 소문자로 바꾼 값이다 (SQLite lower() 와 같은
+규칙이라 DB 가 다른 사용자로 보는 두 username 이 같은 키가 되지 않는다).
+"""
+
+import fcntl
+import hashlib
+import mmap
+import os
+import string
+import struct
+import tempfile
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, Optional
+
+from app.database import SQLALCHEMY_DATABASE_URL
+
+
+def default_cache_path() -> str:
+    """DB 마다 다른 캐시 파일 (/dev/shm 이 있으면 tmpfs 에 둔다)"""
+    directory = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    database = hashlib.sha1(f"{os.getcwd()}|{SQLALCHEMY_DATABASE_URL}".encode()).hexdigest()[:12]
+    return os.path.join(directory, f"module5-users-{database}.cache")
+
+
+# 공유 메모리 사용자 캐시 설정
+USER_CACHE = os.getenv("USER_CACHE", "0") == "1"
+USER_CACHE_PATH = os.getenv("USER_CACHE_PATH") or default_cache_path()
+USER_CACHE_SLOTS = int(os.getenv("USER_CACHE_SLOTS", "8192"))
+# 쓰는 중인 슬롯을 다시 읽어 볼 횟수 (넘으면 miss)
+USER_CACHE_READ_RETRIES = 8
+
+MAGIC = b"USRSNAP1"
+USERNAME_BYTES = 64
+EMAIL_BYTES = 256
+
+# 헤더: magic, 슬롯 수, 슬롯 크기, 세대
+_HEADER = struct.Struct("<8sIIQ")
+_GENERATION = struct.Struct("<Q")
+_GENERATION_OFFSET = 16
+HEADER_SIZE = 64
+
+# 슬롯: seq, 세대, 키 해시, id, created_at(us), updated_at(us), flags,
+# username 길이, email 길이, username, email
+_SLOT = struct.Struct(f"<QQQqqqBBH{USERNAME_BYTES}s{EMAIL_BYTES}s")
+_SEQ = struct.Struct("<Q")
+SLOT_SIZE = 384
+
+_ACTIVE = 1
+_CREATED_AWARE = 2
+_UPDATED_AWARE = 4
+_NO_TIME = -(2 ** 63)
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_EMPTY = _SLOT.pack(0, 0, 0, 0, _NO_TIME, _NO_TIME, 0, 0, 0, b"", b"")
+
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+@dataclass(frozen=True, slots=True)
+class UserSnapshot:
+    """캐시된 사용자 (UserResponse 필드 + updated_at)"""
+
+    id: int
+    username: str
+    email: str
+    is_active: bool
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+
+
+def cache_key(username: str) -> str:
+    return username.translate(_ASCII_LOWER)
+
+
+def _key_hash(key: str) -> int:
+    # hash() 는 프로세스마다 달라서 쓸 수 없다. 0 은 빈 슬롯이므로 피한다
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "little") | 1
+
+
+def _encode_time(value: Optional[datetime]) -> tuple[int, bool]:
+    """datetime → (UTC epoch 마이크로초, aware 여부)"""
+    if value is None:
+        return _NO_TIME, False
+    if value.tzinfo is not None:
+        return (value.astimezone(timezone.utc).replace(tzinfo=None) - _EPOCH) // _MICROSECOND, True
+    return (value - _EPOCH) // _MICROSECOND, False
+
+
+def _decode_time(micros: int, aware: bool) -> Optional[datetime]:
+    if micros == _NO_TIME:
+        return None
+    value = _EPOCH + timedelta(microseconds=micros)
+    return value.replace(tzinfo=timezone.utc) if aware else value
+
+
+class SharedUserCache:
+    """mmap 파일 위의 고정 크기 사용자 스냅샷 캐시 (같은 호스트의 프로세스끼리 공유)"""
+
+    def __init__(
+        self,
+        path: str = USER_CACHE_PATH,
+        slots: int = USER_CACHE_SLOTS,
+        read_retries: int = USER_CACHE_READ_RETRIES,
+    ):
+        self.path = path
+        self.slots = slots
+        self.read_retries = read_retries
+        self.size = HEADER_SIZE + slots * SLOT_SIZE
+        self._pid: Optional[int] = None
+        self._fd: Optional[int] = None
+        self._mm: Optional[mmap.mmap] = None
+        self._open_lock = threading.Lock()
+        # flock 은 열린 파일 단위라 같은 프로세스의 스레드끼리는 막지 못한다
+        self._write_lock = threading.Lock()
+        # 통계 (이 프로세스 기준)
+        self.hits = 0
+        self.misses = 0
+        self.fills = 0
+        self.stale_fills = 0
+        self.invalidations = 0
+        self.busy_reads = 0
+        self.recovered_slots = 0
+
+    def _mapping(self) -> mmap.mmap:
+        # 처음 쓸 때 연다. fork 된 워커는 부모의 fd 를 쓰지 않고 다시 연다
+        # (같은 fd 의 flock 은 부모와 자식이 서로 막지 못한다)
+        if self._pid != os.getpid():
+            with self._open_lock:
+                if self._pid != os.getpid():
+                    self._open()
+        return self._mm
+
+    def _open(self) -> None:
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            # 다른 프로세스가 매핑 중일 수 있으므로 파일은 줄이지 않는다
+            if os.fstat(fd).st_size < self.size:
+                os.ftruncate(fd, self.size)
+            mm = mmap.mmap(fd, self.size)
+            magic, slots, slot_size, _ = _HEADER.unpack_from(mm, 0)
+            if (magic, slots, slot_size) != (MAGIC, self.slots, SLOT_SIZE):
+                mm[:] = bytes(self.size)
+                _HEADER.pack_into(mm, 0, MAGIC, self.slots, SLOT_SIZE, 1)
+            else:
+                self._recover(mm)
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        self._fd, self._mm, self._pid = fd, mm, os.getpid()
+
+    def _recover(self, mm: mmap.mmap) -> None:
+        """락을 쥔 상태에서 seq 가 홀수인 슬롯(쓰다 죽은 프로세스)을 비운다"""
+        for slot in range(self.slots):
+            offset = HEADER_SIZE + slot * SLOT_SIZE
+            if _SEQ.unpack_from(mm, offset)[0] & 1:
+                self._write(mm, offset, _EMPTY)
+                self.recovered_slots += 1
+
+    @contextmanager
+    def _locked(self) -> Iterator[mmap.mmap]:
+        mm = self._mapping()
+        with self._write_lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                yield mm
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _write(mm: mmap.mmap, offset: int, record: bytes) -> None:
+        # 홀수 = 쓰는 중. 이미 홀수면 죽은 프로세스가 쓰다 만 슬롯을 이어받는다
+        seq = _SEQ.unpack_from(mm, offset)[0] | 1
+        _SEQ.pack_into(mm, offset, seq)
+        mm[offset + _SEQ.size:offset + _SLOT.size] = record[_SEQ.size:]
+        _SEQ.pack_into(mm, offset, seq + 1)
+
+    def _offset(self, key_hash: int) -> int:
+        return HEADER_SIZE + (key_hash % self.slots) * SLOT_SIZE
+
+    @staticmethod
+    def _generation(mm: mmap.mmap) -> int:
+        return _GENERATION.unpack_from(mm, _GENERATION_OFFSET)[0]
+
+    def get(self, username: str) -> Optional[UserSnapshot]:
+        """username(대소문자 구분 없음)의 스냅샷 (없거나 무효화되었으면 None)"""
+        mm = self._mapping()
+        key = cache_key(username)
+        key_hash = _key_hash(key)
+        offset = self._offset(key_hash)
+        for _ in range(self.read_retries):
+            seq = _SEQ.unpack_from(mm, offset)[0]
+            if seq & 1:
+                continue
+            fields = _SLOT.unpack_from(mm, offset)
+            if _SEQ.unpack_from(mm, offset)[0] == seq:
+                break
+        else:
+            self.busy_reads += 1
+            self.misses += 1
+            return None
+
+        (_, generation, slot_hash, user_id, created_us, updated_us, flags,
+         username_len, email_len, username_bytes, email_bytes) = fields
+        if slot_hash != key_hash or generation != self._generation(mm):
+            self.misses += 1
+            return None
+        stored_username = username_bytes[:username_len].decode()
+        if cache_key(stored_username) != key:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return UserSnapshot(
+            id=user_id,
+            username=stored_username,
+            email=email_bytes[:email_len].decode(),
+            is_active=bool(flags & _ACTIVE),
+            created_at=_decode_time(created_us, bool(flags & _CREATED_AWARE)),
+            updated_at=_decode_time(updated_us, bool(flags & _UPDATED_AWARE)),
+        )
+
+    def reserve(self, username: str) -> tuple[int, int, int]:
+        """miss 후 DB 를 읽기 전에 호출: (슬롯 위치, seq, 세대) 를 fill 에 넘긴다"""
+        mm = self._mapping()
+        offset = self._offset(_key_hash(cache_key(username)))
+        return offset, _SEQ.unpack_from(mm, offset)[0], self._generation(mm)
+
+    def fill(self, token: tuple[int, int, int], snapshot: UserSnapshot) -> UserSnapshot:
+        """DB 에서 읽은 스냅샷을 캐시에 넣는다
+
+        reserve 이후 슬롯이 바뀌었거나 (무효화 등) 세대가 올라갔으면 넣지 않는다.
+
+        Returns:
+            snapshot (캐시에 넣었는지와 관계없이)
+        """
+        username = snapshot.username.encode()
+        email = snapshot.email.encode() if snapshot.email is not None else None
+        if email is None or len(username) > USERNAME_BYTES or len(email) > EMAIL_BYTES:
+            return snapshot
+        created_us, created_aware = _encode_time(snapshot.created_at)
+        updated_us, updated_aware = _encode_time(snapshot.updated_at)
+        flags = (
+            (_ACTIVE if snapshot.is_active else 0)
+            | (_CREATED_AWARE if created_aware else 0)
+            | (_UPDATED_AWARE if updated_aware else 0)
+        )
+        offset, seq, generation = token
+        with self._locked() as mm:
+            if _SEQ.unpack_from(mm, offset)[0] != seq or self._generation(mm) != generation:
+                self.stale_fills += 1
+                return snapshot
+            record = _SLOT.pack(
+                0, generation, _key_hash(cache_key(snapshot.username)), snapshot.id,
+                created_us, updated_us, flags, len(username), len(email), username, email,
+            )
+            self._write(mm, offset, record)
+        self.fills += 1
+        return snapshot
+
+    def invalidate(self, username: str) -> None:
+        """사용자 변경 커밋 후 호출: 그 username 의 슬롯을 비운다 (진행 중인 fill 도 막힌다)"""
+        offset = self._offset(_key_hash(cache_key(username)))
+        with self._locked() as mm:
+            self._write(mm, offset, _EMPTY)
+        self.invalidations += 1
+
+    def invalidate_all(self) -> int:
+        """세대를 올려 모든 항목을 무효화
+
+        Returns:
+            새 세대
+        """
+        with self._locked() as mm:
+            generation = self._generation(mm) + 1
+            _GENERATION.pack_into(mm, _GENERATION_OFFSET, generation)
+        return generation
+
+    def close(self) -> None:
+        with self._open_lock:
+            if self._mm is not None and self._pid == os.getpid():
+                self._mm.close()
+                os.close(self._fd)
+            self._pid = self._fd = self._mm = None
+
+    def stats(self) -> dict:
+        mm = self._mapping()
+        lookups = self.hits + self.misses
+        return {
+            "path": self.path,
+            "slots": self.slots,
+            "bytes": self.size,
+            "generation": self._generation(mm),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "fills": self.fills,
+            "stale_fills": self.stale_fills,
+            "invalidations": self.invalidations,
+            "busy_reads": self.busy_reads,
+            "recovered_slots": self.recovered_slots,
+        }
+
+
+user_cache: Optional[SharedUserCache] = SharedUserCache() if USER_CACHE else None
@@ -0,0 +1,187 @@
+"""동시 INSERT 를 한 트랜잭션으로 묶는 group-commit 코얼레서
+
+요청마다 트랜잭션을 커밋하면 SQLite 에서는 쓰기 락과 fsync 가 요청 수만큼
+반복된다. 코얼레서는 짧은 시간(max_wait) 동안 또는 max_batch 개가 모일 때까지
+들어온 INSERT 를 모아 한 번에 커밋한다.
+
+- 각 행은 SAVEPOINT 안에서 INSERT ... RETURNING 되므로, 요청마다 자기 id 와
+  created_at 을 돌려받고 한 행의 실패(제약 조건 위반 등)는 그 요청에만 전달된다.
+- 커밋 자체가 실패하면 그 배치의 모든 요청이 같은 예외를 받는다. 세션 생성이나
+  before_commit 처럼 배치 처리 중 어디서 예외가 나도 그 배치만 실패하고 작성
+  스레드는 계속 돈다.
+- 기다리다 시간 초과된 요청은 아직 배치에 들어가지 않았다면 취소되어 INSERT 되지
+  않는다. 이미 처리 중인 배치에 들어갔다면 그 배치의 결과를 끝까지 기다린다.
+  요청에 마감(deadline)이 있으면 SUBMIT_TIMEOUT 대신 남은 시간만 기다린다.
+- max_wait 를 늘리면 지연이 늘고 배치가 커져 처리량이 오른다. max_batch 는
+  한 트랜잭션이 쥐는 쓰기 락 시간의 상한이다.
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.utils import deadline
+
+logger = logging.getLogger(__name__)
+
+# 호출자가 결과를 기다리는 최대 시간(초)
+SUBMIT_TIMEOUT = 30.0
+
+
+class WriteCoalescer:
+    """INSERT 요청을 모아 group commit 하는 백그라운드 작성기"""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        model,
+        returning: list,
+        max_batch: int = 64,
+        max_wait: float = 0.002,
+        before_commit: Callable[[Session, list], None] | None = None,
+    ):
+        """
+        Args:
+            session_factory: 세션 생성 함수 (예: SessionLocal)
+            model: INSERT 대상 ORM 모델
+            returning: 요청자에게 돌려줄 컬럼 목록
+            max_batch: 한 트랜잭션에 담을 최대 행 수
+            max_wait: 첫 요청 이후 다음 요청을 기다리는 최대 시간(초)
+            before_commit: 커밋 직전에 (세션, 성공한 행들의 RETURNING 결과) 로
+                호출된다. 같은 트랜잭션에서 함께 써야 하는 작업용 (예: 카운터)
+        """
+        self.session_factory = session_factory
+        self.model = model
+        self.returning = returning
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.before_commit = before_commit
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+        # 통계
+        self.batches = 0
+        self.rows = 0
+        self.failed_rows = 0
+        self.cancelled_rows = 0
+        self.failed_batches = 0
+
+    def submit(self, values: dict):
+        """행 하나를 넣고 커밋될 때까지 기다린 뒤 RETURNING 결과(mapping)를 반환
+
+        Raises:
+            TimeoutError: SUBMIT_TIMEOUT 안에 배치가 시작되지 않음 (행은 쓰이지 않는다)
+            DeadlineExceeded: 요청 마감 전에 배치가 시작되지 않음 (행은 쓰이지 않는다)
+            해당 행의 INSERT 또는 배치 커밋에서 발생한 예외
+        """
+        timeout = SUBMIT_TIMEOUT
+        left = deadline.remaining()
+        if left is not None and left < timeout:
+            timeout = max(0.0, left)
+        self._ensure_started()
+        future: Future = Future()
+        self._queue.put((values, future))
+        try:
+            return future.result(timeout=timeout)
+        except TimeoutError:
+            # 아직 대기열에 있으면 취소해 커밋되지 않게 한다.
+            # 이미 배치가 실행 중이면 취소할 수 없으므로 그 결과를 따른다.
+            if not future.cancel():
+                return future.result()
+            if timeout < SUBMIT_TIMEOUT:
+                raise deadline.DeadlineExceeded("request deadline exceeded") from None
+            raise
+
+    @property
+    def average_batch_size(self) -> float:
+        return self.rows / self.batches if self.batches else 0.0
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="write-coalescer", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                self._flush(batch)
+            except Exception as exc:
+                # 어떤 예외도 스레드를 끝내지 않도록 그 배치만 실패시키고 계속한다
+                logger.exception("write coalescer batch failed")
+                self.failed_batches += 1
+                self._fail(batch, exc)
+
+    @staticmethod
+    def _fail(batch: list, exc: Exception) -> None:
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(exc)
+
+    def _flush(self, batch: list) -> None:
+        # 시간 초과로 취소된 요청은 빼고, 남은 요청은 더 이상 취소할 수 없게 한다
+        pending = [(values, future) for values, future in batch if future.set_running_or_notify_cancel()]
+        self.cancelled_rows += len(batch) - len(pending)
+        if not pending:
+            return
+        batch = pending
+        statement = insert(self.model).returning(*self.returning)
+        results = []
+        session = self.session_factory()
+        try:
+            connection = session.connection()
+            if connection.dialect.name == "sqlite":
+                # pysqlite 는 SAVEPOINT 앞에 BEGIN 을 보내지 않으므로 직접 연다.
+                # IMMEDIATE 로 쓰기 락을 먼저 잡아 배치 도중 락 승격 실패를 피한다.
+                driver_connection = connection.connection.driver_connection
+                if not driver_connection.in_transaction:
+                    driver_connection.execute("BEGIN IMMEDIATE")
+            for values, future in batch:
+                savepoint = session.begin_nested()
+                try:
+                    row = session.execute(statement, values).mappings().one()
+                    savepoint.commit()
+                    results.append((future, row, None))
+                except Exception as exc:
+                    savepoint.rollback()
+                    results.append((future, None, exc))
+            if self.before_commit is not None:
+                self.before_commit(session, [row for _, row, exc in results if exc is None])
+            session.commit()
+        except Exception:
+            # 배치 실패 처리(통계, 요청자에게 예외 전달)는 _run 이 한 곳에서 한다
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+        self.batches += 1
+        for future, row, exc in results:
+            if future.done():
+                continue
+            if exc is None:
+                self.rows += 1
+                future.set_result(row)
+            else:
+                self.failed_rows += 1
+                future.set_exception(exc)
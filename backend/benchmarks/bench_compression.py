@@ -0,0 +1,73 @@
+"""
+Response compression benchmark: CPU time against bandwidth saved.
+
+Builds the GET /api/examples JSON body for the given number of rows and
+compresses it with every available encoder (gzip, and brotli / zstd when
+installed) at a few levels. For each it prints the compressed size, the CPU
+time per response and the CPU cost per megabyte saved. The last line shows
+what a cache hit costs instead: hashing the body for its ETag and a lookup.
+
+Usage:
+    python -m benchmarks.bench_compression [rows] [repeat]
+"""
+
+import sys
+import timeit
+from datetime import datetime, timezone
+
+from app.schemas import ExampleResponse
+from app.utils import compression, serialization
+
+LEVELS = {
+    "gzip": (1, 6, 9),
+    "br": (1, 4, 6),
+    "zstd": (1, 3, 9),
+}
+
+
+def build_body(rows: int) -> bytes:
+    now = datetime.now(timezone.utc)
+    examples = [
+        {
+            "id": i + 1,
+            "name": f"example {i}",
+            "description": f"설명 {i} " * 10,
+            "created_at": now,
+            "updated_at": None,
+        }
+        for i in range(rows)
+    ]
+    return serialization.json_list_response(ExampleResponse, examples).body
+
+
+def main(rows: int = 10_000, repeat: int = 5) -> None:
+    body = build_body(rows)
+    print(f"{rows} rows: {len(body) / 1024:.0f} KiB uncompressed\n")
+    print(f"{'encoding':>8} {'level':>5} {'KiB':>8} {'ratio':>6} {'ms/resp':>8} {'ms/MiB saved':>13}")
+
+    for name in compression.available_encoders():
+        for level in LEVELS[name]:
+            encoder = compression.available_encoders(
+                gzip_level=level, brotli_quality=level, zstd_level=level
+            )[name]
+            compressed = encoder(body)
+            seconds = min(timeit.repeat(lambda: encoder(body), number=1, repeat=repeat))
+            saved_mib = (len(body) - len(compressed)) / (1024 * 1024)
+            print(
+                f"{name:>8} {level:>5} {len(compressed) / 1024:8.1f} {len(compressed) / len(body):6.3f} "
+                f"{seconds * 1000:8.2f} {seconds * 1000 / saved_mib:13.2f}"
+            )
+
+    cache = compression.CompressionCache()
+    etag = compression.body_etag(body)
+    cache.put(etag, "gzip", compression.available_encoders()["gzip"](body))
+
+    def cache_hit():
+        cache.get(compression.body_etag(body), "gzip")
+
+    seconds = min(timeit.repeat(cache_hit, number=1, repeat=repeat))
+    print(f"\ncache hit (ETag hash + lookup): {seconds * 1000:.2f} ms/resp")
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,74 @@
+"""
+Group commit benchmark for concurrent example inserts.
+
+Runs concurrent inserts against a file-backed SQLite database, either
+committing each insert in its own transaction (current create_example) or
+through app.utils.write_coalescer.WriteCoalescer.
+
+Usage:
+    python -m benchmarks.bench_group_commit [inserts] [threads] [max_wait_ms] [max_batch]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import Example
+from app.routers.examples import RESPONSE_COLUMNS
+from app.utils.write_coalescer import WriteCoalescer
+
+
+def make_session_factory(path: str):
+    engine = create_engine(
+        f"sqlite:///{path}",
+        connect_args={"check_same_thread": False, "timeout": 30},
+        pool_size=32,
+    )
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine, autoflush=False)
+
+
+def run(inserts: int, threads: int, insert_one) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(insert_one, range(inserts)))
+    return inserts / (time.perf_counter() - start)
+
+
+def main(inserts: int = 2000, threads: int = 16, max_wait_ms: float = 2.0, max_batch: int = 64) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        SessionLocal = make_session_factory(os.path.join(tmp, "per_request.db"))
+
+        def per_request(i):
+            with SessionLocal() as db:
+                example = Example(name=f"example {i}")
+                db.add(example)
+                db.commit()
+                db.refresh(example)
+
+        baseline = run(inserts, threads, per_request)
+
+        SessionLocal = make_session_factory(os.path.join(tmp, "coalesced.db"))
+        coalescer = WriteCoalescer(
+            SessionLocal, Example, RESPONSE_COLUMNS, max_batch=max_batch, max_wait=max_wait_ms / 1000
+        )
+
+        def coalesced(i):
+            coalescer.submit({"name": f"example {i}"})
+
+        grouped = run(inserts, threads, coalesced)
+
+    print(f"inserts={inserts} threads={threads} max_wait={max_wait_ms}ms max_batch={max_batch}")
+    print(f"per-request commit : {baseline:9.0f} inserts/s")
+    print(f"group commit       : {grouped:9.0f} inserts/s  (avg batch {coalescer.average_batch_size:.1f})")
+
+
+if __name__ == "__main__":
+    args = [float(arg) if "." in arg else int(arg) for arg in sys.argv[1:]]
+    main(*args)
@@ -0,0 +1,64 @@
+"""
+Cold-start import time of app.main.
+
+Runs `python -X importtime -c "import app.main"` in a fresh interpreter
+(repeat times), parses the stderr report and prints the median cumulative
+time of app.main plus the modules with the largest cumulative times from the
+last run. Each run starts from an empty temporary directory so no database
+file is touched; tables are created at application startup, not on import.
+
+Usage:
+    python -m benchmarks.bench_import_time [repeat] [top]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def import_report(module: str = "app.main") -> dict:
+    """Import module in a subprocess and return {name: (self_us, cumulative_us)}."""
+    env = dict(os.environ, PYTHONPATH=str(BACKEND_DIR))
+    with tempfile.TemporaryDirectory() as directory:
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=directory,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    report = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        report[name.strip()] = (int(self_us), int(cumulative_us))
+    return report
+
+
+def main(repeat: int = 5, top: int = 15) -> None:
+    totals = []
+    report = {}
+    for _ in range(repeat):
+        report = import_report()
+        totals.append(report["app.main"][1] / 1000)
+    print(f"import app.main: median {statistics.median(totals):.0f} ms, min {min(totals):.0f} ms ({repeat} runs)")
+
+    print(f"\n{'cumulative ms':>14} {'self ms':>8}  module")
+    heaviest = sorted(report.items(), key=lambda item: item[1][1], reverse=True)[:top]
+    for name, (self_us, cumulative_us) in heaviest:
+        print(f"{cumulative_us / 1000:14.1f} {self_us / 1000:8.1f}  {name}")
+
+    deferred = ("jose", "passlib", "bcrypt", "cryptography")
+    loaded = [name for name in deferred if name in report]
+    print(f"\ndeferred modules loaded at import: {', '.join(loaded) or 'none'}")
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,85 @@
+"""
+Example search benchmark.
+
+Compares FTS5-backed search_examples() with a LIKE '%term%' scan over
+examples.name/description on an in-memory SQLite database.
+
+The rare term ("needle") shows the index win: LIKE must scan every row.
+The common term ("alpha") matches nearly every row; LIKE stops after the
+first `limit` unranked hits while FTS5 ranks every match with bm25, so
+there the comparison reflects the cost of relevance ordering.
+
+Usage:
+    python -m benchmarks.bench_search [rows] [repeat]
+"""
+
+import random
+import sys
+import timeit
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.crud.example import search_examples
+from app.database import Base
+from app.models import Example
+
+WORDS = [
+    "alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf", "hotel",
+    "india", "juliet", "kilo", "lima", "mike", "november", "oscar", "papa",
+]
+
+
+def setup(rows: int):
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(0)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(Example),
+            [
+                {
+                    "name": " ".join(rng.choices(WORDS, k=3)) + f" {i}",
+                    "description": " ".join(rng.choices(WORDS, k=30)) + (" needle" if i % 1000 == 0 else ""),
+                }
+                for i in range(rows)
+            ],
+        )
+    return sessionmaker(bind=engine)
+
+
+def like_scan(SessionLocal, term: str, limit: int = 20):
+    pattern = f"%{term}%"
+    with SessionLocal() as db:
+        statement = (
+            select(Example)
+            .where(Example.name.like(pattern) | Example.description.like(pattern))
+            .limit(limit)
+        )
+        return list(db.scalars(statement))
+
+
+def fts_search(SessionLocal, term: str, limit: int = 20):
+    with SessionLocal() as db:
+        return search_examples(db, term, limit=limit)
+
+
+def main(rows: int = 100_000, repeat: int = 5) -> None:
+    SessionLocal = setup(rows)
+
+    for term in ("needle", "alpha"):
+        like = min(timeit.repeat(lambda: like_scan(SessionLocal, term), number=1, repeat=repeat))
+        fts = min(timeit.repeat(lambda: fts_search(SessionLocal, term), number=1, repeat=repeat))
+        print(f"rows={rows} term={term!r}")
+        print(f"  LIKE scan : {like * 1000:8.2f} ms")
+        print(f"  FTS5      : {fts * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(*args)
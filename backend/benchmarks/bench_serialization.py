@@ -0,0 +1,77 @@
+"""
+Response serialization benchmark.
+
+Compares the default FastAPI response path for GET /api/examples
+(ORM load -> response_model validation -> jsonable_encoder -> json.dumps)
+with the precompiled fast path in app.utils.serialization.
+
+Usage:
+    python -m benchmarks.bench_serialization [rows] [repeat]
+"""
+
+import asyncio
+import sys
+import timeit
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models import Example
+from app.schemas import ExampleResponse
+from app.utils import serialization
+
+
+def setup(rows: int):
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(Example),
+            [{"name": f"example {i}", "description": "설명 " * 10} for i in range(rows)],
+        )
+    return sessionmaker(bind=engine)
+
+
+def default_path(SessionLocal, field) -> bytes:
+    with SessionLocal() as db:
+        examples = db.query(Example).all()
+        content = asyncio.run(
+            serialize_response(field=field, response_content=examples, is_coroutine=False)
+        )
+        return JSONResponse(content).body
+
+
+def fast_path(SessionLocal) -> bytes:
+    with SessionLocal() as db:
+        columns = [getattr(Example, name) for name in ExampleResponse.model_fields]
+        rows = db.execute(select(*columns)).mappings()
+        return serialization.json_list_response(ExampleResponse, rows).body
+
+
+def main(rows: int = 10_000, repeat: int = 5) -> None:
+    SessionLocal = setup(rows)
+    field = create_response_field(name="response", type_=list[ExampleResponse], mode="serialization")
+
+    assert default_path(SessionLocal, field) == fast_path(SessionLocal), "outputs differ"
+
+    default = min(timeit.repeat(lambda: default_path(SessionLocal, field), number=1, repeat=repeat))
+    fast = min(timeit.repeat(lambda: fast_path(SessionLocal), number=1, repeat=repeat))
+
+    print(f"rows={rows}")
+    print(f"default path : {default * 1000:8.2f} ms")
+    print(f"fast path    : {fast * 1000:8.2f} ms")
+    print(f"speedup      : {default / fast:8.2f}x")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(*args)
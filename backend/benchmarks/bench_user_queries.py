@@ -0,0 +1,112 @@
+"""
+User lookup benchmark.
+
+Measures per-call overhead of the legacy `db.query(User).filter(...).first()`
+form against the prebuilt select() statements in app.crud.user, including
+the column-projected lookups used by login and /api/auth/me. Lookups are
+case-insensitive; the query plan of the login lookup is printed to show it
+searches the lower(email) expression index instead of scanning users.
+The last /me case reads through the shared-memory user cache (USER_CACHE=1)
+after it has been warmed.
+
+Usage:
+    python -m benchmarks.bench_user_queries [users] [calls]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.crud import user as user_crud
+from app.crud.user import (
+    _CREDENTIALS_BY_EMAIL,
+    get_user_by_email,
+    get_user_by_username,
+    get_user_credentials_by_email,
+    get_user_profile_by_username,
+)
+from app.database import Base
+from app.models import User
+from app.utils.user_cache import SharedUserCache
+
+
+def setup(users: int):
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(User),
+            [
+                {"username": f"user{i}", "email": f"user{i}@example.com", "hashed_password": "x" * 60}
+                for i in range(users)
+            ],
+        )
+    return sessionmaker(bind=engine)
+
+
+def legacy_by_email(db, email):
+    return db.query(User).filter(User.email == email).first()
+
+
+def legacy_by_username(db, username):
+    return db.query(User).filter(User.username == username).first()
+
+
+def measure(SessionLocal, func, keys) -> float:
+    # One session per call, matching the per-request session pattern
+    start = time.perf_counter()
+    for key in keys:
+        with SessionLocal() as db:
+            func(db, key)
+    return (time.perf_counter() - start) / len(keys) * 1e6
+
+
+def main(users: int = 1000, calls: int = 5000) -> None:
+    SessionLocal = setup(users)
+    emails = [f"user{i % users}@example.com" for i in range(calls)]
+    usernames = [f"user{i % users}" for i in range(calls)]
+    mixed_case_emails = [email.upper() for email in emails]
+
+    cases = [
+        ("login lookup: query().filter().first()", legacy_by_email, emails),
+        ("login lookup: select(User)", get_user_by_email, emails),
+        ("login lookup: select(columns)", get_user_credentials_by_email, emails),
+        ("login lookup: select(columns), mixed case", get_user_credentials_by_email, mixed_case_emails),
+        ("/me lookup:   query().filter().first()", legacy_by_username, usernames),
+        ("/me lookup:   select(User)", get_user_by_username, usernames),
+        ("/me lookup:   select(User) + load_only", get_user_profile_by_username, usernames),
+    ]
+    for name, func, keys in cases:
+        measure(SessionLocal, func, keys[:200])  # warm up
+        print(f"{name:42s} {measure(SessionLocal, func, keys):8.1f} us/call")
+
+    with tempfile.TemporaryDirectory() as directory:
+        user_crud.user_cache = SharedUserCache(str(Path(directory) / "users.cache"))
+        measure(SessionLocal, user_crud.get_user_snapshot_by_username, usernames)  # fill
+        name = "/me lookup:   shared-memory cache hit"
+        print(f"{name:42s} {measure(SessionLocal, user_crud.get_user_snapshot_by_username, usernames):8.1f} us/call")
+        user_crud.user_cache.close()
+        user_crud.user_cache = None
+
+    with SessionLocal() as db:
+        connection = db.connection()
+        compiled = _CREDENTIALS_BY_EMAIL.compile(dialect=connection.dialect)
+        params = compiled.construct_params({"email": emails[0]})
+        plan = connection.exec_driver_sql(
+            f"EXPLAIN QUERY PLAN {compiled}", tuple(params[key] for key in compiled.positiontup)
+        ).all()
+    print("\nlogin lookup plan:", "; ".join(row[-1] for row in plan))
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(*args)
@@ -0,0 +1,69 @@
+"""
+Concurrent signup throughput against hash-sharded user storage.
+
+Inserts users from a thread pool through app.crud.user_shards.UserShards
+with 1, 2, 4 and 8 shard files. Password hashing is excluded (a fixed hash
+is used) so the numbers show the storage write path only: each insert
+commits on its shard and registers the email in its directory partition
+(both partitioned N ways, so there is no single global writer).
+
+Sharding helps when signups queue on the write lock, i.e. when a commit
+spends its time waiting on the disk (fsync) rather than on the CPU. On fast
+local disks that wait is tiny and the GIL-bound Python work dominates, so
+expect little scaling at commit_latency_ms=0. commit_latency_ms adds a sleep
+inside every shard and directory commit, while the write lock is held, to
+model a slower disk.
+
+Usage:
+    python -m benchmarks.bench_user_shards [users] [threads] [commit_latency_ms]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import event
+
+from app.crud.user_shards import UserShards
+
+HASHED_PASSWORD = "$2b$12$" + "x" * 53
+
+
+def run(shard_count: int, users: int, threads: int, directory: str, commit_latency: float) -> float:
+    shards = UserShards(
+        shard_count,
+        shard_url=f"sqlite:///{directory}/shard{shard_count}_{{index}}.db",
+        directory_url=f"sqlite:///{directory}/directory{shard_count}_{{index}}.db",
+    )
+    shards.create_all()
+    if commit_latency:
+        for engine in shards.engines + shards.directory_engines:
+            event.listen(engine, "commit", lambda conn: time.sleep(commit_latency))
+
+    def signup(i):
+        shards.insert_user({
+            "username": f"user{i}",
+            "email": f"user{i}@example.com",
+            "hashed_password": HASHED_PASSWORD,
+        })
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(signup, range(users)))
+    return users / (time.perf_counter() - start)
+
+
+def main(users: int = 2000, threads: int = 16, commit_latency_ms: float = 0.0) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        baseline = None
+        for shard_count in (1, 2, 4, 8):
+            rate = run(shard_count, users, threads, directory, commit_latency_ms / 1000)
+            baseline = baseline or rate
+            print(f"{shard_count} shard(s): {rate:8.0f} signups/s  ({rate / baseline:.2f}x)")
+
+
+if __name__ == "__main__":
+    args = [float(arg) if index == 2 else int(arg) for index, arg in enumerate(sys.argv[1:])]
+    main(*args)
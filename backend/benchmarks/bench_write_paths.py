@@ -0,0 +1,108 @@
+"""
+Example write path benchmark.
+
+Compares the previous ORM write paths with the single-statement ones now
+used by PATCH/DELETE /api/examples/{id}:
+
+- update: SELECT + attribute change + flush UPDATE + refresh SELECT
+          vs. UPDATE ... RETURNING
+- delete: SELECT + DELETE vs. DELETE with a rowcount check
+
+Reports SQL statements per call and mean latency on a file-backed SQLite
+database (commits included).
+
+Usage:
+    python -m benchmarks.bench_write_paths [rows]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from sqlalchemy import create_engine, delete, event, insert, update
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import Example
+from app.routers.examples import RESPONSE_COLUMNS
+
+
+def setup(path: str, rows: int):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Example), [{"name": f"example {i}"} for i in range(rows)])
+
+    counter = {"statements": 0}
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count(*args):
+        counter["statements"] += 1
+
+    return sessionmaker(bind=engine, autoflush=False), counter
+
+
+def orm_update(db, example_id):
+    example = db.query(Example).filter(Example.id == example_id).first()
+    example.description = "updated"
+    db.commit()
+    db.refresh(example)
+
+
+def returning_update(db, example_id):
+    statement = (
+        update(Example)
+        .where(Example.id == example_id)
+        .values(description="updated")
+        .returning(*RESPONSE_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )
+    db.execute(statement).mappings().first()
+    db.commit()
+
+
+def orm_delete(db, example_id):
+    example = db.query(Example).filter(Example.id == example_id).first()
+    db.delete(example)
+    db.commit()
+
+
+def single_delete(db, example_id):
+    statement = (
+        delete(Example)
+        .where(Example.id == example_id)
+        .execution_options(synchronize_session=False)
+    )
+    assert db.execute(statement).rowcount == 1
+    db.commit()
+
+
+def measure(SessionLocal, counter, func, ids):
+    counter["statements"] = 0
+    start = time.perf_counter()
+    for example_id in ids:
+        with SessionLocal() as db:
+            func(db, example_id)
+    elapsed = time.perf_counter() - start
+    return counter["statements"] / len(ids), elapsed / len(ids) * 1e6
+
+
+def main(rows: int = 2000) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        SessionLocal, counter = setup(os.path.join(tmp, "bench.db"), rows)
+        half = rows // 2
+        cases = [
+            ("update (ORM)", orm_update, range(1, half + 1)),
+            ("update (RETURNING)", returning_update, range(1, half + 1)),
+            ("delete (ORM)", orm_delete, range(1, half + 1)),
+            ("delete (single)", single_delete, range(half + 1, rows + 1)),
+        ]
+        for name, func, ids in cases:
+            statements, latency = measure(SessionLocal, counter, func, list(ids))
+            print(f"{name:20s} statements/call={statements:4.1f}  latency={latency:8.1f} us")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(*args)
@@ -3,6 +3,10 @@ pytest fixtures for database tests.
 
 Provides test database session, engine, and test data fixtures.
 Uses SQLite in-memory database for isolation and speed.
+
+API tests use `api_client`, which points the app's session factories at a
+temporary SQLite file (threads and batch sub-requests need real connections),
+and `auth_headers` to make a user and a bearer token without bcrypt.
 """
 
 import sys
@@ -18,7 +22,7 @@ backend_path = Path(__file__).parent.parent.parent / "app"
 sys.path.insert(0, str(backend_path.parent))
 
 from app.database import Base
-from app.models.user import User
+from app.models.user import User, ensure_user_lookup_indexes
 
 
 # Test database URL - SQLite in-memory
@@ -111,3 +115,50 @@ def multiple_users(db_session: Session) -> list[User]:
         db_session.refresh(user)
 
     return users
+
+
+@pytest.fixture
+def api_engine(tmp_path):
+    """File-backed engine bound to the app's session factories for one test."""
+    from app import database
+    from app.utils import batch
+
+    url = f"sqlite:///{tmp_path / 'api.db'}"
+    engine = create_engine(url, connect_args={"check_same_thread": False})
+    batch_engine = create_engine(url, connect_args={"check_same_thread": False})
+    batch.use_explicit_transactions(batch_engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        ensure_user_lookup_indexes(connection)
+    database.SessionLocal.configure(bind=engine)
+    database.BatchSessionLocal.configure(bind=batch_engine)
+    yield engine
+    database.SessionLocal.configure(bind=database.engine)
+    database.BatchSessionLocal.configure(bind=database.batch_engine)
+    engine.dispose()
+    batch_engine.dispose()
+
+
+@pytest.fixture
+def api_client(api_engine):
+    """TestClient for the full app (lifespan is not run)."""
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    return TestClient(app)
+
+
+@pytest.fixture
+def auth_headers(api_engine):
+    """Factory: create a user directly and return Authorization headers for it."""
+    from app.database import SessionLocal
+    from app.utils.auth import create_access_token
+
+    def make(username: str = "apiuser") -> dict:
+        with SessionLocal() as db:
+            db.add(User(username=username, email=f"{username}@example.com", hashed_password="not-a-hash"))
+            db.commit()
+        return {"Authorization": f"Bearer {create_access_token({'sub': username})}"}
+
+    return make
@@ -0,0 +1,128 @@
+"""
+Admission Control Tests.
+
+Tests for app.utils.admission including:
+- Route classification
+- Per-class concurrency limits
+- Fast rejection when a class queue is full
+- Deadline expiry for queued requests
+- Priority ordering when a slot frees up
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add backend/app to path for imports
+backend_path = Path(__file__).parent.parent.parent / "app"
+sys.path.insert(0, str(backend_path.parent))
+
+from app.utils.admission import AdmissionController, AdmissionRejected, RouteClass, classify
+
+
+def make_controller(total_limit=1, queue_size=4, max_wait=1.0):
+    return AdmissionController(
+        total_limit=total_limit,
+        classes=[
+            RouteClass("health", priority=3, limit=1, queue_size=queue_size, max_wait=max_wait),
+            RouteClass("read", priority=2, limit=1, queue_size=queue_size, max_wait=max_wait),
+            RouteClass("write", priority=1, limit=1, queue_size=queue_size, max_wait=max_wait),
+            RouteClass("auth", priority=0, limit=1, queue_size=queue_size, max_wait=max_wait),
+        ],
+    )
+
+
+class TestClassify:
+    """Tests for request classification."""
+
+    @pytest.mark.parametrize(
+        "method, path, expected",
+        [
+            ("GET", "/api/health", "health"),
+            ("GET", "/api/examples/1", "read"),
+            ("POST", "/api/examples/", "write"),
+            ("DELETE", "/api/examples/1", "write"),
+            ("POST", "/api/auth/login", "auth"),
+            ("POST", "/api/auth/signup", "auth"),
+            ("GET", "/api/auth/me", "read"),
+            ("GET", "/api/examples/stream", None),
+            ("GET", "/api/admin/profile", None),
+            ("POST", "/api/admin/maintenance/run", None),
+            ("GET", "/api/admin/maintenance", "read"),
+        ],
+    )
+    def test_classify(self, method, path, expected):
+        """Test that routes map to the expected class."""
+        assert classify(method, path) == expected
+
+
+class TestAdmission:
+    """Tests for limits, queueing and priorities."""
+
+    def test_queue_full_rejects_immediately(self):
+        """Test that a saturated class with a full queue is rejected."""
+        controller = make_controller(queue_size=0)
+
+        async def scenario():
+            await controller.acquire("write")
+            with pytest.raises(AdmissionRejected) as info:
+                await controller.acquire("write")
+            return info.value
+
+        rejected = asyncio.run(scenario())
+
+        assert rejected.route_class == "write"
+        assert rejected.retry_after >= 1
+        assert controller.classes["write"].rejected == 1
+
+    def test_queued_request_times_out(self):
+        """Test that a waiter is rejected after max_wait."""
+        controller = make_controller(max_wait=0.05)
+
+        async def scenario():
+            await controller.acquire("auth")
+            with pytest.raises(AdmissionRejected):
+                await controller.acquire("auth")
+
+        asyncio.run(scenario())
+
+        assert controller.classes["auth"].timed_out == 1
+        assert len(controller.classes["auth"].waiters) == 0
+
+    def test_release_wakes_highest_priority_first(self):
+        """Test that freed capacity goes to health before reads before auth."""
+        controller = make_controller(total_limit=1)
+        order = []
+
+        async def waiter(name):
+            await controller.acquire(name)
+            order.append(name)
+            controller.release(name)
+
+        async def scenario():
+            await controller.acquire("write")
+            tasks = [asyncio.create_task(waiter(name)) for name in ("auth", "read", "health")]
+            await asyncio.sleep(0.01)
+            controller.release("write")
+            await asyncio.gather(*tasks)
+
+        asyncio.run(scenario())
+
+        assert order == ["health", "read", "auth"]
+        assert controller.total_in_flight == 0
+
+    def test_metrics_report_in_flight_and_queue(self):
+        """Test that metrics reflect current state."""
+        controller = make_controller()
+
+        async def scenario():
+            await controller.acquire("read")
+            return controller.metrics()
+
+        metrics = asyncio.run(scenario())
+
+        assert metrics["total_in_flight"] == 1
+        assert metrics["classes"]["read"]["in_flight"] == 1
+        assert metrics["classes"]["read"]["admitted"] == 1
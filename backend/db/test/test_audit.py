@@ -0,0 +1,176 @@
+"""
+Auth Audit Log Tests.
+
+Tests for app.utils.audit and app.crud.audit including:
+- Events are written in batches by the background writer
+- Backpressure drops events instead of blocking when the queue is full
+- Failed sink writes are counted, not raised
+- JSONL sink rotation
+- Time-range keyset pagination over auth_events
+"""
+
+import json
+import sys
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+from sqlalchemy.orm import Session, sessionmaker
+
+# Add backend/app to path for imports
+backend_path = Path(__file__).parent.parent.parent / "app"
+sys.path.insert(0, str(backend_path.parent))
+
+from app.crud.audit import list_auth_events
+from app.models import AuthEvent
+from app.utils.audit import LOGIN, LOGIN_FAILED, AuditLog, JsonlSink, TableSink
+
+
+class BlockingSink:
+    """Sink that holds the writer thread until released."""
+
+    def __init__(self):
+        self.entered = threading.Event()
+        self.release = threading.Event()
+        self.batches = []
+
+    def write(self, events):
+        self.entered.set()
+        self.release.wait(5)
+        self.batches.append(events)
+
+
+class FailingSink:
+    def write(self, events):
+        raise RuntimeError("disk full")
+
+
+class TestAuditLog:
+    """Tests for the queue and background writer."""
+
+    def test_events_written_to_table(self, test_engine, db_session: Session):
+        """Test that recorded events end up in auth_events."""
+        log = AuditLog(TableSink(sessionmaker(bind=test_engine)), flush_interval=0.01)
+
+        assert log.record(LOGIN, user_id=1, username="alice", client_ip="10.0.0.1")
+        assert log.record(LOGIN_FAILED, email="bob@example.com", detail="bad_password")
+        assert log.flush()
+
+        events = db_session.query(AuthEvent).order_by(AuthEvent.id).all()
+        assert [e.event_type for e in events] == [LOGIN, LOGIN_FAILED]
+        assert events[0].client_ip == "10.0.0.1"
+        assert log.stats()["written"] == 2
+
+    def test_events_are_batched(self):
+        """Test that queued events are written together."""
+        sink = BlockingSink()
+        log = AuditLog(sink, batch_size=100, flush_interval=0.05)
+        log.record(LOGIN)
+        assert sink.entered.wait(5)  # first batch holds the writer
+        for _ in range(10):
+            log.record(LOGIN)
+
+        sink.release.set()
+        assert log.flush()
+
+        assert [len(batch) for batch in sink.batches] == [1, 10]
+
+    def test_drop_policy_when_queue_full(self):
+        """Test that a full queue drops events without blocking."""
+        sink = BlockingSink()
+        log = AuditLog(sink, queue_size=2, flush_interval=0)
+        log.record(LOGIN)
+        assert sink.entered.wait(5)  # the writer is blocked on the first event
+
+        accepted = [log.record(LOGIN) for _ in range(5)]
+
+        assert accepted.count(True) == 2
+        assert log.stats()["dropped"] == 3
+        sink.release.set()
+
+    def test_failed_write_is_counted(self):
+        """Test that sink errors do not propagate to callers."""
+        log = AuditLog(FailingSink(), flush_interval=0)
+
+        assert log.record(LOGIN)
+        assert log.flush()
+
+        stats = log.stats()
+        assert stats["write_errors"] == 1
+        assert stats["dropped"] == 1
+
+    def test_disabled_without_sink(self):
+        """Test that AUDIT_SINK=off turns recording into a no-op."""
+        log = AuditLog(None)
+
+        assert log.record(LOGIN) is False
+        assert log.flush()
+
+    def test_unknown_backpressure_policy(self):
+        with pytest.raises(ValueError):
+            AuditLog(None, backpressure="wait-forever")
+
+
+class TestJsonlSink:
+    """Tests for the rotating JSONL sink."""
+
+    def test_rotates_when_full(self, tmp_path):
+        """Test that the file rotates to .1 past max_bytes."""
+        path = tmp_path / "audit.jsonl"
+        sink = JsonlSink(str(path), max_bytes=10, backups=2)
+        event = {"event_type": LOGIN, "occurred_at": datetime(2024, 1, 1)}
+
+        sink.write([event])
+        sink.write([event])
+        sink.write([event])
+
+        assert json.loads(path.read_text())["occurred_at"] == "2024-01-01T00:00:00Z"
+        assert (tmp_path / "audit.jsonl.1").exists()
+        assert (tmp_path / "audit.jsonl.2").exists()
+        assert not (tmp_path / "audit.jsonl.3").exists()
+
+
+class TestListAuthEvents:
+    """Tests for time-range pagination."""
+
+    @pytest.fixture
+    def events(self, db_session: Session):
+        base = datetime(2024, 1, 1)
+        rows = [
+            AuthEvent(event_type=LOGIN if i % 2 else LOGIN_FAILED, occurred_at=base + timedelta(minutes=i // 2))
+            for i in range(10)
+        ]
+        db_session.add_all(rows)
+        db_session.commit()
+        return base
+
+    def test_pages_cover_all_events_newest_first(self, db_session: Session, events):
+        """Test that following next_cursor visits every event once."""
+        seen = []
+        cursor = None
+        while True:
+            page, cursor = list_auth_events(db_session, cursor=cursor, limit=3)
+            seen.extend(page)
+            if cursor is None:
+                break
+
+        assert len({e.id for e in seen}) == 10
+        keys = [(e.occurred_at, e.id) for e in seen]
+        assert keys == sorted(keys, reverse=True)
+
+    def test_time_range_and_type_filter(self, db_session: Session, events):
+        """Test since/until bounds and event_type filter."""
+        page, cursor = list_auth_events(
+            db_session,
+            since=events + timedelta(minutes=1),
+            until=events + timedelta(minutes=3),
+            event_type=LOGIN,
+        )
+
+        assert len(page) == 2
+        assert cursor is None
+
+    def test_invalid_cursor(self, db_session: Session):
+        with pytest.raises(ValueError):
+            list_auth_events(db_session, cursor="not-a-cursor")
@@ -0,0 +1,160 @@
+"""
+Online Backup and Read Replica Tests.
+
+Tests for app.utils.backup including:
+- Incremental backup produces a consistent copy with progress
+- Writers can commit while a backup is in progress
+- Background runner rejects overlapping backups
+- Continuous writes fall back to a single-step copy after a few restarts
+- In-memory read replica is seeded, read-only, and picks up new rows on refresh
+- The app lifespan seeds the read replica before the first request
+"""
+
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, func, select, text
+from sqlalchemy.exc import OperationalError
+
+# Add backend/app to path for imports
+backend_path = Path(__file__).parent.parent.parent / "app"
+sys.path.insert(0, str(backend_path.parent))
+
+from app import main
+from app.database import Base
+from app.models import Example
+from app.utils.backup import BackupBusyError, BackupRunner, ReadReplica, backup_to_file
+
+
+@pytest.fixture
+def file_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/app.db", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(
+            Example.__table__.insert(),
+            [{"name": f"example {i}", "description": "x" * 200} for i in range(500)],
+        )
+    yield engine
+    engine.dispose()
+
+
+def count_examples(path):
+    connection = sqlite3.connect(path)
+    try:
+        assert connection.execute("PRAGMA integrity_check").fetchone() == ("ok",)
+        return connection.execute("SELECT count(*) FROM examples").fetchone()[0]
+    finally:
+        connection.close()
+
+
+class TestBackupToFile:
+    """Tests for incremental file backups."""
+
+    def test_backup_copies_all_pages(self, file_engine, tmp_path):
+        """Test that the backup is complete and reports progress."""
+        path = str(tmp_path / "backup.db")
+
+        progress = backup_to_file(file_engine, path, pages=5, pause=0)
+
+        assert progress.state == "done"
+        assert progress.steps > 1
+        assert progress.to_dict()["percent"] == 100.0
+        assert count_examples(path) == 500
+        assert not Path(f"{path}.partial").exists()
+
+    def test_writes_commit_during_backup(self, file_engine, tmp_path):
+        """Test that writers are not blocked and the copy is a consistent snapshot."""
+        path = str(tmp_path / "backup.db")
+        progress = BackupRunner(file_engine).start(path, pages=2, pause=0.01)
+        while progress.steps == 0:
+            time.sleep(0.001)
+
+        with file_engine.begin() as connection:
+            connection.execute(text("INSERT INTO examples (name) VALUES ('during backup')"))
+        while progress.state == "running":
+            time.sleep(0.01)
+
+        assert progress.state == "done"
+        assert count_examples(path) == 501
+
+    def test_runner_rejects_overlapping_backups(self, file_engine, tmp_path):
+        """Test that only one background backup runs at a time."""
+        runner = BackupRunner(file_engine)
+        runner.start(str(tmp_path / "first.db"), pages=1, pause=0.05)
+
+        with pytest.raises(BackupBusyError):
+            runner.start(str(tmp_path / "second.db"))
+
+    def test_continuous_writes_fall_back_to_single_step(self, file_engine, tmp_path):
+        """Test that a backup restarted by every write still finishes."""
+        path = str(tmp_path / "backup.db")
+        done = threading.Event()
+
+        def write():
+            while not done.is_set():
+                with file_engine.begin() as connection:
+                    connection.execute(text("INSERT INTO examples (name) VALUES ('during backup')"))
+                time.sleep(0.001)
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        try:
+            progress = backup_to_file(file_engine, path, pages=1, pause=0.005, max_restarts=2)
+        finally:
+            done.set()
+            writer.join()
+
+        assert progress.state == "done"
+        assert progress.restarts == 2
+        assert progress.to_dict()["restarts"] == 2
+        assert count_examples(path) > 500
+
+
+class TestReadReplica:
+    """Tests for the in-memory read replica."""
+
+    def test_replica_serves_reads(self, file_engine):
+        """Test that the replica is seeded on first use."""
+        replica = ReadReplica(file_engine, refresh_interval=60)
+
+        with replica.session() as db:
+            assert db.scalar(select(func.count()).select_from(Example)) == 500
+
+    def test_replica_is_read_only(self, file_engine):
+        """Test that writes against the replica fail."""
+        replica = ReadReplica(file_engine, refresh_interval=60)
+
+        with replica.session() as db:
+            with pytest.raises(OperationalError):
+                db.execute(text("DELETE FROM examples"))
+
+    def test_refresh_picks_up_new_rows(self, file_engine):
+        """Test that refresh swaps in a newer copy."""
+        replica = ReadReplica(file_engine, refresh_interval=60)
+        with replica.session() as db:
+            assert db.scalar(select(func.count()).select_from(Example)) == 500
+        with file_engine.begin() as connection:
+            connection.execute(text("INSERT INTO examples (name) VALUES ('new')"))
+
+        replica.refresh()
+
+        with replica.session() as db:
+            assert db.scalar(select(func.count()).select_from(Example)) == 501
+        assert replica.stats()["generation"] == 2
+
+    def test_lifespan_seeds_replica(self, file_engine, tmp_path, monkeypatch):
+        """Test that the first copy happens at startup, not in the first request."""
+        from fastapi.testclient import TestClient
+
+        replica = ReadReplica(file_engine, refresh_interval=60)
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv(main.SKIP_INIT_DB_ENV, "1")
+        monkeypatch.setattr(main, "read_replica", replica)
+
+        with TestClient(main.app):
+            assert replica.stats()["generation"] == 1
@@ -0,0 +1,249 @@
+"""
+Batch Endpoint Tests.
+
+Tests for POST /api/batch and app.utils.batch including:
+- Sub-requests share one principal (token checked and user loaded once)
+- Invalid tokens make authenticated sub-requests 401 without failing the batch
+- Each sub-request keeps its own status (mixed 2xx / 4xx), in request order
+- Later sub-requests see earlier writes; a failed write does not undo them
+- One transaction snapshot survives sub-request commits
+- Batches with writes take the SQLite write lock up front
+- An exception rolls back the whole batch
+- Login/signup cannot ride in a batch (they would skip the auth admission class)
+- Side effects (SSE events) are sent only after the batch commits
+- Waiting for the write lock does not block the event loop
+"""
+
+import asyncio
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, func, select, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+# Add backend/app to path for imports
+backend_path = Path(__file__).parent.parent.parent / "app"
+sys.path.insert(0, str(backend_path.parent))
+
+from app.database import Base, SessionLocal
+from app.models import Example
+from app.utils import auth, batch
+from app.utils.events import broker
+
+
+def run_batch(client, requests, headers=None):
+    response = client.post("/api/batch", json={"requests": requests}, headers=headers or {})
+    assert response.status_code == 200
+    return response.json()["responses"]
+
+
+def count_examples() -> int:
+    with SessionLocal() as db:
+        return db.scalar(select(func.count()).select_from(Example))
+
+
+class TestBatchEndpoint:
+    """Tests for POST /api/batch"""
+
+    def test_shared_principal(self, api_client, auth_headers, monkeypatch):
+        """Every sub-request is the batch's user, looked up once"""
+        headers = auth_headers("batcher")
+        lookups = []
+        lookup = auth.get_user_snapshot_by_username
+
+        def counting_lookup(db, username):
+            lookups.append(username)
+            return lookup(db, username)
+
+        monkeypatch.setattr(auth, "get_user_snapshot_by_username", counting_lookup)
+
+        responses = run_batch(api_client, [{"path": "/api/auth/me"}] * 3, headers)
+
+        assert [r["status"] for r in responses] == [200, 200, 200]
+        assert {r["body"]["username"] for r in responses} == {"batcher"}
+        assert lookups == ["batcher"]
+
+    def test_invalid_token(self, api_client, api_engine):
+        """A bad token fails authenticated sub-requests, public ones still run"""
+        responses = run_batch(
+            api_client,
+            [{"path": "/api/auth/me"}, {"path": "/api/examples/"}],
+            {"Authorization": "Bearer not-a-jwt"},
+        )
+
+        assert [r["status"] for r in responses] == [401, 200]
+
+    def test_mixed_statuses_in_order(self, api_client, api_engine):
+        """Each sub-response carries its own status and id, in request order"""
+        responses = run_batch(api_client, [
+            {"id": "create", "method": "POST", "path": "/api/examples/", "body": {"name": "one"}},
+            {"id": "invalid", "method": "POST", "path": "/api/examples/", "body": {}},
+            {"id": "missing", "path": "/api/examples/999"},
+            {"id": "list", "path": "/api/examples/"},
+            {"id": "nested", "method": "POST", "path": "/api/batch", "body": {}},
+        ])
+
+        assert [(r["id"], r["status"]) for r in responses] == [
+            ("create", 200), ("invalid", 422), ("missing", 404), ("list", 200), ("nested", 400),
+        ]
+        assert [example["name"] for example in responses[3]["body"]] == ["one"]
+
+    def test_failed_write_keeps_earlier_writes(self, api_client, api_engine):
+        """Rolling back a failed sub-request only discards its own changes"""
+        responses = run_batch(api_client, [
+            {"method": "POST", "path": "/api/examples/", "body": {"name": "kept"}},
+            {"method": "DELETE", "path": "/api/examples/999"},
+            {"method": "PATCH", "path": "/api/examples/1", "body": {"name": None}},
+            {"method": "POST", "path": "/api/examples/", "body": {"name": "also kept"}},
+        ])
+
+        assert [r["status"] for r in responses] == [200, 404, 422, 200]
+        assert count_examples() == 2
+
+    def test_auth_class_paths_rejected(self, api_client, api_engine):
+        """bcrypt login/signup are not run inside a batch"""
+        responses = run_batch(api_client, [
+            {"method": "POST", "path": "/api/auth/login", "body": {"email": "a@b.c", "password": "x"}},
+            {"method": "POST", "path": "/api/auth/signup", "body": {}},
+        ])
+
+        assert [r["status"] for r in responses] == [400, 400]
+
+    def test_events_published_after_commit(self, api_client, api_engine, monkeypatch):
+        """Events go out once the batch is committed, and not for failed sub-requests"""
+        published = []
+        monkeypatch.setattr(broker, "publish", lambda event_type, payload: published.append(
+            (event_type, payload["name"], count_examples())
+        ))
+
+        responses = run_batch(api_client, [
+            {"method": "POST", "path": "/api/examples/", "body": {"name": "kept"}},
+            {"method": "PATCH", "path": "/api/examples/1", "body": {"name": "renamed"}},
+            {"method": "DELETE", "path": "/api/examples/999"},
+        ])
+
+        assert [r["status"] for r in responses] == [200, 200, 404]
+        # the row is already visible to other connections when each event fires
+        assert published == [("example.created", "kept", 1), ("example.updated", "renamed", 1)]
+
+
+class TestBatchTransaction:
+    """Tests for open_batch_session"""
+
+    @pytest.fixture
+    def factory(self, tmp_path):
+        url = f"sqlite:///{tmp_path / 'batch.db'}"
+        engine = create_engine(url)
+        Base.metadata.create_all(bind=engine)
+        with engine.connect() as connection:
+            connection.exec_driver_sql("PRAGMA journal_mode=WAL")
+        batch_engine = create_engine(url)
+        batch.use_explicit_transactions(batch_engine)
+        yield sessionmaker(bind=batch_engine), engine
+        batch_engine.dispose()
+        engine.dispose()
+
+    def test_snapshot_survives_sub_request_commit(self, factory):
+        """Rows committed elsewhere mid-batch stay invisible after a sub-request commits"""
+        session_factory, engine = factory
+
+        with batch.open_batch_session(session_factory) as session:
+            assert session.scalar(select(func.count()).select_from(Example)) == 0
+            with engine.begin() as other:
+                other.execute(text("INSERT INTO examples (name) VALUES ('outside')"))
+            session.commit()
+
+            assert session.scalar(select(func.count()).select_from(Example)) == 0
+
+        with engine.connect() as connection:
+            assert connection.scalar(text("SELECT count(*) FROM examples")) == 1
+
+    def test_write_batch_takes_write_lock_up_front(self, factory):
+        """A batch with writes holds the write lock, so outside writers wait"""
+        session_factory, engine = factory
+
+        with batch.open_batch_session(session_factory, write=True) as session:
+            session.add(Example(name="inside"))
+            session.commit()
+            with pytest.raises(OperationalError, match="locked"):
+                with engine.connect() as other:
+                    other.exec_driver_sql("PRAGMA busy_timeout = 0")
+                    other.execute(text("INSERT INTO examples (name) VALUES ('outside')"))
+                    other.commit()
+            names = session.scalars(select(Example.name)).all()
+
+        assert names == ["inside"]
+
+    def test_exception_rolls_back_everything(self, factory):
+        """Sub-request commits are savepoints until the batch finishes"""
+        session_factory, engine = factory
+        effects = []
+
+        with pytest.raises(RuntimeError):
+            with batch.open_batch_session(session_factory) as session:
+                token = batch.activate(batch.BatchContext(session))
+                try:
+                    session.add(Example(name="inside"))
+                    session.commit()
+                    batch.after_commit(effects.append, "inside")
+                    raise RuntimeError("batch failed")
+                finally:
+                    batch.deactivate(token)
+
+        assert effects == []
+        with engine.connect() as connection:
+            assert connection.scalar(text("SELECT count(*) FROM examples")) == 0
+
+    def test_effects_run_after_commit(self, factory):
+        """after_commit callbacks run once the outer transaction is committed"""
+        session_factory, engine = factory
+        effects = []
+
+        def record():
+            with engine.connect() as connection:
+                effects.append(connection.scalar(text("SELECT count(*) FROM examples")))
+
+        with batch.open_batch_session(session_factory, write=True) as session:
+            token = batch.activate(batch.BatchContext(session))
+            try:
+                session.add(Example(name="inside"))
+                session.commit()
+                batch.after_commit(record)
+                assert effects == []
+            finally:
+                batch.deactivate(token)
+
+        assert effects == [1]
+
+    def test_lock_wait_does_not_block_loop(self, factory):
+        """The async session opens in a worker thread while the loop keeps running"""
+        session_factory, engine = factory
+        holder = engine.raw_connection()
+        holder.execute("BEGIN IMMEDIATE")
+        threading.Timer(0.3, holder.rollback).start()
+
+        async def main():
+            ticks = 0
+
+            async def tick():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+
+            ticker = asyncio.create_task(tick())
+            async with batch.open_batch_session_async(session_factory, write=True) as session:
+                waited = ticks
+                session.add(Example(name="inside"))
+            ticker.cancel()
+            return waited
+
+        try:
+            assert asyncio.run(main()) >= 10
+        finally:
+            holder.close()
+        with engine.connect() as connection:
+            assert connection.scalar(text("SELECT count(*) FROM examples")) == 1
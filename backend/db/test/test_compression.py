@@ -0,0 +1,151 @@
+"""
+Response Compression Tests.
+
+Tests for app.middleware.compression and app.utils.compression including:
+- Accept-Encoding negotiation with q-values
+- Large allowlisted responses are compressed, small or other types are not
+- Streamed responses (SSE) pass through untouched
+- Compressed bodies are cached by ETag and If-None-Match returns 304
+"""
+
+import gzip
+import sys
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+# Add backend/app to path for imports
+backend_path = Path(__file__).parent.parent.parent / "app"
+sys.path.insert(0, str(backend_path.parent))
+
+from app.middleware.compression import CompressionMiddleware
+from app.utils.compression import CompressionCache, choose_encoding, parse_accept_encoding
+
+ROWS = [{"id": i, "name": f"example {i}", "description": "repeated text " * 5} for i in range(200)]
+
+
+def create_client():
+    calls = []
+
+    def counting_gzip(data: bytes) -> bytes:
+        calls.append(len(data))
+        return gzip.compress(data, mtime=0)
+
+    app = FastAPI()
+
+    @app.get("/big")
+    def big():
+        return JSONResponse(ROWS)
+
+    @app.get("/small")
+    def small():
+        return {"ok": True}
+
+    @app.get("/image")
+    def image():
+        return Response(b"\x89PNG" + b"\0" * 4096, media_type="image/png")
+
+    @app.get("/stream")
+    def stream():
+        def events():
+            yield "data: one\n\n" * 200
+            yield "data: two\n\n" * 200
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    cache = CompressionCache()
+    app.add_middleware(CompressionMiddleware, encoders={"gzip": counting_gzip}, cache=cache, min_size=512)
+    return TestClient(app), calls, cache
+
+
+class TestNegotiation:
+    """Tests for Accept-Encoding parsing"""
+
+    def test_q_values(self):
+        """q=0 excludes an encoding, missing q means 1"""
+        assert parse_accept_encoding("gzip;q=0.5, br, zstd;q=0") == {"gzip": 0.5, "br": 1.0, "zstd": 0.0}
+
+    def test_server_preference_among_accepted(self):
+        """The first server encoder the client accepts wins"""
+        encoders = {"br": None, "zstd": None, "gzip": None}
+
+        assert choose_encoding("gzip, br", encoders) == "br"
+        assert choose_encoding("br;q=0, gzip", encoders) == "gzip"
+        assert choose_encoding("*", encoders) == "br"
+        assert choose_encoding("identity", encoders) is None
+        assert choose_encoding(None, encoders) is None
+
+
+class TestCompressionMiddleware:
+    """Tests for the compression middleware"""
+
+    def test_large_json_is_compressed(self):
+        """Allowlisted bodies over the threshold are gzipped with an ETag and Vary"""
+        client, calls, _ = create_client()
+
+        response = client.get("/big", headers={"Accept-Encoding": "gzip"})
+
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.headers["etag"].endswith('-gzip"')
+        assert int(response.headers["content-length"]) < calls[0]
+        assert response.json() == ROWS
+
+    def test_small_and_other_types_are_not_compressed(self):
+        """Bodies under the threshold and non-allowlisted types are sent as is"""
+        client, calls, _ = create_client()
+
+        small = client.get("/small", headers={"Accept-Encoding": "gzip"})
+        image = client.get("/image", headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in small.headers
+        assert "content-encoding" not in image.headers
+        assert len(image.content) == 4100
+        assert calls == []
+
+    def test_stream_passes_through(self):
+        """SSE responses are not buffered or compressed"""
+        client, calls, _ = create_client()
+
+        response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in response.headers
+        assert response.text.count("data: one") == 200
+        assert calls == []
+
+    def test_cached_by_etag(self):
+        """A repeated response is served from the cache without recompressing"""
+        client, calls, cache = create_client()
+
+        first = client.get("/big", headers={"Accept-Encoding": "gzip"})
+        second = client.get("/big", headers={"Accept-Encoding": "gzip"})
+
+        assert len(calls) == 1
+        assert cache.hits == 1
+        assert second.headers["etag"] == first.headers["etag"]
+        assert second.json() == ROWS
+
+    def test_if_none_match_returns_304(self):
+        """A matching If-None-Match gets 304 with no body"""
+        client, _, cache = create_client()
+        etag = client.get("/big", headers={"Accept-Encoding": "gzip"}).headers["etag"]
+
+        response = client.get("/big", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+        assert cache.not_modified == 1
+
+    def test_cache_evicts_by_bytes(self):
+        """The cache stays under its byte budget"""
+        cache = CompressionCache(max_entries=10, max_bytes=100)
+
+        cache.put('"a"', "gzip", b"x" * 60)
+        cache.put('"b"', "gzip", b"x" * 60)
+
+        assert cache.get('"a"', "gzip") is None
+        assert cache.get('"b"', "gzip") == b"x" * 60
+        assert cache.stats()["bytes"] == 60
@@ -0,0 +1,78 @@
+"""
+Lazy Session Tests.
+
+Tests for app.database.LazySession and session_stats including:
+- A request rejected before touching the DB builds no Session and checks out no connection
+- A normal query materializes the Session and is counted as touched
+- The proxy works as a context manager and closes the real Session
+- Closing twice counts the request once
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import event, text
+
+# Add backend/app to path for imports
+backend_path = Path(__file__).parent.parent.parent / "app"
+sys.path.insert(0, str(backend_path.parent))
+
+from app import database
+from app.database import LazySession
+
+
+@pytest.fixture
+def checkouts(api_engine):
+    """Connection pool checkouts on the test engine."""
+    counted = []
+    event.listen(api_engine, "checkout", lambda *args: counted.append(None))
+    return counted
+
+
+def stats_delta(before: dict) -> dict:
+    after = database.session_stats.snapshot()
+    return {key: after[key] - before[key] for key in after}
+
+
+class TestLazySession:
+    """Tests for get_db's lazy session"""
+
+    def test_bad_token_skips_session(self, api_client, checkouts):
+        """An invalid token short-circuits before any Session or connection"""
+        before = database.session_stats.snapshot()
+
+        response = api_client.get("/api/auth/me", headers={"Authorization": "Bearer not-a-jwt"})
+
+        assert response.status_code == 401
+        assert stats_delta(before) == {"requested": 1, "materialized": 0, "touched": 0, "untouched": 1}
+        assert checkouts == []
+
+    def test_query_materializes_session(self, api_client, checkouts):
+        """A handler that queries builds the Session and uses one connection"""
+        before = database.session_stats.snapshot()
+
+        response = api_client.get("/api/examples/")
+
+        assert response.status_code == 200
+        assert stats_delta(before) == {"requested": 1, "materialized": 1, "touched": 1, "untouched": 0}
+        assert len(checkouts) == 1
+
+    def test_context_manager_closes(self, api_engine):
+        """with LazySession() closes the real Session on exit"""
+        with LazySession() as db:
+            assert db.scalar(text("SELECT 1")) == 1
+            session = db._session
+
+        assert db._session is None
+        assert not session.in_transaction()
+
+    def test_double_close_counts_once(self, api_engine):
+        """Closing twice (e.g. __exit__ then get_db's finally) counts one request"""
+        before = database.session_stats.snapshot()
+
+        with LazySession() as db:
+            db.scalar(text("SELECT 1"))
+        db.close()
+
+        assert stats_delta(before) == {"requested": 1, "materialized": 1, "touched": 1, "untouched": 0}
@@ -0,0 +1,104 @@
+"""
+Request Deadline Tests.
+
+Tests for app.utils.deadline including:
+- Timeout resolution from header and route defaults
+- SQLite statements interrupted once the deadline passes
+- Other DB errors raised after the deadline are not turned into 504s
+- Statements running normally without a deadline
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import OperationalError
+
+# Add backend/app to path for imports
+backend_path = Path(__file__).parent.parent.parent / "app"
+sys.path.insert(0, str(backend_path.parent))
+
+from app.utils import deadline
+
+SLOW_QUERY = text(
+    "WITH RECURSIVE r(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM r WHERE i < 50000000) "
+    "SELECT count(*) FROM r"
+)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """File-backed SQLite engine with deadline-aware statement timeouts."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'deadline.db'}")
+    deadline.install_statement_timeouts(engine)
+    yield engine
+    engine.dispose()
+
+
+class TestResolveTimeout:
+    """Tests for picking the request timeout."""
+
+    def test_header_overrides_route_default(self):
+        """Test that a valid header value wins."""
+        assert deadline.resolve_timeout("1.5", "read") == 1.5
+
+    def test_header_is_capped(self):
+        """Test that header values cannot exceed the maximum."""
+        assert deadline.resolve_timeout("99999", "read") == deadline.MAX_REQUEST_TIMEOUT
+
+    def test_invalid_header_falls_back_to_route_default(self):
+        """Test that garbage or non-positive headers are ignored."""
+        assert deadline.resolve_timeout("soon", "write") == deadline.ROUTE_CLASS_TIMEOUTS["write"]
+        assert deadline.resolve_timeout("-1", "auth") == deadline.ROUTE_CLASS_TIMEOUTS["auth"]
+
+    def test_unclassified_route_has_no_deadline(self):
+        """Test that routes without a class (e.g. streams) get no deadline."""
+        assert deadline.resolve_timeout(None, None) is None
+
+
+class TestStatementTimeout:
+    """Tests for propagating the deadline to SQLite."""
+
+    def test_slow_statement_is_interrupted(self, engine):
+        """Test that a long-running statement stops at the deadline."""
+        token = deadline.set_deadline(0.05)
+        try:
+            with pytest.raises(deadline.DeadlineExceeded):
+                with engine.connect() as conn:
+                    conn.execute(SLOW_QUERY)
+        finally:
+            deadline.reset_deadline(token)
+
+    def test_expired_deadline_rejects_new_statements(self, engine):
+        """Test that no statement starts after the deadline."""
+        token = deadline.set_deadline(-1)
+        try:
+            with pytest.raises(deadline.DeadlineExceeded):
+                with engine.connect() as conn:
+                    conn.execute(text("SELECT 1"))
+        finally:
+            deadline.reset_deadline(token)
+
+    def test_other_errors_after_deadline_pass_through(self, engine):
+        """Test that only interrupts are translated, not any error past the deadline."""
+        def slow_failure():
+            time.sleep(0.1)
+            raise ValueError("boom")
+
+        event.listen(engine, "connect", lambda dbapi_connection, record: dbapi_connection.create_function(
+            "slow_failure", 0, slow_failure
+        ))
+        token = deadline.set_deadline(0.05)
+        try:
+            with pytest.raises(OperationalError, match="user-defined function raised exception"):
+                with engine.connect() as conn:
+                    conn.execute(text("SELECT slow_failure()"))
+        finally:
+            deadline.reset_deadline(token)
+
+    def test_no_deadline_runs_normally(self, engine):
+        """Test that statements run when no deadline is set."""
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT 1")).scalar() == 1
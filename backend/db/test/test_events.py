@@ -0,0 +1,154 @@
+"""
+Example Change Event Broker Tests.
+
+Tests for app.utils.events including:
+- Delivery of events published from worker threads
+- Resume from Last-Event-ID
+- Reset when the requested ID is no longer buffered
+- Per-worker event ID namespaces
+- Slow-consumer eviction
+"""
+
+import asyncio
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# Add backend/app to path for imports
+backend_path = Path(__file__).parent.parent.parent / "app"
+sys.path.insert(0, str(backend_path.parent))
+
+from app.utils.events import EventBroker
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class TestDelivery:
+    """Tests for basic publish/subscribe."""
+
+    def test_event_from_thread_is_delivered(self):
+        """Test that a publish from a threadpool thread reaches the loop."""
+        broker = EventBroker(namespace="w1")
+
+        async def scenario():
+            subscriber, backlog = broker.subscribe()
+            thread = threading.Thread(target=broker.publish, args=("example.created", {"id": 1}))
+            thread.start()
+            thread.join()
+            return backlog, await subscriber.get(timeout=1)
+
+        backlog, event = run(scenario())
+
+        assert backlog == []
+        assert event.type == "example.created"
+        assert event.data == '{"id":1}'
+        assert event.encode() == 'id: w1:1\nevent: example.created\ndata: {"id":1}\n\n'
+
+    def test_unsubscribed_receives_nothing(self):
+        """Test that unsubscribed connections are not tracked."""
+        broker = EventBroker()
+
+        async def scenario():
+            subscriber, _ = broker.subscribe()
+            broker.unsubscribe(subscriber)
+            broker.publish("example.deleted", {"id": 1})
+            return await subscriber.get(timeout=0.05)
+
+        assert run(scenario()) is None
+        assert broker.subscriber_count == 0
+
+
+class TestResume:
+    """Tests for Last-Event-ID resume."""
+
+    def test_resume_returns_missed_events(self):
+        """Test that events after last_event_id are replayed."""
+        broker = EventBroker()
+        for i in range(5):
+            broker.publish("example.created", {"id": i})
+
+        async def scenario():
+            return broker.subscribe(last_event_id=f"{broker.namespace}:3")
+
+        _, backlog = run(scenario())
+
+        assert [event.id for event in backlog] == [4, 5]
+
+    def test_resume_beyond_buffer_requires_reset(self):
+        """Test that a trimmed history yields a reset (None)."""
+        broker = EventBroker(history_size=2)
+        for i in range(5):
+            broker.publish("example.created", {"id": i})
+
+        async def scenario():
+            return broker.subscribe(last_event_id=f"{broker.namespace}:1")
+
+        _, backlog = run(scenario())
+
+        assert backlog is None
+
+    def test_resume_from_previous_process_requires_reset(self):
+        """Test that an ID newer than anything published yields a reset."""
+        broker = EventBroker()
+
+        async def scenario():
+            return broker.subscribe(last_event_id=f"{broker.namespace}:42")
+
+        _, backlog = run(scenario())
+
+        assert backlog is None
+
+    def test_resume_from_other_worker_requires_reset(self):
+        """Test that an ID issued by another worker yields a reset."""
+        broker = EventBroker()
+        other = EventBroker()
+        for i in range(3):
+            broker.publish("example.created", {"id": i})
+            other.publish("example.created", {"id": i})
+
+        async def scenario():
+            return broker.subscribe(last_event_id=other.last_event_id())
+
+        _, backlog = run(scenario())
+
+        assert broker.namespace != other.namespace
+        assert backlog is None
+
+    @pytest.mark.parametrize("event_id", ["2", "", "garbage", ":2"])
+    def test_unnamespaced_id_requires_reset(self, event_id):
+        """Test that IDs without this broker's namespace yield a reset."""
+        broker = EventBroker()
+        for i in range(3):
+            broker.publish("example.created", {"id": i})
+
+        async def scenario():
+            return broker.subscribe(last_event_id=event_id)
+
+        _, backlog = run(scenario())
+
+        assert backlog is None
+
+
+class TestEviction:
+    """Tests for slow-consumer eviction."""
+
+    def test_full_queue_evicts_subscriber(self):
+        """Test that overflowing a subscriber queue disconnects it."""
+        broker = EventBroker(queue_size=2)
+
+        async def scenario():
+            subscriber, _ = broker.subscribe()
+            for i in range(3):
+                broker.publish("example.created", {"id": i})
+            await asyncio.sleep(0)
+            with pytest.raises(ConnectionAbortedError):
+                await subscriber.get(timeout=1)
+
+        run(scenario())
+
+        assert broker.subscriber_count == 0
+        assert broker.evictions == 1
@@ -0,0 +1,155 @@
+"""
+Example Full-Text Search Tests.
+
+Tests for app.crud.example.search_examples including:
+- FTS index creation alongside the examples table
+- Index kept in sync on insert/update/delete
+- Relevance ranking and pagination (id tie-breaker for equal ranks)
+- Query sanitization of FTS syntax characters
+- LIKE fallback treats % and _ in the query literally
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import delete, inspect, text
+from sqlalchemy.orm import Session
+
+# Add backend/app to path for imports
+backend_path = Path(__file__).parent.parent.parent / "app"
+sys.path.insert(0, str(backend_path.parent))
+
+from app.models import Example
+from app.models.example import ensure_example_search_index
+from app.crud.example import search_examples
+
+
+@pytest.fixture
+def examples(db_session: Session) -> list[Example]:
+    """Create a few searchable examples."""
+    rows = [
+        Example(name="FastAPI tutorial", description="Build APIs with Python"),
+        Example(name="SQLite notes", description="FastAPI and SQLite together, FastAPI again"),
+        Example(name="Cooking", description="Kimchi recipe"),
+    ]
+    db_session.add_all(rows)
+    db_session.commit()
+    return rows
+
+
+class TestSearchIndex:
+    """Tests for FTS index lifecycle."""
+
+    def test_fts_table_created(self, test_engine):
+        """Test that the FTS virtual table is created with the examples table."""
+        assert "examples_fts" in inspect(test_engine).get_table_names()
+
+    def test_insert_is_indexed(self, db_session: Session, examples):
+        """Test that inserted rows are searchable immediately."""
+        result = search_examples(db_session, "kimchi")
+
+        assert [e.name for e in result] == ["Cooking"]
+
+    def test_delete_is_unindexed(self, db_session: Session, examples):
+        """Test that deleted rows disappear from results (Core DELETE too)."""
+        db_session.execute(delete(Example).where(Example.name == "Cooking"))
+        db_session.commit()
+
+        assert search_examples(db_session, "kimchi") == []
+
+    def test_update_is_reindexed(self, db_session: Session, examples):
+        """Test that updates replace the indexed text."""
+        examples[2].description = "Bibimbap recipe"
+        db_session.commit()
+
+        assert search_examples(db_session, "kimchi") == []
+        assert [e.name for e in search_examples(db_session, "bibimbap")] == ["Cooking"]
+
+    def test_ensure_index_backfills_existing_rows(self, db_session: Session, examples):
+        """Test that a missing index is rebuilt from existing rows."""
+        connection = db_session.connection()
+        connection.execute(text("DROP TABLE examples_fts"))
+        for trigger in ("examples_fts_ai", "examples_fts_ad", "examples_fts_au"):
+            connection.execute(text(f"DROP TRIGGER {trigger}"))
+
+        ensure_example_search_index(connection)
+
+        assert [e.name for e in search_examples(db_session, "kimchi")] == ["Cooking"]
+
+
+class TestSearchQuery:
+    """Tests for ranking, pagination and query handling."""
+
+    def test_ranked_by_relevance(self, db_session: Session, examples):
+        """Test that the row mentioning the term most ranks first."""
+        result = search_examples(db_session, "fastapi")
+
+        assert [e.name for e in result] == ["SQLite notes", "FastAPI tutorial"]
+
+    def test_pagination(self, db_session: Session, examples):
+        """Test limit/offset over ranked results."""
+        first = search_examples(db_session, "fastapi", limit=1, offset=0)
+        second = search_examples(db_session, "fastapi", limit=1, offset=1)
+
+        assert [e.name for e in first] == ["SQLite notes"]
+        assert [e.name for e in second] == ["FastAPI tutorial"]
+
+    def test_equal_rank_pages_are_stable(self, db_session: Session):
+        """Test that ties in rank are broken by id so pages never overlap."""
+        rows = [Example(name="same", description="identical text") for _ in range(7)]
+        db_session.add_all(rows)
+        db_session.commit()
+
+        pages = [search_examples(db_session, "identical", limit=3, offset=offset) for offset in (0, 3, 6)]
+
+        assert [e.id for page in pages for e in page] == sorted(row.id for row in rows)
+
+    def test_prefix_match(self, db_session: Session, examples):
+        """Test that terms match as prefixes."""
+        result = search_examples(db_session, "tuto")
+
+        assert [e.name for e in result] == ["FastAPI tutorial"]
+
+    def test_multiple_terms_are_anded(self, db_session: Session, examples):
+        """Test that every term must match."""
+        result = search_examples(db_session, "fastapi python")
+
+        assert [e.name for e in result] == ["FastAPI tutorial"]
+
+    def test_fts_syntax_is_escaped(self, db_session: Session, examples):
+        """Test that FTS operators in user input do not raise."""
+        assert search_examples(db_session, '"kimchi*(') != []
+        assert search_examples(db_session, '*"()') == []
+
+
+class TestLikeFallback:
+    """Tests for the LIKE scan used on databases without full-text search."""
+
+    @pytest.fixture
+    def like_session(self, db_session: Session, monkeypatch) -> Session:
+        """Session whose dialect is reported as neither sqlite nor postgresql."""
+        monkeypatch.setattr(db_session.get_bind().dialect, "name", "generic")
+        db_session.add_all([
+            Example(name="100% done", description="complete"),
+            Example(name="1000 done", description="not a percent"),
+            Example(name="snake_case", description="underscore"),
+            Example(name="snakeXcase", description="no underscore"),
+            Example(name="back\\slash", description="escape char"),
+        ])
+        db_session.commit()
+        return db_session
+
+    @pytest.mark.parametrize(
+        ("q", "names"),
+        [
+            ("0%", ["100% done"]),
+            ("e_c", ["snake_case"]),
+            ("%", ["100% done"]),
+            ("k\\s", ["back\\slash"]),
+            ("done", ["100% done", "1000 done"]),
+        ],
+    )
+    def test_wildcards_are_literal(self, like_session: Session, q, names):
+        """Test that % and _ in the query only match themselves."""
+        assert [e.name for e in search_examples(like_session, q)] == names
@@ -0,0 +1,103 @@
+"""
+Example Endpoint Tests.
+
+Tests for the /api/examples router including:
+- GET list and GET by id (200/404)
+- PATCH partial updates (200/404/422) and updated_at set by onupdate
+- PATCH with an empty body returns the current row, or 404 if missing
+- DELETE (200, then 404 for the same id)
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add backend/app to path for imports
+backend_path = Path(__file__).parent.parent.parent / "app"
+sys.path.insert(0, str(backend_path.parent))
+
+
+@pytest.fixture
+def example(api_client) -> dict:
+    response = api_client.post("/api/examples/", json={"name": "first", "description": "original"})
+    assert response.status_code == 200
+    return response.json()
+
+
+class TestReadExamples:
+    """Tests for GET /api/examples"""
+
+    def test_list_and_get(self, api_client, example):
+        """The created row is listed and readable by id"""
+        assert [row["id"] for row in api_client.get("/api/examples/").json()] == [example["id"]]
+        assert api_client.get(f"/api/examples/{example['id']}").json() == example
+
+    def test_get_missing(self, api_client, api_engine):
+        """Unknown ids return 404"""
+        assert api_client.get("/api/examples/999").status_code == 404
+
+
+class TestUpdateExample:
+    """Tests for PATCH /api/examples/{id}"""
+
+    def test_partial_update(self, api_client, example):
+        """Only sent fields change and updated_at is filled in"""
+        assert example["updated_at"] is None
+
+        response = api_client.patch(f"/api/examples/{example['id']}", json={"name": "renamed"})
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["name"] == "renamed"
+        assert body["description"] == "original"
+        assert body["created_at"] == example["created_at"]
+        assert body["updated_at"] is not None
+        assert api_client.get(f"/api/examples/{example['id']}").json() == body
+
+    def test_clear_description(self, api_client, example):
+        """An explicit null clears a nullable field"""
+        response = api_client.patch(f"/api/examples/{example['id']}", json={"description": None})
+
+        assert response.status_code == 200
+        assert response.json()["description"] is None
+
+    def test_update_missing(self, api_client, api_engine):
+        """Unknown ids return 404"""
+        assert api_client.patch("/api/examples/999", json={"name": "x"}).status_code == 404
+
+    def test_null_name_rejected(self, api_client, example):
+        """name is not nullable, so null is 422 and nothing changes"""
+        response = api_client.patch(f"/api/examples/{example['id']}", json={"name": None})
+
+        assert response.status_code == 422
+        assert api_client.get(f"/api/examples/{example['id']}").json()["name"] == "first"
+
+    def test_invalid_type_rejected(self, api_client, example):
+        """Body validation errors are 422"""
+        assert api_client.patch(f"/api/examples/{example['id']}", json={"name": ["x"]}).status_code == 422
+
+    def test_empty_body_returns_current(self, api_client, example):
+        """An empty PATCH is a read: current row, updated_at untouched"""
+        response = api_client.patch(f"/api/examples/{example['id']}", json={})
+
+        assert response.status_code == 200
+        assert response.json() == example
+
+    def test_empty_body_missing(self, api_client, api_engine):
+        """An empty PATCH on an unknown id is still 404"""
+        assert api_client.patch("/api/examples/999", json={}).status_code == 404
+
+
+class TestDeleteExample:
+    """Tests for DELETE /api/examples/{id}"""
+
+    def test_delete_then_missing(self, api_client, example):
+        """The first delete succeeds, the second and a later GET are 404"""
+        first = api_client.delete(f"/api/examples/{example['id']}")
+        second = api_client.delete(f"/api/examples/{example['id']}")
+
+        assert first.status_code == 200
+        assert first.json() == {"message": "Deleted successfully"}
+        assert second.status_code == 404
+        assert api_client.get(f"/api/examples/{example['id']}").status_code == 404
@@ -0,0 +1,227 @@
+"""
+Idempotency-Key Tests.
+
+Tests for app.middleware.idempotency and app.utils.idempotency including:
+- Duplicate requests replay the stored response without re-running the handler
+- Reusing a key with a different body is rejected
+- Concurrent duplicates wait for the in-flight original
+- 5xx responses are not stored
+- A create cut off by the request deadline is stored when its thread finishes,
+  so the retry replays it instead of writing again
+- TTL and LRU bounds on the store
+"""
+
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+from starlette.concurrency import run_in_threadpool
+
+# Add backend/app to path for imports
+backend_path = Path(__file__).parent.parent.parent / "app"
+sys.path.insert(0, str(backend_path.parent))
+
+from app.middleware.deadline import DeadlineMiddleware
+from app.middleware.idempotency import IdempotencyMiddleware
+from app.utils.idempotency import IdempotencyStore
+
+
+class CountingApp:
+    """ASGI app that counts calls and echoes the call number."""
+
+    def __init__(self, status=201, delay=0.0):
+        self.status = status
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self, scope, receive, send):
+        self.calls += 1
+        call = self.calls
+        message = await receive()
+        await asyncio.sleep(self.delay)
+        body = json.dumps({"call": call, "echo": message["body"].decode()}).encode()
+        await send({"type": "http.response.start", "status": self.status, "headers": []})
+        await send({"type": "http.response.body", "body": body})
+
+
+class SlowThreadApp:
+    """ASGI app whose handler commits in a worker thread after a delay."""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.commits = 0
+
+    def handler(self):
+        time.sleep(self.delay)
+        self.commits += 1
+        return self.commits
+
+    async def __call__(self, scope, receive, send):
+        await receive()
+        row_id = await run_in_threadpool(self.handler)
+        await send({"type": "http.response.start", "status": 201, "headers": []})
+        await send({"type": "http.response.body", "body": json.dumps({"id": row_id}).encode()})
+
+
+async def call(app, body=b"{}", key="k1", authorization=b"Bearer a", path="/api/examples/", extra_headers=()):
+    headers = [(b"authorization", authorization), *extra_headers]
+    if key is not None:
+        headers.append((b"idempotency-key", key.encode()))
+    scope = {"type": "http", "method": "POST", "path": path, "headers": headers}
+    received = False
+    sent = []
+
+    async def receive():
+        nonlocal received
+        if received:
+            return {"type": "http.disconnect"}
+        received = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    await app(scope, receive, send)
+    headers = dict(sent[0].get("headers", []))
+    return sent[0]["status"], json.loads(sent[1]["body"]), headers
+
+
+class TestIdempotencyMiddleware:
+    """Tests for replay and in-flight coalescing."""
+
+    def test_duplicate_is_replayed(self):
+        """Test that the handler runs once for repeated keys."""
+        inner = CountingApp()
+        app = IdempotencyMiddleware(inner, store=IdempotencyStore())
+
+        async def scenario():
+            return await call(app), await call(app)
+
+        (status1, body1, headers1), (status2, body2, headers2) = asyncio.run(scenario())
+
+        assert inner.calls == 1
+        assert (status1, body1) == (status2, body2)
+        assert b"idempotent-replayed" not in headers1
+        assert headers2[b"idempotent-replayed"] == b"true"
+
+    def test_key_reuse_with_different_body(self):
+        """Test that a different payload under the same key is rejected."""
+        app = IdempotencyMiddleware(CountingApp(), store=IdempotencyStore())
+
+        async def scenario():
+            await call(app, body=b'{"name": "a"}')
+            return await call(app, body=b'{"name": "b"}')
+
+        status, _, _ = asyncio.run(scenario())
+
+        assert status == 422
+
+    def test_keys_are_scoped_per_principal(self):
+        """Test that two users with the same key do not share responses."""
+        inner = CountingApp()
+        app = IdempotencyMiddleware(inner, store=IdempotencyStore())
+
+        async def scenario():
+            await call(app, authorization=b"Bearer a")
+            await call(app, authorization=b"Bearer b")
+
+        asyncio.run(scenario())
+
+        assert inner.calls == 2
+
+    def test_concurrent_duplicates_wait_for_original(self):
+        """Test that in-flight duplicates replay instead of racing."""
+        inner = CountingApp(delay=0.05)
+        app = IdempotencyMiddleware(inner, store=IdempotencyStore())
+
+        async def scenario():
+            return await asyncio.gather(*(call(app) for _ in range(5)))
+
+        results = asyncio.run(scenario())
+
+        assert inner.calls == 1
+        assert all(body == {"call": 1, "echo": "{}"} for _, body, _ in results)
+
+    def test_server_errors_are_not_stored(self):
+        """Test that a 5xx lets the retry run the handler again."""
+        inner = CountingApp(status=500)
+        app = IdempotencyMiddleware(inner, store=IdempotencyStore())
+
+        async def scenario():
+            await call(app)
+            await call(app)
+
+        asyncio.run(scenario())
+
+        assert inner.calls == 2
+
+    def test_timed_out_create_is_replayed_on_retry(self):
+        """Test that a retry after a 504 waits for the abandoned handler and replays it."""
+        inner = SlowThreadApp(delay=0.3)
+        store = IdempotencyStore()
+        app = DeadlineMiddleware(IdempotencyMiddleware(inner, store=store))
+
+        async def scenario():
+            timed_out = await call(app, extra_headers=[(b"x-request-timeout", b"0.05")])
+            retried = await call(app)
+            return timed_out, retried
+
+        (status1, _, _), (status2, body2, headers2) = asyncio.run(scenario())
+
+        assert status1 == 504
+        assert (status2, body2) == (201, {"id": 1})
+        assert headers2[b"idempotent-replayed"] == b"true"
+        assert inner.commits == 1
+        assert store.abandoned == 1
+        assert store.stats()["in_flight"] == 0
+
+    def test_requests_without_key_pass_through(self):
+        """Test that requests without the header are not stored."""
+        inner = CountingApp()
+        store = IdempotencyStore()
+        app = IdempotencyMiddleware(inner, store=store)
+
+        async def scenario():
+            await call(app, key=None)
+            await call(app, key=None)
+
+        asyncio.run(scenario())
+
+        assert inner.calls == 2
+        assert len(store) == 0
+
+    def test_other_routes_are_ignored(self):
+        """Test that only registered routes use the store."""
+        inner = CountingApp()
+        app = IdempotencyMiddleware(inner, store=IdempotencyStore())
+
+        async def scenario():
+            await call(app, path="/api/auth/login")
+            await call(app, path="/api/auth/login")
+
+        asyncio.run(scenario())
+
+        assert inner.calls == 2
+
+
+class TestIdempotencyStore:
+    """Tests for store bounds."""
+
+    def test_entries_expire(self):
+        store = IdempotencyStore(ttl=0)
+        store.put("k", "fp", 201, [], b"")
+
+        assert store.get("k") is None
+
+    def test_least_recently_used_is_evicted(self):
+        store = IdempotencyStore(max_entries=2)
+        store.put("a", "fp", 201, [], b"")
+        store.put("b", "fp", 201, [], b"")
+        store.get("a")
+        store.put("c", "fp", 201, [], b"")
+
+        assert store.get("a") is not None
+        assert store.get("b") is None
+        assert len(store) == 2
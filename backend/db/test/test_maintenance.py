@@ -0,0 +1,211 @@
+"""
+Database Maintenance Tests.
+
+Tests for app.utils.maintenance including:
+- Incremental vacuum returns freelist pages in slices
+- Vacuum is skipped while the app is busy
+- Size report lists tables and indexes with fragmentation
+- Converting an existing database to auto_vacuum=INCREMENTAL
+- Only one scheduler per database runs ticks (file lock), with failover
+- The load signal falls back to an in-flight counter without admission control
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import OperationalError
+
+# Add backend/app to path for imports
+backend_path = Path(__file__).parent.parent.parent / "app"
+sys.path.insert(0, str(backend_path.parent))
+
+from app.database import Base
+from app.models import Example
+from app.middleware import InFlightMiddleware
+from app.utils import maintenance
+from app.utils.lifecycle import Lifecycle, lifecycle
+from app.utils.maintenance import MaintenanceScheduler, enable_incremental_vacuum, size_report
+
+
+def make_engine(path, incremental=True):
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    if incremental:
+        @event.listens_for(engine, "connect")
+        def _auto_vacuum(dbapi_connection, connection_record):
+            dbapi_connection.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+
+def churn(engine, rows=1000):
+    """Insert then delete rows so the freelist fills up."""
+    with engine.begin() as connection:
+        connection.execute(
+            Example.__table__.insert(),
+            [{"name": f"example {i}", "description": "x" * 500} for i in range(rows)],
+        )
+    with engine.begin() as connection:
+        connection.execute(text("DELETE FROM examples"))
+
+
+def freelist(engine):
+    with engine.connect() as connection:
+        return connection.exec_driver_sql("PRAGMA freelist_count").scalar()
+
+
+def pages(engine):
+    """(page_count, freelist_count) of the database file."""
+    with engine.connect() as connection:
+        return (
+            connection.exec_driver_sql("PRAGMA page_count").scalar(),
+            connection.exec_driver_sql("PRAGMA freelist_count").scalar(),
+        )
+
+
+def stat_pages(engine):
+    """Pages held by sqlite_stat* tables (skips the test without dbstat)."""
+    with engine.connect() as connection:
+        try:
+            return connection.exec_driver_sql(
+                "SELECT count(*) FROM dbstat WHERE name LIKE 'sqlite_stat%'"
+            ).scalar()
+        except OperationalError:
+            pytest.skip("SQLite built without dbstat")
+
+
+class TestMaintenanceScheduler:
+    """Tests for optimize and incremental vacuum ticks."""
+
+    def test_vacuum_returns_free_pages(self, tmp_path):
+        """Test that a tick shrinks the freelist in slices."""
+        engine = make_engine(tmp_path / "app.db")
+        churn(engine)
+        assert freelist(engine) > 20
+        scheduler = MaintenanceScheduler(engine, vacuum_pages=10, slice_budget=10)
+
+        status = scheduler.run_once()
+
+        assert freelist(engine) == 0
+        assert status["vacuum_slices"] > 1
+        assert status["optimize_runs"] == 1
+
+    def test_vacuum_skipped_when_busy(self, tmp_path):
+        """Test that no slices run while requests are in flight."""
+        engine = make_engine(tmp_path / "app.db")
+        churn(engine)
+        page_count, free = pages(engine)
+        scheduler = MaintenanceScheduler(engine, load=lambda: 10, max_in_flight=2)
+
+        status = scheduler.run_once()
+
+        # Nothing is truncated; the only free pages reused are the ones
+        # PRAGMA optimize allocates for the planner statistics it writes
+        assert pages(engine) == (page_count, free - stat_pages(engine))
+        assert status["vacuum_slices"] == 0
+        assert status["pages_vacuumed"] == 0
+
+    def test_full_analyze(self, tmp_path):
+        engine = make_engine(tmp_path / "app.db")
+
+        status = MaintenanceScheduler(engine).run_once(analyze=True)
+
+        assert status["analyze_runs"] == 1
+        with engine.connect() as connection:
+            assert connection.exec_driver_sql(
+                "SELECT count(*) FROM sqlite_master WHERE name = 'sqlite_stat1'"
+            ).scalar() == 1
+
+
+class TestSchedulerElection:
+    """Tests for running one scheduler across workers."""
+
+    def test_one_leader_with_failover(self, tmp_path):
+        """Test that the lock admits one scheduler and frees up on stop."""
+        engine = make_engine(tmp_path / "app.db")
+        first = MaintenanceScheduler(engine)
+        second = MaintenanceScheduler(engine)
+
+        assert first.lock_path == f"{tmp_path / 'app.db'}.maintenance.lock"
+        assert first._try_lead() is True
+        assert second._try_lead() is False
+        first.stop()
+        assert second._try_lead() is True
+        second.stop()
+
+    def test_only_leader_ticks(self, tmp_path):
+        """Test that started schedulers in two workers do not both run ticks."""
+        engine = make_engine(tmp_path / "app.db")
+        schedulers = [MaintenanceScheduler(engine, interval=0.01) for _ in range(2)]
+        for scheduler in schedulers:
+            scheduler.start()
+        try:
+            deadline = time.monotonic() + 5
+            while time.monotonic() < deadline and not all(
+                s.ticks or s.skipped_follower for s in schedulers
+            ):
+                time.sleep(0.01)
+        finally:
+            for scheduler in schedulers:
+                scheduler.stop()
+
+        assert sorted(bool(s.ticks) for s in schedulers) == [False, True]
+        assert sorted(bool(s.skipped_follower) for s in schedulers) == [False, True]
+
+
+class TestLoadSignal:
+    """Tests for the in-flight request count the scheduler checks."""
+
+    def test_falls_back_to_in_flight_counter(self, monkeypatch):
+        """Test that the lifecycle counter is used when admission control is off."""
+        monkeypatch.setattr(maintenance, "ADMISSION_CONTROL", False)
+        monkeypatch.setattr(lifecycle, "in_flight", 3)
+
+        assert maintenance.current_load() == 3
+
+    def test_middleware_counts_classified_requests(self):
+        """Test that requests count while running and streams are ignored."""
+        state = Lifecycle()
+        seen = []
+
+        async def app(scope, receive, send):
+            seen.append(state.in_flight)
+
+        middleware = InFlightMiddleware(app, state=state)
+        for path in ("/api/examples/", "/api/examples/stream"):
+            asyncio.run(middleware({"type": "http", "method": "GET", "path": path}, None, None))
+
+        assert seen == [1, 0]
+        assert state.in_flight == 0
+
+
+class TestSizeReport:
+    """Tests for size and fragmentation reporting."""
+
+    def test_reports_tables_and_indexes(self, tmp_path):
+        """Test that objects are listed with type and fragmentation."""
+        engine = make_engine(tmp_path / "app.db")
+        churn(engine)
+
+        report = size_report(engine)
+
+        assert report["auto_vacuum"] == "incremental"
+        assert report["freelist_pages"] > 0
+        if report["objects"] is None:
+            pytest.skip("SQLite built without dbstat")
+        by_name = {obj["name"]: obj for obj in report["objects"]}
+        assert by_name["examples"]["type"] == "table"
+        assert by_name["ix_examples_id"]["type"] == "index"
+        assert 0.0 <= by_name["examples"]["fragmentation"] <= 1.0
+
+
+class TestEnableIncrementalVacuum:
+    def test_converts_existing_database(self, tmp_path):
+        """Test that a one-time VACUUM switches the auto_vacuum mode."""
+        engine = make_engine(tmp_path / "app.db", incremental=False)
+        assert size_report(engine)["auto_vacuum"] == "none"
+
+        assert enable_incremental_vacuum(engine) == "incremental"
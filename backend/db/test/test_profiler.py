@@ -0,0 +1,137 @@
+"""
+Sampling Profiler Tests.
+
+Tests for app.utils.profiler and GET /api/admin/profile including:
+- Output is collapsed-stack text (`frame;frame count`)
+- Samples inside a route endpoint are prefixed with its route label
+- route_labels covers the auth and examples routers only
+- Only one profile runs at a time (ProfilerBusyError / 409)
+- The endpoint is admin-only
+- A profile longer than the read-class deadline still completes
+"""
+
+import re
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add backend/app to path for imports
+backend_path = Path(__file__).parent.parent.parent / "app"
+sys.path.insert(0, str(backend_path.parent))
+
+from app.main import app
+from app.routers.admin import PROFILED_MODULES
+from app.utils import auth, deadline, profiler
+
+COLLAPSED_LINE = re.compile(r"^\S.* \d+$")
+
+
+def busy_endpoint(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+
+@pytest.fixture
+def busy_thread():
+    """Run busy_endpoint in a thread for the duration of a test."""
+    stop = threading.Event()
+    thread = threading.Thread(target=busy_endpoint, args=(stop,))
+    thread.start()
+    yield
+    stop.set()
+    thread.join()
+
+
+@pytest.fixture
+def admin_headers(auth_headers, monkeypatch):
+    monkeypatch.setattr(auth, "ADMIN_USERNAMES", frozenset({"admin"}))
+    return auth_headers("admin")
+
+
+class TestSampling:
+    """Tests for profiler.sample and its output"""
+
+    def test_collapsed_stack_output(self, busy_thread):
+        """Every line is `frames count` and the busy thread's frames appear"""
+        stacks = profiler.sample(0.1, 0.005, {})
+        text = profiler.format_collapsed(stacks)
+
+        assert text.endswith("\n")
+        assert all(COLLAPSED_LINE.match(line) for line in text.splitlines())
+        assert any("test_profiler:busy_endpoint" in stack for stack in stacks)
+
+    def test_samples_attributed_to_route(self, busy_thread):
+        """Stacks through a labelled endpoint start with its route frame"""
+        labels = {busy_endpoint.__code__: "route:GET /api/examples"}
+
+        stacks = profiler.sample(0.1, 0.005, labels)
+
+        busy = [stack for stack in stacks if "busy_endpoint" in stack]
+        assert busy
+        assert all(stack.startswith("route:GET /api/examples;") for stack in busy)
+
+    def test_route_labels_cover_auth_and_examples(self):
+        """Auth and examples endpoints are labelled, admin endpoints are not"""
+        labels = set(profiler.route_labels(app.routes, PROFILED_MODULES).values())
+
+        assert "route:GET /api/examples/" in labels
+        assert "route:POST /api/auth/login" in labels
+        assert not any("/api/admin" in label for label in labels)
+
+    def test_only_one_profile_at_a_time(self):
+        """A second sample while one is running raises ProfilerBusyError"""
+        started = threading.Event()
+        result = {}
+
+        def first():
+            started.set()
+            result["stacks"] = profiler.sample(0.3, 0.01, {})
+
+        thread = threading.Thread(target=first)
+        thread.start()
+        started.wait()
+        while not profiler.is_running():
+            time.sleep(0.001)
+
+        with pytest.raises(profiler.ProfilerBusyError):
+            profiler.sample(0.01, 0.01, {})
+        thread.join()
+        assert not profiler.is_running()
+
+
+class TestProfileEndpoint:
+    """Tests for GET /api/admin/profile"""
+
+    def test_admin_gets_collapsed_text(self, api_client, admin_headers):
+        """An admin receives a plain-text collapsed-stack profile"""
+        response = api_client.get("/api/admin/profile?seconds=0.05&interval_ms=5", headers=admin_headers)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert all(COLLAPSED_LINE.match(line) for line in response.text.splitlines())
+
+    def test_longer_than_read_deadline(self, api_client, admin_headers, monkeypatch):
+        """seconds above the read-class timeout returns 200 and frees the profiler"""
+        monkeypatch.setitem(deadline.ROUTE_CLASS_TIMEOUTS, "read", 0.1)
+
+        response = api_client.get("/api/admin/profile?seconds=0.3&interval_ms=5", headers=admin_headers)
+
+        assert response.status_code == 200
+        assert not profiler.is_running()
+
+    def test_non_admin_forbidden(self, api_client, auth_headers, monkeypatch):
+        """Authenticated non-admin users get 403, anonymous callers 401"""
+        monkeypatch.setattr(auth, "ADMIN_USERNAMES", frozenset({"admin"}))
+
+        assert api_client.get("/api/admin/profile?seconds=0.05", headers=auth_headers("someone")).status_code == 403
+        assert api_client.get("/api/admin/profile?seconds=0.05").status_code == 401
+
+    def test_concurrent_profile_conflicts(self, api_client, admin_headers):
+        """While a profile is running the endpoint returns 409"""
+        with profiler._profile_lock:
+            response = api_client.get("/api/admin/profile?seconds=0.05", headers=admin_headers)
+
+        assert response.status_code == 409
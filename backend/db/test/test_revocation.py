@@ -0,0 +1,145 @@
+"""
+Token Revocation Tests.
+
+Tests for app.utils.revocation.RevocationStore including:
+- Revoked tokens are reported as revoked in-process
+- Revocations are persisted and picked up by other stores (workers)
+- is_revoked never touches the database; the background thread syncs
+- Expired entries are dropped from memory and the table
+- create_access_token issues a unique jti
+"""
+
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+from jose import jwt
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, sessionmaker
+
+# Add backend/app to path for imports
+backend_path = Path(__file__).parent.parent.parent / "app"
+sys.path.insert(0, str(backend_path.parent))
+
+from app.models import RevokedToken
+from app.utils.auth import ALGORITHM, SECRET_KEY, create_access_token
+from app.utils.revocation import RevocationStore
+
+
+@pytest.fixture
+def session_factory(test_engine):
+    return sessionmaker(bind=test_engine)
+
+
+class TestRevocationStore:
+    """Tests for the in-memory front and persistent table."""
+
+    def test_unknown_token_not_revoked(self, session_factory):
+        """Test that tokens are valid unless revoked."""
+        store = RevocationStore(session_factory)
+
+        assert store.is_revoked("never-revoked") is False
+
+    def test_revoke_is_visible_immediately(self, db_session: Session, session_factory):
+        """Test that a revocation applies to the same store at once."""
+        store = RevocationStore(session_factory)
+
+        store.revoke(db_session, "jti-1", time.time() + 60)
+
+        assert store.is_revoked("jti-1") is True
+        assert db_session.get(RevokedToken, "jti-1") is not None
+
+    def test_revoke_twice_is_idempotent(self, db_session: Session, session_factory):
+        """Test that revoking the same jti again does not fail."""
+        store = RevocationStore(session_factory)
+
+        store.revoke(db_session, "jti-1", time.time() + 60)
+        store.revoke(db_session, "jti-1", time.time() + 60)
+
+        assert db_session.scalar(select(func.count()).select_from(RevokedToken)) == 1
+
+    def test_other_store_syncs_from_table(self, db_session: Session, session_factory):
+        """Test that another worker's store learns about the revocation."""
+        writer = RevocationStore(session_factory)
+        reader = RevocationStore(session_factory)
+        reader.sync()
+        assert reader.is_revoked("jti-2") is False
+
+        writer.revoke(db_session, "jti-2", time.time() + 60)
+        assert reader.is_revoked("jti-2") is False
+        reader.sync()
+
+        assert reader.is_revoked("jti-2") is True
+
+    def test_is_revoked_is_memory_only(self, db_session: Session, test_engine):
+        """Test that checks never open a session, even when a sync is due."""
+        opened = []
+
+        def counting_factory():
+            opened.append(None)
+            return Session(test_engine)
+
+        store = RevocationStore(counting_factory, sync_interval=0)
+        RevocationStore(counting_factory).revoke(db_session, "jti-3", time.time() + 60)
+
+        assert store.is_revoked("jti-3") is False
+        assert opened == []
+
+    def test_background_thread_syncs(self, db_session: Session, session_factory):
+        """Test that the sync thread picks up revocations and survives DB errors."""
+        calls = []
+
+        def flaky_factory():
+            calls.append(None)
+            if len(calls) == 1:
+                raise RuntimeError("database unavailable")
+            return session_factory()
+
+        RevocationStore(session_factory).revoke(db_session, "jti-4", time.time() + 60)
+        store = RevocationStore(flaky_factory, sync_interval=0.01)
+        store.start()
+        try:
+            deadline = time.monotonic() + 5
+            while not store.is_revoked("jti-4") and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            store.stop()
+
+        assert store.is_revoked("jti-4") is True
+        assert len(calls) >= 2
+
+    def test_expired_entries_are_dropped(self, db_session: Session, session_factory):
+        """Test that entries past exp leave memory and the table."""
+        store = RevocationStore(session_factory)
+        store.revoke(db_session, "old", time.time() - 1)
+        db_session.add(RevokedToken(jti="stale", expires_at=datetime.utcnow() - timedelta(hours=1)))
+        db_session.commit()
+
+        assert store.is_revoked("old") is False
+        store.sync()
+        assert len(store) == 0
+        assert db_session.scalar(select(func.count()).select_from(RevokedToken)) == 0
+
+    def test_purge_expired(self, db_session: Session, session_factory):
+        """Test that purge_expired only deletes rows past exp."""
+        store = RevocationStore(session_factory)
+        db_session.add(RevokedToken(jti="stale", expires_at=datetime.utcnow() - timedelta(hours=1)))
+        db_session.add(RevokedToken(jti="live", expires_at=datetime.utcnow() + timedelta(hours=1)))
+        db_session.commit()
+
+        assert store.purge_expired(db_session) == 1
+        assert db_session.get(RevokedToken, "live") is not None
+
+
+class TestAccessTokenJti:
+    """Tests for jti claims on issued tokens."""
+
+    def test_tokens_have_unique_jti(self):
+        """Test that every token gets its own jti."""
+        first = jwt.decode(create_access_token({"sub": "a"}), SECRET_KEY, algorithms=[ALGORITHM])
+        second = jwt.decode(create_access_token({"sub": "a"}), SECRET_KEY, algorithms=[ALGORITHM])
+
+        assert first["jti"] and second["jti"]
+        assert first["jti"] != second["jti"]
@@ -0,0 +1,82 @@
+"""
+Fast Response Serialization Tests.
+
+Tests for app.utils.serialization including:
+- Output parity with Pydantic response_model serialization (ORM objects)
+- Output parity for Core row mappings
+- Timezone-aware datetime formatting
+"""
+
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+# Add backend/app to path for imports
+backend_path = Path(__file__).parent.parent.parent / "app"
+sys.path.insert(0, str(backend_path.parent))
+
+from pydantic import TypeAdapter
+
+from app.models import Example, User
+from app.schemas import ExampleResponse, UserResponse
+from app.utils.serialization import get_serializer
+
+
+def _create_examples(db_session: Session) -> list[Example]:
+    examples = [
+        Example(name="first", description="설명"),
+        Example(name="second", description=None),
+    ]
+    db_session.add_all(examples)
+    db_session.commit()
+    for example in examples:
+        db_session.refresh(example)
+    return examples
+
+
+class TestSerializerParity:
+    """Tests that the fast path emits the same JSON as Pydantic."""
+
+    def test_orm_list_matches_pydantic(self, db_session: Session):
+        """Test list serialization of ORM objects."""
+        examples = _create_examples(db_session)
+        adapter = TypeAdapter(list[ExampleResponse])
+        expected = adapter.dump_json(adapter.validate_python(examples, from_attributes=True))
+
+        assert get_serializer(ExampleResponse).dumps_many(examples) == expected
+
+    def test_row_mappings_match_pydantic(self, db_session: Session):
+        """Test list serialization of Core row mappings."""
+        examples = _create_examples(db_session)
+        columns = [getattr(Example, name) for name in ExampleResponse.model_fields]
+        rows = db_session.execute(select(*columns)).mappings().all()
+        adapter = TypeAdapter(list[ExampleResponse])
+        expected = adapter.dump_json(adapter.validate_python(examples, from_attributes=True))
+
+        assert get_serializer(ExampleResponse).dumps_many(rows) == expected
+
+    def test_single_user_matches_pydantic(self, db_session: Session, sample_user: User):
+        """Test single-object serialization of a user."""
+        expected = UserResponse.model_validate(sample_user).model_dump_json().encode()
+
+        assert get_serializer(UserResponse).dumps(sample_user) == expected
+
+    def test_empty_list(self):
+        """Test that an empty iterable serializes to an empty array."""
+        assert get_serializer(ExampleResponse).dumps_many([]) == b"[]"
+
+    def test_utc_datetime_uses_z_suffix(self):
+        """Test that UTC datetimes match Pydantic's `Z` suffix."""
+        row = {
+            "id": 1,
+            "name": "utc",
+            "description": None,
+            "created_at": datetime(2024, 1, 1, tzinfo=timezone.utc),
+            "updated_at": None,
+        }
+        expected = ExampleResponse(**row).model_dump_json().encode()
+
+        assert get_serializer(ExampleResponse).dumps(row) == expected
@@ -0,0 +1,137 @@
+"""
+Production Server Tests.
+
+Tests for app.server and app.utils.lifecycle including:
+- Worker count follows CPU affinity, cgroup quota and WEB_CONCURRENCY
+- SIGTERM fails readiness first and stops the server after the drain delay
+- A second signal during the drain stops the server immediately
+- GET /api/ready reports ready only while the application is running
+- The preloaded master runs init_db once and workers skip it
+"""
+
+import asyncio
+import os
+import signal
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add backend/app to path for imports
+backend_path = Path(__file__).parent.parent.parent / "app"
+sys.path.insert(0, str(backend_path.parent))
+
+pytest.importorskip("gunicorn")
+
+from fastapi.testclient import TestClient
+from uvicorn.config import Config
+
+from app import main
+from app.server import Application, DrainingServer, available_cpus, server_options, worker_count
+from app.utils.lifecycle import lifecycle
+
+
+@pytest.fixture(autouse=True)
+def reset_lifecycle():
+    yield
+    lifecycle.mark_ready()
+
+
+class TestWorkerCount:
+    """Tests for sizing workers to the available cores"""
+
+    def test_cgroup_quota_caps_cpus(self, tmp_path):
+        """A cgroup quota of 1.5 CPUs allows at most 2 workers"""
+        cpu_max = tmp_path / "cpu.max"
+        cpu_max.write_text("150000 100000\n")
+
+        assert available_cpus(cpu_max) <= 2
+
+    def test_unlimited_quota_uses_affinity(self, tmp_path):
+        """Without a quota the CPU affinity decides"""
+        cpu_max = tmp_path / "cpu.max"
+        cpu_max.write_text("max 100000\n")
+
+        assert available_cpus(cpu_max) == available_cpus(tmp_path / "missing")
+        assert available_cpus(cpu_max) >= 1
+
+    def test_configured_count_wins(self):
+        """WEB_CONCURRENCY overrides the CPU count"""
+        assert worker_count(3) == 3
+        assert worker_count(0) == available_cpus()
+
+
+class TestDrainingServer:
+    """Tests for SIGTERM handling in the uvicorn worker server"""
+
+    def test_readiness_fails_before_exit(self):
+        """The server keeps serving for the drain delay with readiness failed"""
+        server = DrainingServer(Config(app=None))
+        server.drain_delay = 0.05
+
+        async def run():
+            server.handle_exit(signal.SIGTERM, None)
+            assert not lifecycle.ready
+            assert not server.should_exit
+            await asyncio.sleep(0.1)
+            assert server.should_exit
+
+        lifecycle.mark_ready()
+        asyncio.run(run())
+
+    def test_second_signal_exits_immediately(self):
+        """A second signal skips the remaining drain delay"""
+        server = DrainingServer(Config(app=None))
+        server.drain_delay = 60
+
+        async def run():
+            server.handle_exit(signal.SIGTERM, None)
+            server.handle_exit(signal.SIGTERM, None)
+            assert server.should_exit
+
+        lifecycle.mark_ready()
+        asyncio.run(run())
+
+
+class TestReadiness:
+    """Tests for GET /api/ready"""
+
+    def test_ready_only_while_running(self, tmp_path, monkeypatch):
+        """Readiness is 200 after startup and 503 once shutdown begins"""
+        monkeypatch.chdir(tmp_path)
+        from app.main import app
+
+        with TestClient(app) as client:
+            response = client.get("/api/ready")
+            assert response.status_code == 200
+            assert response.json()["status"] == "ready"
+
+            lifecycle.begin_drain()
+            response = client.get("/api/ready")
+            assert response.status_code == 503
+            assert response.json()["status"] == "draining"
+            assert client.get("/api/health").status_code == 200
+
+
+class TestPreload:
+    """Tests for one-time initialization in the gunicorn master"""
+
+    def test_init_db_runs_only_in_master(self, tmp_path, monkeypatch):
+        """load() initializes the database and the worker lifespan skips it"""
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv(main.SKIP_INIT_DB_ENV, "0")
+        calls = []
+        init_db = main.init_db
+
+        def counting_init_db():
+            calls.append(os.getpid())
+            init_db()
+
+        monkeypatch.setattr(main, "init_db", counting_init_db)
+
+        app = Application(server_options("127.0.0.1:0", 1)).load()
+
+        assert os.environ[main.SKIP_INIT_DB_ENV] == "1"
+        with TestClient(app) as client:
+            assert client.get("/api/ready").status_code == 200
+        assert calls == [os.getpid()]
@@ -0,0 +1,132 @@
+"""
+Aggregate Counter Tests.
+
+Tests for app.crud.stats including:
+- create_user and example writes update totals and per-day buckets
+- Counter updates share the writer's transaction (rollback discards them)
+- Deleting a row decrements the bucket of the day it was created
+- rebuild_stats recounts the tables, including older days
+- The write coalescer updates counters for a whole batch before committing
+"""
+
+import sys
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+# Add backend/app to path for imports
+backend_path = Path(__file__).parent.parent.parent / "app"
+sys.path.insert(0, str(backend_path.parent))
+
+from app.crud import stats
+from app.crud.user import create_user
+from app.database import Base
+from app.models import Example
+from app.utils.write_coalescer import WriteCoalescer
+
+TODAY = date(2026, 3, 10)
+YESTERDAY = TODAY - timedelta(days=1)
+
+
+def add_example(db: Session, name: str, day: date) -> Example:
+    example = Example(name=name, created_at=datetime.combine(day, datetime.min.time()))
+    db.add(example)
+    db.flush()
+    stats.record_created(db, stats.EXAMPLES, example.created_at)
+    return example
+
+
+class TestCounters:
+    """Tests for incremental counter maintenance"""
+
+    def test_totals_and_daily_buckets(self, db_session: Session):
+        """Creates land in the total and in their created_at day"""
+        add_example(db_session, "a", YESTERDAY)
+        add_example(db_session, "b", TODAY)
+        add_example(db_session, "c", TODAY)
+        db_session.commit()
+
+        result = stats.get_stats(db_session, days=3, today=TODAY)
+
+        assert result["examples"]["total"] == 3
+        assert result["examples"]["today"] == 2
+        assert [bucket["count"] for bucket in result["examples"]["daily"]] == [0, 1, 2]
+        assert result["users"]["total"] == 0
+
+    def test_rollback_discards_counter_updates(self, db_session: Session):
+        """Counters are written in the same transaction as the row"""
+        add_example(db_session, "kept", TODAY)
+        db_session.commit()
+        add_example(db_session, "discarded", TODAY)
+        db_session.rollback()
+
+        assert stats.get_stats(db_session, today=TODAY)["examples"]["total"] == 1
+
+    def test_delete_decrements_creation_day(self, db_session: Session):
+        """Deleting yesterday's row lowers yesterday's bucket, not today's"""
+        old = add_example(db_session, "old", YESTERDAY)
+        add_example(db_session, "new", TODAY)
+        db_session.commit()
+
+        db_session.delete(old)
+        stats.record_deleted(db_session, stats.EXAMPLES, old.created_at)
+        db_session.commit()
+
+        daily = stats.get_stats(db_session, days=2, today=TODAY)["examples"]["daily"]
+        assert [bucket["count"] for bucket in daily] == [0, 1]
+
+    def test_create_user_counts_user(self, db_session: Session):
+        """create_user updates the users counter"""
+        create_user(db_session, {"username": "counted", "email": "counted@example.com"}, "hashed")
+
+        result = stats.get_stats(db_session)
+
+        assert result["users"]["total"] == 1
+        assert result["users"]["today"] == 1
+
+
+class TestRebuild:
+    """Tests for reconciling counters from the tables"""
+
+    def test_rebuild_matches_tables(self, db_session: Session):
+        """Counters edited out of band are restored by a recount"""
+        add_example(db_session, "a", YESTERDAY)
+        add_example(db_session, "b", TODAY)
+        db_session.commit()
+        stats.add_counts(db_session, stats.EXAMPLES, [datetime(2026, 3, 10)] * 5)
+        db_session.commit()
+
+        totals = stats.rebuild_stats(db_session)
+
+        assert totals == {"examples": 2, "users": 0}
+        result = stats.get_stats(db_session, days=2, today=TODAY)
+        assert [bucket["count"] for bucket in result["examples"]["daily"]] == [1, 1]
+        assert stats.stats_initialized(db_session)
+
+
+class TestCoalescerCounters:
+    """Tests for counters on the group-commit path"""
+
+    def test_batch_updates_counters_once(self, tmp_path):
+        """Successful rows of a coalesced batch are counted before the commit"""
+        engine = create_engine(f"sqlite:///{tmp_path / 'stats.db'}", connect_args={"check_same_thread": False})
+        Base.metadata.create_all(bind=engine)
+        session_factory = sessionmaker(bind=engine)
+        batches = []
+
+        def count_rows(session, rows):
+            batches.append(len(rows))
+            stats.add_counts(session, stats.EXAMPLES, [row["created_at"] for row in rows])
+
+        coalescer = WriteCoalescer(
+            session_factory, Example, [Example.id, Example.created_at], before_commit=count_rows
+        )
+        coalescer.submit({"name": "first"})
+        coalescer.submit({"name": "second"})
+
+        with session_factory() as db:
+            assert stats.get_stats(db)["examples"]["total"] == 2
+        assert sum(batches) == 2
+        engine.dispose()
@@ -0,0 +1,174 @@
+"""
+Request Tracing Tests.
+
+Tests for app.utils.tracing including:
+- Head-based sampling (unsampled requests record nothing)
+- traceparent propagation (upstream sampled flag only when trusted)
+- Child spans for SQL statements
+- OTLP JSON export shape, written by a background thread
+"""
+
+import json
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+
+# Add backend/app to path for imports
+backend_path = Path(__file__).parent.parent.parent / "app"
+sys.path.insert(0, str(backend_path.parent))
+
+from app.utils import tracing
+
+
+@pytest.fixture
+def exporter():
+    """Swap in an in-memory exporter for the duration of a test."""
+    previous = tracing.get_exporter()
+    memory = tracing.InMemoryExporter()
+    tracing.set_exporter(memory)
+    yield memory
+    tracing.set_exporter(previous)
+
+
+def _run_root(name="GET /test", traceparent=None, rate=1.0, body=None, monkeypatch=None):
+    monkeypatch.setattr(tracing, "TRACE_SAMPLE_RATE", rate)
+    root = tracing.start_root_span(name, {}, traceparent)
+    if root is None:
+        return None
+    token = tracing.activate(root)
+    try:
+        if body:
+            body()
+    finally:
+        tracing.deactivate(token)
+        root.end()
+    return root
+
+
+class TestSampling:
+    """Tests for head-based sampling decisions."""
+
+    def test_unsampled_request_records_nothing(self, exporter, monkeypatch):
+        """Test that a zero sample rate skips span creation entirely."""
+        root = _run_root(rate=0.0, monkeypatch=monkeypatch)
+
+        assert root is None
+        assert exporter.spans == []
+
+    def test_child_span_without_trace_is_noop(self, exporter):
+        """Test that span() yields None outside of a sampled request."""
+        with tracing.span("orphan") as child:
+            assert child is None
+
+        assert exporter.spans == []
+
+    def test_untrusted_sampled_flag_does_not_force_sampling(self, exporter, monkeypatch):
+        """Test that a client-supplied sampled flag cannot bypass the sample rate."""
+        traceparent = "00-" + "a" * 32 + "-" + "b" * 16 + "-01"
+        root = _run_root(traceparent=traceparent, rate=0.0, monkeypatch=monkeypatch)
+
+        assert root is None
+        assert exporter.spans == []
+
+    def test_traceparent_continued_when_sampled_locally(self, exporter, monkeypatch):
+        """Test that a locally sampled request joins the upstream trace."""
+        traceparent = "00-" + "a" * 32 + "-" + "b" * 16 + "-00"
+        _run_root(traceparent=traceparent, rate=1.0, monkeypatch=monkeypatch)
+
+        assert exporter.spans[0]["traceId"] == "a" * 32
+        assert exporter.spans[0]["parentSpanId"] == "b" * 16
+
+    def test_traceparent_sampled_flag_is_honored_when_trusted(self, exporter, monkeypatch):
+        """Test that a trusted upstream sampled traceparent forces sampling."""
+        monkeypatch.setattr(tracing, "TRACE_TRUST_UPSTREAM_SAMPLING", True)
+        traceparent = "00-" + "a" * 32 + "-" + "b" * 16 + "-01"
+        root = _run_root(traceparent=traceparent, rate=0.0, monkeypatch=monkeypatch)
+
+        assert root is not None
+        assert exporter.spans[0]["traceId"] == "a" * 32
+        assert exporter.spans[0]["parentSpanId"] == "b" * 16
+
+    def test_traceparent_unsampled_flag_is_honored_when_trusted(self, exporter, monkeypatch):
+        """Test that a trusted upstream unsampled traceparent suppresses sampling."""
+        monkeypatch.setattr(tracing, "TRACE_TRUST_UPSTREAM_SAMPLING", True)
+        traceparent = "00-" + "a" * 32 + "-" + "b" * 16 + "-00"
+        root = _run_root(traceparent=traceparent, rate=1.0, monkeypatch=monkeypatch)
+
+        assert root is None
+
+    def test_malformed_traceparent_ignored(self):
+        """Test that malformed traceparent headers are rejected."""
+        assert tracing.parse_traceparent("garbage") is None
+        assert tracing.parse_traceparent("00-zz-yy-01") is None
+
+
+class TestSpans:
+    """Tests for span nesting and export."""
+
+    def test_child_spans_share_trace_and_parent(self, exporter, monkeypatch):
+        """Test that child spans are exported under the root span."""
+        def body():
+            with tracing.span("auth.password_verify"):
+                pass
+
+        root = _run_root(body=body, monkeypatch=monkeypatch)
+
+        names = [s["name"] for s in exporter.spans]
+        assert names == ["auth.password_verify", "GET /test"]
+        child = exporter.spans[0]
+        assert child["traceId"] == root.trace.trace_id
+        assert child["parentSpanId"] == root.span_id
+
+    def test_exception_marks_span_as_error(self, exporter, monkeypatch):
+        """Test that exceptions inside a span set an error status."""
+        def body():
+            with pytest.raises(ValueError):
+                with tracing.span("failing"):
+                    raise ValueError("boom")
+
+        _run_root(body=body, monkeypatch=monkeypatch)
+
+        assert exporter.spans[0]["status"]["code"] == tracing.STATUS_ERROR
+
+    def test_sql_statements_become_spans(self, exporter, test_engine, monkeypatch):
+        """Test that instrumented engines emit one span per statement."""
+        tracing.instrument_engine(test_engine)
+
+        def body():
+            with test_engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+
+        _run_root(body=body, monkeypatch=monkeypatch)
+
+        sql_spans = [s for s in exporter.spans if s["name"] == "db.query"]
+        assert len(sql_spans) == 1
+        attributes = {a["key"]: a["value"] for a in sql_spans[0]["attributes"]}
+        assert attributes["db.statement"] == {"stringValue": "SELECT 1"}
+        assert sql_spans[0]["kind"] == tracing.SPAN_KIND_CLIENT
+
+    def test_file_export_runs_off_the_request_thread(self, tmp_path, monkeypatch):
+        """Test that the JSONL exporter writes from its background thread."""
+        path = tmp_path / "traces.jsonl"
+        file_exporter = tracing.JsonLinesExporter(str(path))
+        threads = []
+        line = file_exporter._line
+
+        def recording_line(spans):
+            threads.append(threading.current_thread().name)
+            return line(spans)
+
+        monkeypatch.setattr(file_exporter, "_line", recording_line)
+        previous = tracing.get_exporter()
+        tracing.set_exporter(file_exporter)
+        try:
+            _run_root(monkeypatch=monkeypatch)
+            tracing.flush()
+        finally:
+            tracing.set_exporter(previous)
+
+        exported = json.loads(path.read_text().splitlines()[0])
+        assert exported["resourceSpans"][0]["scopeSpans"][0]["spans"][0]["name"] == "GET /test"
+        assert threads == ["trace-exporter"]
@@ -0,0 +1,160 @@
+"""
+Shared-Memory User Cache Tests.
+
+Tests for app.utils.user_cache and get_user_snapshot_by_username including:
+- Snapshots round-trip through the mmap slots, keyed case-insensitively
+- Invalidation between reserve and fill rejects the stale fill
+- invalidate_all bumps the generation and empties every slot
+- Another process sees fills without any IPC
+- A process dying mid-write leaves a slot that readers skip and the next open repairs
+- create_user invalidates the cached username
+"""
+
+import fcntl
+import multiprocessing
+import os
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# Add backend/app to path for imports
+backend_path = Path(__file__).parent.parent.parent / "app"
+sys.path.insert(0, str(backend_path.parent))
+
+from app.crud import user as user_crud
+from app.utils import user_cache as user_cache_module
+from app.utils.user_cache import SharedUserCache, UserSnapshot
+
+ALICE = UserSnapshot(
+    id=7,
+    username="Alice",
+    email="alice@example.com",
+    is_active=True,
+    created_at=datetime(2026, 3, 10, 12, 30, 1, 250),
+    updated_at=datetime(2026, 3, 11, 8, 0, tzinfo=timezone.utc),
+)
+
+
+def cache_fill(cache: SharedUserCache, snapshot: UserSnapshot) -> None:
+    cache.fill(cache.reserve(snapshot.username), snapshot)
+
+
+def fill_in_child(path: str, snapshot: UserSnapshot) -> None:
+    cache_fill(SharedUserCache(path, slots=64), snapshot)
+
+
+def die_mid_write(path: str, username: str) -> None:
+    """Take the writer lock, start a slot write and exit without finishing it."""
+    cache = SharedUserCache(path, slots=64)
+    offset, seq, _ = cache.reserve(username)
+    with cache._locked() as mm:
+        user_cache_module._SEQ.pack_into(mm, offset, seq | 1)
+        os._exit(1)
+
+
+def run_child(target, *args) -> int:
+    process = multiprocessing.get_context("fork").Process(target=target, args=args)
+    process.start()
+    process.join(10)
+    return process.exitcode
+
+
+class TestSharedUserCache:
+    """Tests for the mmap slot cache"""
+
+    def test_round_trip_case_insensitive(self, tmp_path):
+        """A filled snapshot is read back field for field under any ASCII case"""
+        cache = SharedUserCache(str(tmp_path / "users.cache"), slots=64)
+        assert cache.get("alice") is None
+
+        cache_fill(cache, ALICE)
+
+        assert cache.get("ALICE") == ALICE
+        assert cache.get("alicia") is None
+        assert cache.hits == 1
+        assert cache.fills == 1
+
+    def test_invalidate_rejects_pending_fill(self, tmp_path):
+        """A fill reserved before an invalidation does not store the stale row"""
+        cache = SharedUserCache(str(tmp_path / "users.cache"), slots=64)
+        token = cache.reserve("alice")
+
+        cache.invalidate("alice")
+        cache.fill(token, ALICE)
+
+        assert cache.get("alice") is None
+        assert cache.stale_fills == 1
+
+    def test_invalidate_all_bumps_generation(self, tmp_path):
+        """Every entry from an older generation is a miss"""
+        cache = SharedUserCache(str(tmp_path / "users.cache"), slots=64)
+        cache_fill(cache, ALICE)
+
+        generation = cache.invalidate_all()
+
+        assert cache.get("alice") is None
+        assert cache.stats()["generation"] == generation
+
+    def test_fill_visible_to_other_process(self, tmp_path):
+        """A snapshot filled by another worker is read from shared memory"""
+        path = str(tmp_path / "users.cache")
+        cache = SharedUserCache(path, slots=64)
+        assert cache.get("alice") is None
+
+        assert run_child(fill_in_child, path, ALICE) == 0
+
+        assert cache.get("alice") == ALICE
+
+    def test_recovers_from_writer_crash(self, tmp_path):
+        """A slot left mid-write is skipped by readers and cleared by the next open"""
+        path = str(tmp_path / "users.cache")
+        cache = SharedUserCache(path, slots=64)
+        cache_fill(cache, ALICE)
+
+        assert run_child(die_mid_write, path, "alice") == 1
+
+        assert cache.get("alice") is None
+        assert cache.busy_reads == 1
+        with open(path, "rb") as file:
+            fcntl.flock(file, fcntl.LOCK_EX | fcntl.LOCK_NB)  # lock released by the kernel
+        reopened = SharedUserCache(path, slots=64)
+        cache_fill(reopened, ALICE)
+        assert reopened.recovered_slots == 1
+        assert cache.get("alice") == ALICE
+
+    def test_layout_change_reinitializes(self, tmp_path):
+        """Opening with a different slot count starts from an empty file"""
+        path = str(tmp_path / "users.cache")
+        cache_fill(SharedUserCache(path, slots=64), ALICE)
+
+        resized = SharedUserCache(path, slots=128)
+
+        assert resized.get("alice") is None
+        assert resized.stats()["slots"] == 128
+
+
+class TestCachedUserLookup:
+    """Tests for get_user_snapshot_by_username with the cache enabled"""
+
+    def test_create_invalidates_and_hit_skips_database(self, db_session: Session, tmp_path, monkeypatch):
+        """create_user clears the key; the second lookup is served from the cache"""
+        cache = SharedUserCache(str(tmp_path / "users.cache"), slots=64)
+        monkeypatch.setattr(user_crud, "user_cache", cache)
+        # A leftover snapshot of an earlier user with the same name
+        cache_fill(cache, UserSnapshot(999, "cached", "old@example.com", True, None, None))
+
+        user_crud.create_user(db_session, {"username": "cached", "email": "cached@example.com"}, "hashed")
+        assert cache.get("cached") is None
+        statements = []
+        event.listen(db_session.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+        first = user_crud.get_user_snapshot_by_username(db_session, "cached")
+        second = user_crud.get_user_snapshot_by_username(db_session, "CACHED")
+
+        assert second == first
+        assert second.email == "cached@example.com"
+        assert len(statements) == 1
+        assert user_crud.get_user_snapshot_by_username(db_session, "missing") is None
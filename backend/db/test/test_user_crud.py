@@ -7,12 +7,15 @@ Tests for User CRUD operations including:
 - get_user_by_username (existing/non-existing)
 - create_user (normal creation)
 - create_user duplicate constraints (email, username)
+- get_user_credentials_by_email / get_user_profile_by_username (projections)
+- Case-insensitive lookups and uniqueness backed by lower() expression indexes
 """
 
 import sys
 from pathlib import Path
 
 import pytest
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
@@ -20,11 +23,14 @@ from sqlalchemy.orm import Session
 backend_path = Path(__file__).parent.parent.parent / "app"
 sys.path.insert(0, str(backend_path.parent))
 
-from app.models.user import User
+from app.models.user import User, ensure_user_lookup_indexes
 from app.crud.user import (
+    _CREDENTIALS_BY_EMAIL,
     get_user_by_id,
     get_user_by_email,
     get_user_by_username,
+    get_user_credentials_by_email,
+    get_user_profile_by_username,
     create_user,
 )
 
@@ -83,17 +89,12 @@ class TestGetUserByEmail:
 
         assert result is None
 
-    def test_get_user_by_email_case_sensitive(self, db_session: Session, sample_user: User):
-        """Test that email lookup is case-sensitive in SQLite."""
-        # SQLite is case-insensitive by default for ASCII
-        upper_email = sample_user.email.upper()
-        result = get_user_by_email(db_session, upper_email)
+    def test_get_user_by_email_case_insensitive(self, db_session: Session, sample_user: User):
+        """Test that email lookup ignores case."""
+        result = get_user_by_email(db_session, sample_user.email.upper())
 
-        # Note: SQLite LIKE is case-insensitive, but = is case-sensitive
-        # This test documents the actual behavior
-        if result is not None:
-            # If found, it matched despite case difference
-            assert result.id == sample_user.id
+        assert result is not None
+        assert result.id == sample_user.id
 
 
 class TestGetUserByUsername:
@@ -132,6 +133,98 @@ class TestGetUserByUsername:
         assert result.username == target_user.username
 
 
+class TestProjectedLookups:
+    """Tests for column-projected lookups used by login and /me."""
+
+    def test_credentials_by_email(self, db_session: Session, sample_user: User):
+        """Test that credentials lookup returns only the login columns."""
+        result = get_user_credentials_by_email(db_session, sample_user.email)
+
+        assert result is not None
+        assert result._fields == ("id", "username", "hashed_password", "is_active")
+        assert result.id == sample_user.id
+        assert result.hashed_password == sample_user.hashed_password
+
+    def test_credentials_by_email_not_exists(self, db_session: Session):
+        """Test that a missing email returns None."""
+        assert get_user_credentials_by_email(db_session, "nobody@example.com") is None
+
+    def test_profile_by_username_loads_response_columns_only(
+        self, db_session: Session, sample_user: User
+    ):
+        """Test that the profile lookup defers columns outside UserResponse."""
+        user_id = sample_user.id
+        db_session.expunge_all()
+
+        result = get_user_profile_by_username(db_session, "testuser")
+
+        assert result.id == user_id
+        assert result.email == "test@example.com"
+        assert "hashed_password" in inspect(result).unloaded
+        # Deferred columns still load on access
+        assert result.hashed_password == "hashed_password_123"
+
+    def test_profile_by_username_not_exists(self, db_session: Session):
+        """Test that a missing username returns None."""
+        assert get_user_profile_by_username(db_session, "nobody") is None
+
+
+class TestCaseInsensitiveLookup:
+    """Tests for case-insensitive email/username lookups."""
+
+    def test_mixed_case_lookups(self, db_session: Session, sample_user: User):
+        """Every lookup matches regardless of the case of the key."""
+        email = sample_user.email.swapcase()
+        username = sample_user.username.upper()
+
+        assert get_user_by_email(db_session, email).id == sample_user.id
+        assert get_user_credentials_by_email(db_session, email) is not None
+        assert get_user_by_username(db_session, username).id == sample_user.id
+        assert get_user_profile_by_username(db_session, username).id == sample_user.id
+
+    def test_case_variant_duplicate_rejected(self, db_session: Session, sample_user: User):
+        """An email differing only in case violates the unique index."""
+        user_data = {"username": "other", "email": sample_user.email.upper()}
+
+        with pytest.raises(IntegrityError):
+            create_user(db_session, user_data, "hashed")
+
+    def test_lookup_uses_expression_index(self, db_session: Session):
+        """The login lookup searches the lower(email) index instead of scanning."""
+        connection = db_session.connection()
+        compiled = _CREDENTIALS_BY_EMAIL.compile(dialect=connection.dialect)
+        params = compiled.construct_params({"email": "a@example.com"})
+        plan = connection.exec_driver_sql(
+            f"EXPLAIN QUERY PLAN {compiled}", tuple(params[key] for key in compiled.positiontup)
+        ).all()
+
+        assert "USING INDEX ux_users_email_lower" in plan[0][-1]
+
+    def test_ensure_indexes_on_legacy_table(self, tmp_path):
+        """Existing databases get the indexes; case duplicates fall back to non-unique."""
+        engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+        with engine.begin() as connection:
+            connection.execute(text(
+                "CREATE TABLE users (id INTEGER PRIMARY KEY, email VARCHAR UNIQUE, "
+                "username VARCHAR UNIQUE, hashed_password VARCHAR, is_active BOOLEAN, "
+                "created_at DATETIME, updated_at DATETIME)"
+            ))
+            connection.execute(text(
+                "INSERT INTO users (email, username) VALUES "
+                "('dup@example.com', 'first'), ('DUP@example.com', 'second')"
+            ))
+
+            assert ensure_user_lookup_indexes(connection) == ["ux_users_email_lower"]
+            assert ensure_user_lookup_indexes(connection) == []
+            indexes = dict(connection.execute(text(
+                "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND name LIKE 'ux_users_%'"
+            )).all())
+
+        assert "UNIQUE" not in indexes["ux_users_email_lower"]
+        assert "UNIQUE" in indexes["ux_users_username_lower"]
+        engine.dispose()
+
+
 class TestCreateUser:
     """Tests for create_user function."""
 
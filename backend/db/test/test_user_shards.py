@@ -0,0 +1,166 @@
+"""
+Sharded User Storage Tests.
+
+Tests for app.crud.user_shards.UserShards including:
+- Globally unique ids that encode their shard
+- Email directory routing to a single shard
+- Duplicate email/username rejection across shards
+- Shard count mismatch detection
+- Directory rebuild from shard contents
+- The email directory is partitioned by email hash
+- Ids are never reissued, even after the compensating delete
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import delete, func, select
+from sqlalchemy.exc import IntegrityError
+
+# Add backend/app to path for imports
+backend_path = Path(__file__).parent.parent.parent / "app"
+sys.path.insert(0, str(backend_path.parent))
+
+from app.crud.user_shards import UserShards, user_directory, user_id_sequence
+from app.models import User
+
+
+def make_shards(tmp_path, shard_count=3):
+    shards = UserShards(
+        shard_count,
+        shard_url=f"sqlite:///{tmp_path}/shard_{{index}}.db",
+        directory_url=f"sqlite:///{tmp_path}/directory_{{index}}.db",
+    )
+    shards.create_all()
+    return shards
+
+
+def signup(shards, name):
+    return shards.insert_user({
+        "username": name,
+        "email": f"{name}@example.com",
+        "hashed_password": "hashed",
+    })
+
+
+def directory_sizes(shards):
+    sizes = []
+    for engine in shards.directory_engines:
+        with engine.connect() as connection:
+            sizes.append(connection.scalar(select(func.count()).select_from(user_directory)))
+    return sizes
+
+
+class TestUserShards:
+    """Tests for placement, ids and the email directory."""
+
+    def test_ids_are_unique_and_encode_shard(self, tmp_path):
+        """Test that (id - 1) % N points at the user's shard."""
+        shards = make_shards(tmp_path)
+
+        users = [signup(shards, f"user{i}") for i in range(12)]
+
+        assert len({user.id for user in users}) == 12
+        for user in users:
+            assert shards.shard_for_id(user.id) == shards.shard_for_username(user.username)
+
+    def test_email_directory_points_to_shard(self, tmp_path):
+        """Test that email lookups resolve to the owning shard."""
+        shards = make_shards(tmp_path)
+        user = signup(shards, "alice")
+
+        shard = shards.shard_for_email("alice@example.com")
+
+        assert shard == shards.shard_for_username("alice")
+        with shards.session(shard) as db:
+            assert db.get(User, user.id).email == "alice@example.com"
+        assert shards.shard_for_email("nobody@example.com") is None
+
+    def test_duplicate_email_across_shards(self, tmp_path):
+        """Test that a taken email is rejected and leaves no shard row."""
+        shards = make_shards(tmp_path)
+        signup(shards, "alice")
+        other = next(
+            f"bob{i}" for i in range(100)
+            if shards.shard_for_username(f"bob{i}") != shards.shard_for_username("alice")
+        )
+
+        with pytest.raises(IntegrityError):
+            shards.insert_user({"username": other, "email": "alice@example.com", "hashed_password": "x"})
+
+        with shards.session(shards.shard_for_username(other)) as db:
+            assert db.scalar(select(User).where(User.username == other)) is None
+
+    def test_duplicate_username(self, tmp_path):
+        """Test that usernames stay unique (same name, same shard)."""
+        shards = make_shards(tmp_path)
+        signup(shards, "alice")
+
+        with pytest.raises(IntegrityError):
+            shards.insert_user({"username": "alice", "email": "other@example.com", "hashed_password": "x"})
+
+    def test_shard_count_mismatch(self, tmp_path):
+        """Test that reopening with a different shard count fails."""
+        make_shards(tmp_path, shard_count=3)
+
+        with pytest.raises(RuntimeError):
+            make_shards(tmp_path, shard_count=4)
+
+    def test_rebuild_directory(self, tmp_path):
+        """Test that lost directory entries are restored from shards."""
+        shards = make_shards(tmp_path)
+        for i in range(5):
+            signup(shards, f"user{i}")
+        for engine in shards.directory_engines:
+            with engine.begin() as connection:
+                connection.execute(delete(user_directory))
+
+        assert shards.rebuild_directory() == 5
+        assert directory_sizes(shards) == [
+            sum(shards.directory_partition(f"user{i}@example.com") == p for i in range(5)) for p in range(3)
+        ]
+        assert shards.shard_for_email("user3@example.com") == shards.shard_for_username("user3")
+
+    def test_directory_is_partitioned(self, tmp_path):
+        """Test that emails spread over one directory file per shard."""
+        shards = make_shards(tmp_path)
+
+        for i in range(30):
+            signup(shards, f"user{i}")
+
+        assert len(shards.directory_engines) == 3
+        assert sum(directory_sizes(shards)) == 30
+        assert all(directory_sizes(shards))
+
+    def test_ids_not_reused_after_conflict(self, tmp_path):
+        """Test that the id freed by the compensating delete is not handed out again."""
+        shards = make_shards(tmp_path, shard_count=2)
+        signup(shards, "alice")
+        other = next(
+            f"bob{i}" for i in range(100)
+            if shards.shard_for_username(f"bob{i}") != shards.shard_for_username("alice")
+        )
+        with pytest.raises(IntegrityError):
+            # committed on the other shard, then deleted when the directory rejects the email
+            shards.insert_user({"username": other, "email": "alice@example.com", "hashed_password": "x"})
+
+        user = signup(shards, other)
+
+        first_id = shards.shard_for_username(other) + 1
+        assert user.id == first_id + 2
+
+    def test_sequence_continues_existing_ids(self, tmp_path):
+        """Test that shards created before the sequence continue after their max id."""
+        shards = make_shards(tmp_path)
+        user = signup(shards, "alice")
+        shard = shards.shard_for_username("alice")
+        with shards.engines[shard].begin() as connection:
+            user_id_sequence.drop(connection)
+
+        reopened = make_shards(tmp_path)
+        other = next(
+            f"bob{i}" for i in range(100) if reopened.shard_for_username(f"bob{i}") == shard
+        )
+
+        assert signup(reopened, other).id == user.id + 3
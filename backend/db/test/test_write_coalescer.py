@@ -0,0 +1,190 @@
+"""
+Write Coalescer Tests.
+
+Tests for app.utils.write_coalescer.WriteCoalescer including:
+- Each caller receives its own generated id and created_at
+- Concurrent inserts are grouped into fewer transactions
+- A failing row only fails its own caller
+- A batch that dies outside the row savepoints does not stop the writer thread
+- A caller that times out before its batch starts is never committed
+- A failed commit counts one failed batch
+- A request deadline shortens the wait
+"""
+
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker
+
+# Add backend/app to path for imports
+backend_path = Path(__file__).parent.parent.parent / "app"
+sys.path.insert(0, str(backend_path.parent))
+
+from app.database import Base
+from app.models import Example
+from app.utils import deadline, write_coalescer
+from app.utils.write_coalescer import WriteCoalescer
+
+RETURNING = [Example.id, Example.name, Example.created_at]
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """File-backed SQLite so concurrent connections share the database."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'coalescer.db'}",
+        connect_args={"check_same_thread": False},
+    )
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+class TestWriteCoalescer:
+    """Tests for group-commit behavior."""
+
+    def test_single_insert_returns_generated_values(self, session_factory):
+        """Test that a lone insert is committed with its generated id."""
+        coalescer = WriteCoalescer(session_factory, Example, RETURNING, max_wait=0.001)
+
+        row = coalescer.submit({"name": "solo"})
+
+        assert row["id"] is not None
+        assert row["name"] == "solo"
+        assert row["created_at"] is not None
+        with session_factory() as db:
+            assert db.get(Example, row["id"]).name == "solo"
+
+    def test_concurrent_inserts_are_grouped(self, session_factory):
+        """Test that concurrent callers share transactions and get unique ids."""
+        coalescer = WriteCoalescer(session_factory, Example, RETURNING, max_batch=50, max_wait=0.05)
+
+        with ThreadPoolExecutor(max_workers=20) as pool:
+            rows = list(pool.map(lambda i: coalescer.submit({"name": f"row {i}"}), range(40)))
+
+        assert len({row["id"] for row in rows}) == 40
+        assert [row["name"] for row in rows] == [f"row {i}" for i in range(40)]
+        assert coalescer.batches < 40
+        with session_factory() as db:
+            assert db.scalar(select(func.count()).select_from(Example)) == 40
+
+    def test_failing_row_only_affects_its_caller(self, session_factory):
+        """Test that a constraint violation is isolated by its savepoint."""
+        coalescer = WriteCoalescer(session_factory, Example, RETURNING, max_batch=10, max_wait=0.1)
+        payloads = [{"name": "ok 1"}, {"name": None}, {"name": "ok 2"}]
+
+        def submit(values):
+            try:
+                return coalescer.submit(values)
+            except IntegrityError as exc:
+                return exc
+
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            results = list(pool.map(submit, payloads))
+
+        assert isinstance(results[1], IntegrityError)
+        assert results[0]["name"] == "ok 1"
+        assert results[2]["name"] == "ok 2"
+        assert coalescer.failed_rows == 1
+        with session_factory() as db:
+            names = set(db.scalars(select(Example.name)))
+        assert names == {"ok 1", "ok 2"}
+
+    def test_killed_flush_keeps_writer_alive(self, session_factory):
+        """Test that a session_factory error fails one batch and the next submit works."""
+        calls = []
+
+        def flaky_factory():
+            calls.append(None)
+            if len(calls) == 1:
+                raise RuntimeError("connection refused")
+            return session_factory()
+
+        coalescer = WriteCoalescer(flaky_factory, Example, RETURNING, max_wait=0.001)
+
+        with pytest.raises(RuntimeError, match="connection refused"):
+            coalescer.submit({"name": "lost"})
+        row = coalescer.submit({"name": "after"})
+
+        assert row["name"] == "after"
+        assert coalescer.failed_batches == 1
+        with session_factory() as db:
+            assert list(db.scalars(select(Example.name))) == ["after"]
+
+    def test_timed_out_submit_is_not_committed(self, session_factory, monkeypatch):
+        """Test that a request cancelled while queued is skipped by the next batch."""
+        started, release = threading.Event(), threading.Event()
+
+        def blocked_factory():
+            started.set()
+            release.wait(5)
+            return session_factory()
+
+        coalescer = WriteCoalescer(blocked_factory, Example, RETURNING, max_batch=1, max_wait=0)
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            first = pool.submit(coalescer.submit, {"name": "first"})
+            assert started.wait(5)  # the writer thread is flushing the first row
+            monkeypatch.setattr(write_coalescer, "SUBMIT_TIMEOUT", 0.05)
+            with pytest.raises(TimeoutError):
+                coalescer.submit({"name": "timed out"})
+            release.set()
+            assert first.result()["name"] == "first"
+
+        assert coalescer.submit({"name": "next"})["name"] == "next"
+        assert coalescer.cancelled_rows == 1
+        with session_factory() as db:
+            assert set(db.scalars(select(Example.name))) == {"first", "next"}
+
+    def test_failed_commit_counts_one_batch(self, session_factory):
+        """Test that a batch failing at commit time is counted once."""
+
+        def failing_before_commit(session, rows):
+            raise RuntimeError("counter update failed")
+
+        coalescer = WriteCoalescer(
+            session_factory, Example, RETURNING, max_wait=0.001, before_commit=failing_before_commit
+        )
+
+        with pytest.raises(RuntimeError, match="counter update failed"):
+            coalescer.submit({"name": "lost"})
+
+        assert coalescer.failed_batches == 1
+        assert coalescer.batches == 0
+        with session_factory() as db:
+            assert db.scalar(select(func.count()).select_from(Example)) == 0
+
+    def test_request_deadline_caps_wait(self, session_factory):
+        """Test that a queued submit gives up at the request deadline, not SUBMIT_TIMEOUT."""
+        started, release = threading.Event(), threading.Event()
+
+        def blocked_factory():
+            started.set()
+            release.wait(5)
+            return session_factory()
+
+        coalescer = WriteCoalescer(blocked_factory, Example, RETURNING, max_batch=1, max_wait=0)
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            first = pool.submit(coalescer.submit, {"name": "first"})
+            assert started.wait(5)
+            token = deadline.set_deadline(0.05)
+            try:
+                began = time.monotonic()
+                with pytest.raises(deadline.DeadlineExceeded):
+                    coalescer.submit({"name": "late"})
+                waited = time.monotonic() - began
+            finally:
+                deadline.reset_deadline(token)
+            release.set()
+            assert first.result()["name"] == "first"
+
+        assert waited < 1
+        assert coalescer.submit({"name": "next"})["name"] == "next"
+        assert coalescer.cancelled_rows == 1
+        with session_factory() as db:
+            assert set(db.scalars(select(Example.name))) == {"first", "next"}